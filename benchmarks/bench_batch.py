@@ -0,0 +1,68 @@
+"""Assign one employee to five days: the old way (assign, then a full preview refresh per day)
+against one validated batch followed by a single diff update of the grids. Tk is stubbed with
+bench_grid.StubTree, so the Treeview calls each way are counted too.
+
+Usage: python benchmarks/bench_batch.py [rows ...]
+"""
+import sys
+import time
+
+from synthetic import make_roster_frame
+from bench_grid import PAGE_SIZE, StubScrollbar, StubTree
+from schedule_core import DAYS, Schedule, SortedEmployees, roster_from_frame
+from scheduleapp import VirtualGrid
+
+BATCH_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+
+
+def make_view(rows):
+    schedule = Schedule(list(DAYS), roster_from_frame(make_roster_frame(rows)))
+    schedule.set_employees_needed({day: rows // 10 for day in DAYS})
+    schedule.generate_schedule()
+    grids = [VirtualGrid(StubTree(), StubScrollbar(), ["Row"] + DAYS, PAGE_SIZE) for _ in range(2)]
+    available = full_refresh(schedule, grids)
+    for grid in grids:
+        grid.tree.calls.clear()
+    # Someone with no assignments yet, so every day is a real change
+    employee = next(emp for emp in schedule.unassigned_employees['Mon']
+                    if not any(emp in schedule.schedule[day] for day in DAYS))
+    return schedule, grids, available, employee
+
+
+def full_refresh(schedule, grids):
+    """What refresh_schedule_preview does: redraw the schedule and rebuild the available lists."""
+    grids[0].set_data([schedule.schedule[day] for day in DAYS])
+    available = {
+        day: SortedEmployees([emp for emp in schedule.unassigned_employees[day] if emp.is_available(day)], presorted=True)
+        for day in DAYS
+    }
+    grids[1].set_data([available[day] for day in DAYS])
+    return available
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'per day':>10} {'calls':>7} {'batch':>10} {'calls':>7}")
+    for rows in sizes:
+        schedule, grids, _, employee = make_view(rows)
+        start = time.perf_counter()
+        for day in BATCH_DAYS:
+            schedule.manually_add_employee(day, employee, True)
+            full_refresh(schedule, grids)
+        per_day_time = time.perf_counter() - start
+        per_day_calls = sum(sum(grid.tree.calls.values()) for grid in grids)
+
+        schedule, grids, available, employee = make_view(rows)
+        start = time.perf_counter()
+        pairs, problems = schedule.assign_batch([(employee, day, True) for day in BATCH_DAYS])
+        for day, emp in pairs:
+            available[day].discard(emp)
+        grids[0].set_data([schedule.schedule[day] for day in DAYS])
+        grids[1].set_data([available[day] for day in DAYS])
+        batch_time = time.perf_counter() - start
+        batch_calls = sum(sum(grid.tree.calls.values()) for grid in grids)
+        assert len(pairs) == len(BATCH_DAYS) and not problems
+        print(f"{rows:>8} {per_day_time:>9.4f}s {per_day_calls:>7} {batch_time:>9.4f}s {batch_calls:>7}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
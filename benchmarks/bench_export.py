@@ -0,0 +1,62 @@
+"""Time schedule output at 100k-ish assignments: the old += text builder against
+print_schedule, and export_schedule for every format and layout.
+
+Usage: python benchmarks/bench_export.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import make_roster_frame
+from schedule_export import EXPORT_FORMATS, LAYOUTS, export_schedule
+from schedule_core import DAYS, Schedule, roster_from_frame
+
+NEEDED_SHARE = 0.15
+
+
+def legacy_print_schedule(schedule):
+    """The original text builder, one += per line."""
+    output = "Final Schedule:\n"
+    for day, employees in schedule.schedule.items():
+        employee_names = sorted([emp.name for emp in employees])
+        output += f"{day}: {', '.join(employee_names) if employee_names else 'No employees assigned'}\n"
+    output += "\nUnassigned Employees:\n"
+    for day, unassigned in schedule.unassigned_employees.items():
+        unassigned_names = sorted([emp.name for emp in unassigned])
+        output += f"{day}: {', '.join(unassigned_names) if unassigned_names else 'All employees assigned'}\n"
+    return output
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    for rows in sizes:
+        schedule = Schedule(DAYS, roster_from_frame(make_roster_frame(rows)))
+        schedule.set_employees_needed({day: int(rows * NEEDED_SHARE) for day in DAYS})
+        schedule.generate_schedule()
+        assignments = sum(len(schedule.schedule[day]) for day in DAYS)
+        print(f"{rows} employees, {assignments} assignments")
+
+        legacy, legacy_time = timed(lambda: legacy_print_schedule(schedule))
+        text, text_time = timed(schedule.print_schedule)
+        assert legacy == text
+        print(f"  text    += builder {legacy_time:8.3f}s   join {text_time:8.3f}s")
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            for layout in LAYOUTS:
+                cells = []
+                for extension in EXPORT_FORMATS:
+                    path = os.path.join(out_dir, f"schedule_{layout}{extension}")
+                    paths, elapsed = timed(lambda: export_schedule(schedule, path, layout))
+                    size = sum(os.path.getsize(written) for written in paths)
+                    cells.append(f"{extension[1:]} {elapsed:7.3f}s ({size / 2**20:.1f} MiB)")
+                print(f"  {layout:<8} " + "   ".join(cells))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,91 @@
+"""Time Schedule.generate_schedule against the original list-scanning generator, then the full
+generate path (plan, apply, and the unassigned lists when first shown) with 10% of the roster
+needed each day.
+
+Usage: python benchmarks/bench_generate.py [rows ...]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, roster_from_frame
+
+NEEDED = 50  # Employees needed per day
+NEEDED_SHARE = 0.1  # Of the roster, per day, for the full-path timings
+
+
+def legacy_generate(employees, days, needed):
+    """The original generator and unassigned refresh: roster scans plus list membership checks."""
+    schedule = {day: [] for day in days}
+    unassigned = {day: [] for day in days}
+    for day in days:
+        available = [emp for emp in employees if emp.availability.get(day, False)]
+        available = [emp for emp in available if isinstance(emp.name, str)]
+        if day in ['Sun', 'Sat']:
+            available.reverse()
+        print(f"Available employees for {day}: {[emp.name for emp in available]}")
+        for employee in available[:needed]:
+            schedule[day].append(employee)
+            schedule[day] = sorted(schedule[day], key=lambda emp: emp.name)
+        for employee in available:
+            if employee not in schedule[day]:
+                unassigned[day].append(employee)
+    unassigned = {
+        day: sorted([emp for emp in employees if emp not in schedule[day]], key=lambda emp: str(emp.name))
+        for day in days
+    }
+    return schedule
+
+
+def time_generate_path(roster):
+    """Seconds for (plan, apply, generate_schedule, first unassigned_employees) at NEEDED_SHARE."""
+    schedule = Schedule(DAYS, roster)
+    schedule.set_employees_needed({day: int(len(roster) * NEEDED_SHARE) for day in DAYS})
+    schedule.generate_schedule()  # Warm up: Employees are created on first use
+
+    start = time.perf_counter()
+    plan = schedule.plan_schedule()
+    planned = time.perf_counter()
+    schedule.apply_plan(plan)
+    applied = time.perf_counter()
+
+    start_generate = time.perf_counter()
+    schedule.generate_schedule()
+    generated = time.perf_counter()
+    schedule.unassigned_employees
+    shown = time.perf_counter()
+    return planned - start, applied - planned, generated - start_generate, shown - generated
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy':>10} {'indexed':>10} {'index build':>12}   "
+          f"{'plan':>9} {'apply':>9} {'generate':>9} {'unassigned':>10}")
+    for rows in sizes:
+        roster = roster_from_frame(make_roster_frame(rows))
+        employees = roster.employees
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            legacy = legacy_generate(employees, DAYS, NEEDED)
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            schedule = Schedule(DAYS, roster)
+            build_time = time.perf_counter() - start
+            schedule.set_employees_needed({day: NEEDED for day in DAYS})
+
+            start = time.perf_counter()
+            schedule.generate_schedule()
+            indexed_time = time.perf_counter() - start
+
+        assert all(set(legacy[day]) == set(schedule.schedule[day]) for day in DAYS)
+        plan_time, apply_time, generate_time, unassigned_time = time_generate_path(roster)
+        print(f"{rows:>8} {legacy_time:>9.3f}s {indexed_time:>9.3f}s {build_time:>11.3f}s   "
+              f"{plan_time * 1e3:>7.1f}ms {apply_time * 1e3:>7.1f}ms {generate_time * 1e3:>7.1f}ms "
+              f"{unassigned_time * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
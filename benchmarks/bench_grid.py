@@ -0,0 +1,115 @@
+"""Headless benchmark of the schedule/unassigned grid refreshes with large rosters.
+
+Tk is replaced by a stub Treeview that only counts calls, so this runs without a display.
+Compares the old clear-and-reinsert refresh with VirtualGrid after a single assignment.
+
+Usage: python benchmarks/bench_grid.py [rows ...]
+"""
+import sys
+import time
+from collections import Counter
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, SortedEmployees, roster_from_frame
+from scheduleapp import VirtualGrid
+
+PAGE_SIZE = 15
+
+
+class StubTree:
+    """Just enough of ttk.Treeview for the grids; counts every call that would reach Tk."""
+    def __init__(self):
+        self.calls = Counter()
+        self.rows = {}
+        self._next = 0
+
+    def insert(self, parent, index, values=(), tags=()):
+        self.calls['insert'] += 1
+        self._next += 1
+        item = f"I{self._next}"
+        self.rows[item] = list(values)
+        return item
+
+    def set(self, item, column, value):
+        self.calls['set'] += 1
+
+    def item(self, item, **options):
+        self.calls['item'] += 1
+
+    def delete(self, *items):
+        self.calls['delete'] += 1
+        for item in items:
+            del self.rows[item]
+
+    def get_children(self):
+        return list(self.rows)
+
+    def configure(self, **options):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+
+class StubScrollbar:
+    def config(self, **options):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+def legacy_refresh(tree, columns):
+    """The old refresh: clear the tree, then insert every row."""
+    tree.delete(*tree.get_children())
+    for i in range(max((len(column) for column in columns), default=0)):
+        row = [column[i].name if i < len(column) else '' for column in columns]
+        tree.insert('', 'end', values=[i + 1] + row, tags=('oddrow' if i % 2 == 0 else 'evenrow',))
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'legacy':>10} {'legacy calls':>13} {'virtual':>10} {'virtual calls':>14}")
+    for rows in sizes:
+        schedule = Schedule(DAYS, roster_from_frame(make_roster_frame(rows)))
+        schedule.set_employees_needed({day: rows // 10 for day in DAYS})
+        schedule.generate_schedule()
+        available = {
+            day: SortedEmployees([emp for emp in schedule.unassigned_employees[day] if emp.is_available(day)], presorted=True)
+            for day in DAYS
+        }
+        grids = [
+            (schedule.schedule, VirtualGrid(StubTree(), StubScrollbar(), ["Row"] + DAYS, PAGE_SIZE)),
+            (available, VirtualGrid(StubTree(), StubScrollbar(), ["Row"] + DAYS, PAGE_SIZE)),
+        ]
+        for data, grid in grids:
+            grid.set_data([data[day] for day in DAYS])
+
+        # One double-click: assign the first available unassigned employee on Mon
+        employee = available['Mon'][0]
+        legacy_trees = [StubTree(), StubTree()]
+        for (data, _), tree in zip(grids, legacy_trees):
+            legacy_refresh(tree, [data[day] for day in DAYS])
+            tree.calls.clear()
+
+        schedule.manually_add_employee('Mon', employee)
+        available['Mon'].discard(employee)
+
+        start = time.perf_counter()
+        for (data, _), tree in zip(grids, legacy_trees):
+            legacy_refresh(tree, [data[day] for day in DAYS])
+        legacy_time = time.perf_counter() - start
+
+        for _, grid in grids:
+            grid.tree.calls.clear()
+        start = time.perf_counter()
+        for data, grid in grids:
+            grid.set_data([data[day] for day in DAYS])
+        virtual_time = time.perf_counter() - start
+
+        legacy_calls = sum(sum(tree.calls.values()) for tree in legacy_trees)
+        virtual_calls = sum(sum(grid.tree.calls.values()) for _, grid in grids)
+        print(f"{rows:>8} {legacy_time:>9.4f}s {legacy_calls:>13} {virtual_time:>9.4f}s {virtual_calls:>14}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
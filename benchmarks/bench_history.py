@@ -0,0 +1,84 @@
+"""Fairness history: recording a week, and ranking a roster for the next week with three years
+of weekly history already stored (built with random schedules, 10% of the roster each day).
+Then generates 26 weeks with the greedy solver, with and without the ranking, and compares
+how weekend days were shared among the employees available at weekends.
+
+Usage: python benchmarks/bench_history.py [rows ...]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, roster_from_frame
+from schedule_history import HistoryStore
+
+YEARS = 3
+SIMULATED_WEEKS = 26
+NEEDED_SHARE = 0.1
+MAX_DAYS = 4
+FIRST_WEEK = datetime.date(2023, 1, 1)  # A Sunday
+
+
+def fill_history(history, roster, weeks, seed=0):
+    """Record `weeks` weeks of random schedules; returns the seconds per record()."""
+    rng = np.random.default_rng(seed)
+    schedule = Schedule(list(DAYS), roster)
+    per_day = int(len(roster) * NEEDED_SHARE)
+    elapsed = 0.0
+    for offset in range(weeks):
+        schedule.apply_plan({day: np.sort(rng.choice(len(roster), per_day, replace=False)) for day in DAYS})
+        start = time.perf_counter()
+        history.record(FIRST_WEEK + datetime.timedelta(weeks=offset), schedule)
+        elapsed += time.perf_counter() - start
+    return elapsed / weeks
+
+
+def weekend_spread(roster, history, first_week):
+    """Generate SIMULATED_WEEKS weeks; (share never given a weekend day, most weekend days
+    anyone got) among employees available at weekends."""
+    schedule = Schedule(list(DAYS), roster)
+    schedule.set_employees_needed({day: int(len(roster) * NEEDED_SHARE) for day in DAYS})
+    schedule.max_days_per_week = MAX_DAYS
+    schedule.history = history
+    weekends = np.zeros(len(roster), dtype=np.int64)
+    for offset in range(SIMULATED_WEEKS):
+        schedule.week = first_week + datetime.timedelta(weeks=offset)
+        schedule.generate_schedule()
+        for day in ('Sat', 'Sun'):
+            weekends[roster.rows_of(schedule.schedule[day])] += 1
+        if history is not None:
+            history.record(schedule.week, schedule)
+    weekend_staff = weekends[roster.availability[:, [DAYS.index('Sat'), DAYS.index('Sun')]].any(axis=1)]
+    return float((weekend_staff == 0).mean()), int(weekend_staff.max())
+
+
+def main(sizes):
+    weeks = YEARS * 52
+    print(f"{'rows':>8} {'employee-weeks':>14} {'record':>9} {'ranking':>9}   "
+          f"{'never (reversed)':>16} {'never (ranked)':>14} {'max (reversed)':>14} {'max (ranked)':>12}")
+    for rows in sizes:
+        roster = roster_from_frame(make_roster_frame(rows))
+        with tempfile.TemporaryDirectory() as folder:
+            history = HistoryStore(os.path.join(folder, "history.sqlite"))
+            record_time = fill_history(history, roster, weeks)
+            stored = history.db.execute("SELECT SUM(LENGTH(days)) FROM weeks").fetchone()[0]  # Employee-weeks
+            next_week = FIRST_WEEK + datetime.timedelta(weeks=weeks)
+
+            start = time.perf_counter()
+            history.ranking(roster, next_week)
+            ranking_time = time.perf_counter() - start
+
+            never_reversed, most_reversed = weekend_spread(roster, None, next_week)
+            never_ranked, most_ranked = weekend_spread(roster, history, next_week)
+            history.close()
+        print(f"{rows:>8} {stored:>14} {record_time * 1e3:>7.1f}ms {ranking_time * 1e3:>7.1f}ms   "
+              f"{never_reversed:>16.1%} {never_ranked:>14.1%} {most_reversed:>14} {most_ranked:>12}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
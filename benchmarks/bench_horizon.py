@@ -0,0 +1,63 @@
+"""Time a quarter-long DateRangeSchedule: the first full generate, then incremental updates
+after one date's needs change and after one employee's availability changes on one date.
+Each incremental result is checked against generating the same settings from scratch.
+
+Usage: python benchmarks/bench_horizon.py [rows ...]
+"""
+import datetime
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, SOLVERS, DateRangeSchedule, roster_from_frame
+
+START, END = datetime.date(2026, 1, 1), datetime.date(2026, 3, 31)
+MAX_DAYS = 3
+NEEDED_SHARE = 0.2
+
+
+def make_schedule(roster, solver, needed, edits):
+    schedule = DateRangeSchedule(roster, START, END)
+    schedule.solver = SOLVERS[solver]()
+    schedule.max_days_per_week = MAX_DAYS
+    schedule.set_weekly_needed(needed)
+    for edit in edits:
+        edit(schedule)
+    return schedule
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'solver':>7} {'full quarter':>13} {'needs edit':>16} {'availability edit':>20}")
+    for rows in sizes:
+        roster = roster_from_frame(make_roster_frame(rows))
+        needed = {day: int(rows * NEEDED_SHARE) for day in DAYS}
+        day, other = datetime.date(2026, 2, 11), datetime.date(2026, 2, 12)  # A Wednesday and Thursday
+        someone = roster.names[roster.index.candidates('Thu')[0]]  # Available on Thursdays, now calls in sick
+        edits = [
+            lambda schedule: schedule.set_needed(day, needed['Wed'] // 2),
+            lambda schedule: schedule.set_availability(someone, other, False),
+        ]
+        for solver in SOLVERS:
+            schedule = make_schedule(roster, solver, needed, [])
+            _, full_time = timed(schedule.generate_schedule)
+            cells = []
+            for count, edit in enumerate(edits, start=1):
+                edit(schedule)
+                replanned, edit_time = timed(schedule.generate_schedule)
+                cells.append(f"{edit_time:>8.3f}s ({len(replanned)} dates)")
+
+                fresh = make_schedule(roster, solver, needed, edits[:count])
+                fresh.generate_schedule()
+                assert all([emp.name for emp in schedule.assigned(date)] == [emp.name for emp in fresh.assigned(date)]
+                           for date in schedule.dates), "incremental result differs from a full generate"
+            print(f"{rows:>8} {solver:>7} {full_time:>12.3f}s {cells[0]:>16} {cells[1]:>20}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
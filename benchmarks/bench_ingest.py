@@ -0,0 +1,64 @@
+"""Compare peak memory and time of reading a whole roster into a DataFrame first against
+streaming it through load_roster, for .xlsx and .csv (and .parquet when pyarrow is installed).
+
+Usage: python benchmarks/bench_ingest.py [rows ...]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from synthetic import make_roster_frame, write_roster
+from schedule_core import load_roster, roster_from_frame
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+READERS = {'.xlsx': pd.read_excel, '.csv': pd.read_csv, '.parquet': pd.read_parquet}
+
+
+def measure(load):
+    """Time one load, then repeat it under tracemalloc (which slows openpyxl down a lot) for the peak."""
+    start = time.perf_counter()
+    roster = load()
+    elapsed = time.perf_counter() - start
+    del roster
+    gc.collect()
+    tracemalloc.start()
+    roster = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return roster, elapsed, peak
+
+
+def roster_file(rows, extension):
+    path = os.path.join(DATA_DIR, f"roster_{rows}{extension}")
+    if extension == '.parquet':
+        if not os.path.exists(path):
+            make_roster_frame(rows).to_parquet(path, index=False)
+        return path
+    return write_roster(path, rows)
+
+
+def main(sizes):
+    try:
+        import pyarrow  # noqa: F401
+        extensions = ['.xlsx', '.csv', '.parquet']
+    except ImportError:
+        extensions = ['.xlsx', '.csv']
+        print("pyarrow not installed; skipping .parquet")
+
+    print(f"{'rows':>8} {'format':>8} {'whole frame':>12} {'peak':>10} {'streamed':>10} {'peak':>10}")
+    for rows in sizes:
+        for extension in extensions:
+            path = roster_file(rows, extension)
+            whole, whole_time, whole_peak = measure(lambda: roster_from_frame(READERS[extension](path)))
+            streamed, streamed_time, streamed_peak = measure(lambda: load_roster(path))
+            assert whole.names == streamed.names and (whole.availability == streamed.availability).all()
+            print(f"{rows:>8} {extension:>8} {whole_time:>11.3f}s {whole_peak / 2**20:>7.1f}MiB "
+                  f"{streamed_time:>9.3f}s {streamed_peak / 2**20:>7.1f}MiB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
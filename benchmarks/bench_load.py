@@ -0,0 +1,64 @@
+"""Time roster loading at 1k/10k/100k rows: the old iterrows() path, the vectorized loader
+and a reload from the roster cache sidecar.
+
+Usage: python benchmarks/bench_load.py [rows ...]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from synthetic import write_roster
+from schedule_core import DAYS, Employee, RosterCache, load_roster_from_excel
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+
+def legacy_employees_from_frame(df):
+    """The original per-row conversion, kept here as the baseline."""
+    employees = []
+    for _, row in df.iterrows():
+        name = row['Name']
+        if not isinstance(name, str):
+            print(f"Warning: Employee name is not a string. Converting '{name}' to string.")
+            name = str(name)
+        availability = {day: row.get(day) == "Yes" for day in DAYS}
+        print(f"Loaded Employee: {name}, Availability: {availability}")
+        employees.append(Employee(name, availability))
+    return employees
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'read_excel':>11} {'legacy total':>13} {'roster total':>13} {'legacy convert':>15} {'cached':>10}")
+    for rows in sizes:
+        path = write_roster(os.path.join(DATA_DIR, f"roster_{rows}.xlsx"), rows)
+
+        df, read_time = timed(pd.read_excel, path)
+        # Swallow the per-row prints; writing them to a terminal would only make the baseline slower
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, legacy_convert = timed(legacy_employees_from_frame, df)
+        roster, roster_total = timed(load_roster_from_excel, path)
+        assert len(roster) == rows
+
+        # Reload through a fresh cache (as after a restart): served from the sidecar file
+        with tempfile.TemporaryDirectory() as cache_dir:
+            RosterCache(cache_dir=cache_dir).load(path)
+            cached, cached_time = timed(RosterCache(cache_dir=cache_dir).load, path)
+        assert cached.names == roster.names
+
+        print(f"{rows:>8} {read_time:>10.3f}s {read_time + legacy_convert:>12.3f}s "
+              f"{roster_total:>12.3f}s {legacy_convert:>14.3f}s {cached_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
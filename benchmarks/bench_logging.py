@@ -0,0 +1,65 @@
+"""Generation time with the old print-everything output against the logger (INFO and OFF).
+
+Output goes to os.devnull, so this understates what a real terminal costs the old path.
+
+Usage: python benchmarks/bench_logging.py [rows ...]
+"""
+import contextlib
+import logging
+import os
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, configure_logging, logger, roster_from_frame
+
+NEEDED_SHARE = 0.2
+
+
+def print_everything_generate(schedule):
+    """generate_schedule plus the debug prints the old code made for every employee and day."""
+    plan = schedule.plan_schedule()
+    for day in schedule.days:
+        candidates = schedule.index.candidates(day)
+        print(f"Available employees for {day}: {[schedule.roster.names[row] for row in candidates]}")
+        for row in plan[day]:
+            print(f"Trying to assign {schedule.roster.names[row]} to {day}.")
+            print(f"Assigned {schedule.roster.names[row]} to {day} and sorted alphabetically.")
+        print(f"Assigned employees for {day}: {[schedule.roster.names[row] for row in plan[day]]}")
+    schedule.apply_plan(plan)
+    print("Unassigned employees refreshed.")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'print everything':>17} {'logging INFO':>13} {'logging OFF':>12}")
+    with open(os.devnull, 'w') as devnull:
+        handler = logging.StreamHandler(devnull)
+        for rows in sizes:
+            schedule = Schedule(DAYS, roster_from_frame(make_roster_frame(rows)))
+            schedule.set_employees_needed({day: int(rows * NEEDED_SHARE) for day in DAYS})
+
+            configure_logging("OFF")
+            with contextlib.redirect_stdout(devnull):
+                printed = timed(print_everything_generate, schedule)
+
+            # INFO records to a plain stream handler, as configure_logging("INFO") would set up
+            logger.disabled = False
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+            info = timed(schedule.generate_schedule)
+            logger.removeHandler(handler)
+
+            configure_logging("OFF")
+            off = timed(schedule.generate_schedule)
+
+            print(f"{rows:>8} {printed:>16.4f}s {info:>12.4f}s {off:>11.4f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,52 @@
+"""Compare memory held by the old dict-based Employee and the slotted Employee at 100k employees.
+
+Usage: python benchmarks/bench_memory.py [rows]
+"""
+import gc
+import sys
+import tracemalloc
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, roster_from_frame
+
+
+class LegacyEmployee:
+    """The original Employee: a per-instance __dict__ plus a nested availability dict."""
+    def __init__(self, name, availability):
+        self.name = name
+        self.availability = availability
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(rows):
+    frame = make_roster_frame(rows)
+    # Fresh (non-interned) name strings for each representation, like parsing a workbook would give
+    names = frame['Name'].tolist()
+    matrix = frame[DAYS].eq("Yes").to_numpy().tolist()
+
+    def legacy():
+        return [LegacyEmployee(''.join(name), dict(zip(DAYS, row))) for name, row in zip(names, matrix)]
+
+    def compact():
+        roster = roster_from_frame(frame)
+        return roster, roster.employees
+
+    _, legacy_size = measure(legacy)
+    _, compact_size = measure(compact)
+
+    print(f"{rows} employees")
+    print(f"  legacy Employee:                        {legacy_size / 2**20:8.1f} MiB")
+    print(f"  Roster + slotted Employee + name index: {compact_size / 2**20:8.1f} MiB")
+    print(f"  ratio: {legacy_size / compact_size:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+"""Time applying an edited roster to a generated schedule: Roster.diff plus Schedule.update_roster
+(assignments kept, only invalidated ones dropped) against installing the roster and generating
+again. A tenth of a percent of the employees drop one available day each.
+
+Usage: python benchmarks/bench_reload.py [rows ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Roster, Schedule, roster_from_frame
+
+EDITED_SHARE = 0.001
+
+
+def edited(roster, seed=0):
+    """A copy of `roster` where some employees are no longer available on one of their days."""
+    rng = np.random.default_rng(seed)
+    availability = roster.availability.copy()
+    for row in rng.choice(len(roster), max(1, int(len(roster) * EDITED_SHARE)), replace=False):
+        days = np.flatnonzero(availability[row])
+        if len(days):
+            availability[row, rng.choice(days)] = False
+    return Roster(roster.names, availability, [], roster.max_days, roster.slots)
+
+
+def generated(roster):
+    schedule = Schedule(list(DAYS), roster)
+    schedule.set_employees_needed({day: len(roster) // 10 for day in DAYS})
+    schedule.max_days_per_week = 3
+    schedule.generate_schedule()
+    return schedule
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'changed':>8} {'dropped':>8} {'diff+update':>12} {'regenerate':>11}")
+    for rows in sizes:
+        roster = roster_from_frame(make_roster_frame(rows))
+        schedule = generated(roster)
+        new = edited(roster)
+        start = time.perf_counter()
+        diff = roster.diff(new)
+        dropped = schedule.update_roster(new)
+        schedule.refresh_unassigned_employees()
+        update_time = time.perf_counter() - start
+
+        schedule = generated(roster)
+        new = edited(roster)
+        start = time.perf_counter()
+        schedule.employees = new
+        schedule.generate_schedule()
+        regenerate_time = time.perf_counter() - start
+        print(f"{rows:>8} {len(diff.changed):>8} {len(dropped):>8} {update_time:>11.4f}s {regenerate_time:>10.4f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,54 @@
+"""Sweep staffing scenarios: evaluate_scenarios against planning each scenario one by one with
+the greedy solver (with a days-per-week cap, so days depend on each other). Also times the
+process pool path with the flow solver on a smaller sweep.
+
+Usage: python benchmarks/bench_scenarios.py [rows ...]
+"""
+import itertools
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, FlowSolver, Schedule, roster_from_frame
+from schedule_scenarios import evaluate_scenarios
+
+MAX_DAYS = 3
+FLOW_SCENARIOS = 16
+
+
+def sweep(rows):
+    """Every combination of five Fri, Sat and Sun levels around 10% of the roster: 125 scenarios."""
+    base = {day: rows // 10 for day in DAYS}
+    levels = [int(rows * share) for share in (0.04, 0.07, 0.1, 0.13, 0.16)]
+    return [dict(base, Fri=fri, Sat=sat, Sun=sun) for fri, sat, sun in itertools.product(levels, repeat=3)]
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'scenarios':>9} {'one by one':>11} {'vectorized':>11} {'flow pool':>16}")
+    for rows in sizes:
+        schedule = Schedule(list(DAYS), roster_from_frame(make_roster_frame(rows)))
+        schedule.max_days_per_week = MAX_DAYS
+        scenarios = sweep(rows)
+
+        start = time.perf_counter()
+        expected = []
+        for needed in scenarios:
+            schedule.set_employees_needed(needed)
+            expected.append({day: len(picked) for day, picked in schedule.plan_schedule().items()})
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = evaluate_scenarios(schedule, scenarios)
+        vector_time = time.perf_counter() - start
+        assert [result.assigned for result in results] == expected, "vectorized counts differ from the solver"
+
+        schedule.solver = FlowSolver()
+        start = time.perf_counter()
+        evaluate_scenarios(schedule, scenarios[:FLOW_SCENARIOS])
+        flow_time = time.perf_counter() - start
+        print(f"{rows:>8} {len(scenarios):>9} {loop_time:>10.3f}s {vector_time:>10.3f}s "
+              f"{flow_time:>9.3f}s ({FLOW_SCENARIOS})")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,143 @@
+"""Load test for schedule_server: concurrent keep-alive clients against a local instance,
+reporting requests/sec and p50/p99 latency overall and per kind of request.
+
+By default a server is started in this process on a free port, serving synthetic CSV rosters
+from benchmarks/.data; --url points the clients at one that is already running instead (its
+--rosters folder must hold the roster named by --roster). Every store loads the same roster,
+so they share one parsed roster and index.
+
+Usage:
+    python benchmarks/bench_server.py [--rows 10000] [--stores 8] [--clients 16] [--seconds 10]
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765 --roster store.csv --rows 10000
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from synthetic import write_roster
+from schedule_core import DAYS, configure_logging
+from schedule_server import ScheduleServer, ScheduleService
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+NEEDED_SHARE = 0.1
+# Share of each kind of request in the mix
+MIX = [('summary', 0.6), ('assign', 0.17), ('remove', 0.17), ('needed', 0.04), ('generate', 0.02)]
+
+
+class Client:
+    """One keep-alive connection sending JSON requests."""
+    def __init__(self, host, port):
+        self.connection = http.client.HTTPConnection(host, port, timeout=60)
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload else {}
+        self.connection.request(method, path, payload, headers)
+        response = self.connection.getresponse()
+        document = json.loads(response.read() or b'null')
+        return response.status, document
+
+
+def run_client(host, port, stores, names, deadline, seed, latencies, errors):
+    client = Client(host, port)
+    rng = random.Random(seed)
+    kinds, weights = zip(*MIX)
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        store = rng.choice(stores)
+        path = f"/schedules/{store}"
+        if kind == 'summary':
+            method, path, body = 'GET', path, None
+        elif kind == 'assign':
+            method, path, body = 'POST', path + "/assign", {'name': rng.choice(names), 'days': [rng.choice(DAYS)],
+                                                             'force': True}
+        elif kind == 'remove':
+            method, path, body = 'POST', path + "/remove", {'name': rng.choice(names), 'day': rng.choice(DAYS)}
+        elif kind == 'needed':
+            method, path, body = 'PUT', path + "/needed", {'needed': {day: rng.randrange(len(names) // 5 + 1)
+                                                                     for day in DAYS}, 'max_days': 3}
+        else:
+            method, path, body = 'POST', path + "/generate", {'solver': 'greedy'}
+        start = time.perf_counter()
+        status, _ = client.request(method, path, body)
+        latencies[kind].append(time.perf_counter() - start)
+        if status >= 500:
+            errors.append((kind, status))
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1e3 if values else float('nan')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the schedule service.")
+    parser.add_argument('--url', default=None, help="running server to test (default: start one here)")
+    parser.add_argument('--roster', default=None, help="roster file name on the server (default: a synthetic CSV)")
+    parser.add_argument('--rows', type=int, default=10000, help="employees in the synthetic roster")
+    parser.add_argument('--stores', type=int, default=8, help="schedules to spread the requests over")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent client connections")
+    parser.add_argument('--seconds', type=float, default=10.0, help="how long to send requests")
+    args = parser.parse_args(argv)
+    configure_logging("OFF")
+
+    server = None
+    if args.url:
+        host, port = urlsplit(args.url).hostname, urlsplit(args.url).port or 80
+    else:
+        server = ScheduleServer(('127.0.0.1', 0), ScheduleService(DATA_DIR, os.path.join(DATA_DIR, "exports")))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[:2]
+    roster = args.roster or os.path.basename(write_roster(os.path.join(DATA_DIR, f"roster_{args.rows}.csv"), args.rows))
+
+    # Same names as synthetic.make_roster_frame; unknown names just come back as 404s
+    names = [f"Employee {i:07d}" for i in range(args.rows)]
+    stores = [f"store{idx}" for idx in range(args.stores)]
+    setup = Client(host, port)
+    start = time.perf_counter()
+    for store in stores:
+        for method, path, body in [
+            ('POST', f"/schedules/{store}/roster", {'path': roster}),
+            ('PUT', f"/schedules/{store}/needed", {'needed': {day: int(args.rows * NEEDED_SHARE) for day in DAYS},
+                                                   'max_days': 3}),
+            ('POST', f"/schedules/{store}/generate", {'solver': 'greedy'}),
+        ]:
+            status, document = setup.request(method, path, body)
+            if status != 200:
+                raise SystemExit(f"{method} {path} failed: {status} {document}")
+    print(f"Set up {len(stores)} stores of {args.rows} employees in {time.perf_counter() - start:.2f}s")
+
+    latencies = {kind: [] for kind, _ in MIX}
+    errors = []
+    deadline = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=run_client, args=(host, port, stores, names, deadline, seed, latencies, errors))
+               for seed in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    everything = [value for values in latencies.values() for value in values]
+    print(f"\n{'request':<10} {'count':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for kind, values in list(latencies.items()) + [('all', everything)]:
+        print(f"{kind:<10} {len(values):>8} {len(values) / elapsed:>9.1f} {percentile(values, 50):>9.2f} "
+              f"{percentile(values, 99):>9.2f}")
+    if errors:
+        print(f"\n{len(errors)} server errors, e.g. {errors[0]}")
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+"""Time shift-level availability: loading hour cells, "who can work 14:00-18:00 on Thu"
+through the SlotIndex against checking employees one by one, and filling shift demand.
+
+Usage: python benchmarks/bench_slots.py [rows ...]
+"""
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, roster_from_frame
+
+QUERIES = [('Thu', '14:00', '18:00'), ('Sat', '06:00', '10:00'), ('Mon', '09:00', '21:00')]
+SHIFTS = {'Open': 0.05, 'Mid': 0.05, 'Close': 0.08, '11:00-14:00': 0.04}  # Share of the roster per shift
+
+
+def timed(func, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'load':>8} {'index build':>12} {'query (scan)':>13} {'query (index)':>14} {'fill shifts':>12}")
+    for rows in sizes:
+        frame = make_roster_frame(rows, hours=True)
+        roster, load_time = timed(lambda: roster_from_frame(frame))
+        _, build_time = timed(lambda: roster.slot_index)
+        employees = roster.employees
+
+        def scan():
+            return [[emp for emp in employees if emp.is_available_between(day, start, end)]
+                    for day, start, end in QUERIES]
+
+        def indexed():
+            return [roster.slot_index.available(day, f"{start}-{end}") for day, start, end in QUERIES]
+
+        scanned, scan_time = timed(scan)
+        found, index_time = timed(indexed, repeat=5)
+        assert [[emp.name for emp in matches] for matches in scanned] == \
+            [[roster.names[row] for row in matches] for matches in found]
+
+        schedule = Schedule(DAYS, roster)
+        for day in DAYS:
+            schedule.set_shift_needed(day, {shift: int(rows * share) for shift, share in SHIFTS.items()})
+        _, fill_time = timed(schedule.generate_shift_schedule)
+        filled = sum(len(employees) for shifts in schedule.shifts.values() for employees in shifts.values())
+        needed = sum(sum(shifts.values()) for shifts in schedule.shift_needed.values())
+
+        print(f"{rows:>8} {load_time:>7.3f}s {build_time:>11.3f}s {scan_time / len(QUERIES):>12.5f}s "
+              f"{index_time / len(QUERIES):>13.6f}s {fill_time:>11.3f}s  ({filled}/{needed} filled)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,43 @@
+"""Compare coverage, runtime and weekend spread of the greedy and flow solvers.
+
+Every employee is capped at MAX_DAYS days and each day needs NEEDED_SHARE of the roster,
+so the greedy pass's early picks can starve later days.
+
+Usage: python benchmarks/bench_solvers.py [rows ...]
+"""
+import sys
+import time
+from collections import Counter
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, SOLVERS, Schedule, roster_from_frame
+
+MAX_DAYS = 3
+NEEDED_SHARE = 0.35
+DENSITY = 0.4
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'solver':>8} {'time':>9} {'coverage':>9} {'2+ weekend days':>16} {'max days':>9}")
+    for rows in sizes:
+        schedule = Schedule(DAYS, roster_from_frame(make_roster_frame(rows, DENSITY)))
+        schedule.set_employees_needed({day: int(rows * NEEDED_SHARE) for day in DAYS})
+        schedule.max_days_per_week = MAX_DAYS
+        needed = sum(schedule.employees_needed.values())
+
+        for name, solver in SOLVERS.items():
+            schedule.solver = solver()
+            start = time.perf_counter()
+            plan = schedule.plan_schedule()
+            elapsed = time.perf_counter() - start
+
+            assigned = sum(len(plan[day]) for day in DAYS)
+            days_worked = Counter(row for day in DAYS for row in plan[day])
+            weekends = Counter(row for day in ('Sat', 'Sun') for row in plan[day])
+            assert max(days_worked.values(), default=0) <= MAX_DAYS
+            print(f"{rows:>8} {name:>8} {elapsed:>8.3f}s {assigned / needed:>8.1%} "
+                  f"{sum(1 for count in weekends.values() if count > 1):>16} {max(days_worked.values(), default=0):>9}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,71 @@
+"""Startup cost: importing schedule_core (the model) and scheduleapp (the window) in fresh
+interpreters, which heavy modules each import actually loaded, and the time from a cold
+interpreter to the first drawn window. The window needs a display (e.g. xvfb-run) and is
+skipped without one. A warm-up run writes the bytecode caches first, so compiling the
+modules is not counted.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('numpy', 'pandas', 'openpyxl', 'tkinter')
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ' '.join(loaded) or '-')
+"""
+
+WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import scheduleapp
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print('no display')
+    raise SystemExit
+app = scheduleapp.ScheduleWindow(root)
+root.update()
+print(time.perf_counter() - start)
+app.watcher.stop()
+root.destroy()
+"""
+
+
+def run(script):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # Startup normally reads cached bytecode
+    result = subprocess.run([sys.executable, '-c', script], cwd=REPO_DIR, env=env, capture_output=True, text=True,
+                            check=True)
+    return result.stdout.split(maxsplit=1)
+
+
+def main(runs):
+    print(f"{'':<22} {'median':>9} {'min':>9}   loaded")
+    for module in ('schedule_core', 'scheduleapp', 'pandas'):
+        script = IMPORT_SCRIPT.format(module=module, heavy=HEAVY)
+        run(script)
+        results = [run(script) for _ in range(runs)]
+        times = [float(elapsed) for elapsed, _ in results]
+        print(f"{'import ' + module:<22} {statistics.median(times) * 1e3:>7.1f}ms {min(times) * 1e3:>7.1f}ms   "
+              f"{results[0][1].strip()}")
+
+    first = run(WINDOW_SCRIPT)
+    if first[0] == 'no':
+        print(f"{'first window':<22} skipped (no display)")
+        return
+    times = [float(run(WINDOW_SCRIPT)[0]) for _ in range(runs)]
+    print(f"{'first window':<22} {statistics.median(times) * 1e3:>7.1f}ms {min(times) * 1e3:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,76 @@
+"""Time the edit journal: recording manual edits, undoing and redoing them, and reopening a
+journal (snapshot plus replay) compared with generating the schedule again. The reopened
+schedule is checked against the one that was journaled.
+
+Usage: python benchmarks/bench_store.py [rows ...]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, roster_from_frame
+from schedule_store import ScheduleStore
+
+EDITS = 1000
+NEEDED_SHARE = 0.1
+
+
+def names(schedule):
+    return {day: [emp.name for emp in schedule.schedule[day]] for day in schedule.days}
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'generate':>10} {'per edit':>10} {'per undo':>10} {'per redo':>10} {'reopen':>10}")
+    folder = tempfile.mkdtemp()
+    try:
+        for rows in sizes:
+            roster = roster_from_frame(make_roster_frame(rows))
+            path = os.path.join(folder, f"journal_{rows}.sqlite")
+            schedule = Schedule(list(DAYS), roster)
+            store = ScheduleStore(path, schedule)
+            store.set_settings({day: int(rows * NEEDED_SHARE) for day in DAYS}, None)
+
+            start = time.perf_counter()
+            store.apply_plan(schedule.plan_schedule())
+            schedule.refresh_unassigned_employees()
+            generate_time = time.perf_counter() - start
+
+            rng = random.Random(0)
+            start = time.perf_counter()
+            for _ in range(EDITS):
+                day, employee = rng.choice(DAYS), roster.employee(rng.randrange(rows))
+                if not store.remove(day, employee):
+                    store.assign(day, employee, force=True)
+            edit_time = (time.perf_counter() - start) / EDITS
+
+            steps = store.head
+            start = time.perf_counter()
+            for _ in range(EDITS // 2):
+                store.undo()
+            undo_time = (time.perf_counter() - start) / (EDITS // 2)
+            start = time.perf_counter()
+            for _ in range(EDITS // 2):
+                store.redo()
+            redo_time = (time.perf_counter() - start) / (EDITS // 2)
+            assert store.head == steps
+            expected = names(schedule)
+            store.close()
+
+            reopened = Schedule(list(DAYS), roster)
+            start = time.perf_counter()
+            ScheduleStore(path, reopened).close()
+            reopened.refresh_unassigned_employees()
+            reopen_time = time.perf_counter() - start
+            assert names(reopened) == expected, "reopened schedule differs from the journaled one"
+            print(f"{rows:>8} {generate_time:>9.4f}s {edit_time * 1e3:>8.3f}ms {undo_time * 1e3:>8.3f}ms "
+                  f"{redo_time * 1e3:>8.3f}ms {reopen_time:>9.4f}s")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,201 @@
+"""Full-pipeline benchmark suite with machine-readable results.
+
+For each roster size this times loading (xlsx through load_employees_from_excel, CSV through
+roster_from_frame), generate_schedule, a sequence of manual add/remove edits,
+refresh_unassigned_employees after a roster swap, and the grid refresh that follows an edit.
+Tk is stubbed (bench_grid.StubTree) unless --tk is given, which drives real ttk widgets and
+needs a display, e.g. under Xvfb:
+
+    xvfb-run python benchmarks/bench_suite.py --tk
+
+Every run writes JSON (environment plus the best-of-repeat timings per size) so runs can be
+compared; --compare prints old vs new and exits non-zero when anything slowed down by more
+than --threshold.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000 1000000] [--density 0.5] [--out results.json]
+    python benchmarks/bench_suite.py --compare benchmarks/results/suite-20260101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic import write_roster
+from bench_grid import PAGE_SIZE, StubScrollbar, StubTree
+from schedule_core import DAYS, Schedule, load_employees_from_excel, load_roster_from_excel, roster_from_frame
+from scheduleapp import VirtualGrid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+EDITS = 1000  # Manual add/remove operations per size
+NEEDED_SHARE = 0.1  # Share of the roster needed each day
+
+
+def best_of(repeat, func, setup=None):
+    """Smallest wall time of `repeat` calls to func(), running setup() untimed before each."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_grid(tk_root):
+    columns = ["Row"] + DAYS
+    if tk_root is None:
+        return VirtualGrid(StubTree(), StubScrollbar(), columns, PAGE_SIZE)
+    from tkinter import ttk
+    tree = ttk.Treeview(tk_root, columns=columns, show='headings')
+    scrollbar = ttk.Scrollbar(tk_root, orient='vertical')
+    return VirtualGrid(tree, scrollbar, columns, PAGE_SIZE)
+
+
+def bench_size(rows, density, repeat, tk_root):
+    stem = os.path.join(DATA_DIR, f"roster_{rows}" + ("" if density == 0.5 else f"_d{density}"))
+    xlsx_path = write_roster(stem + ".xlsx", rows, density)
+    csv_path = write_roster(stem + ".csv", rows, density)
+    result = {'rows': rows, 'density': density}
+
+    result['load_xlsx'] = best_of(repeat, lambda: load_employees_from_excel(xlsx_path))
+    result['load_csv'] = best_of(repeat, lambda: roster_from_frame(pd.read_csv(csv_path)))
+
+    roster = load_roster_from_excel(xlsx_path)
+    schedule = Schedule(DAYS, roster)
+    schedule.set_employees_needed({day: int(rows * NEEDED_SHARE) for day in DAYS})
+    result['generate'] = best_of(repeat, schedule.generate_schedule)
+
+    # What the manual assignment window does: edit, then bring the unassigned lists up to date
+    rng = random.Random(0)
+    edits = [(rng.choice(DAYS), roster.employee(rng.randrange(rows)), rng.random() < 0.5) for _ in range(EDITS)]
+
+    def run_edits():
+        for day, employee, add in edits:
+            if add:
+                schedule.manually_add_employee(day, employee)
+            else:
+                schedule.remove_employee_from_day(day, employee)
+            schedule.refresh_unassigned_employees()
+    result['edits'] = best_of(repeat, run_edits, schedule.generate_schedule)
+    result['per_edit'] = result['edits'] / EDITS
+
+    # Replacing the roster invalidates the unassigned lists; the next refresh rebuilds them
+    result['refresh_unassigned'] = best_of(
+        repeat, schedule.refresh_unassigned_employees, lambda: setattr(schedule, 'employees', roster))
+
+    # One double-click in the UI: assign, then refresh the schedule and unassigned grids
+    schedule.generate_schedule()
+    grids = [make_grid(tk_root), make_grid(tk_root)]
+    for grid, data in zip(grids, (schedule.schedule, schedule.unassigned_employees)):
+        grid.set_data([data[day] for day in DAYS])
+
+    def edit_and_refresh():
+        day, employee, _ = edits[0]
+        if not schedule.remove_employee_from_day(day, employee):
+            schedule.manually_add_employee(day, employee)
+        for grid, data in zip(grids, (schedule.schedule, schedule.unassigned_employees)):
+            grid.set_data([data[day] for day in DAYS])
+        if tk_root is not None:
+            tk_root.update_idletasks()
+    result['grid_refresh'] = best_of(repeat, edit_and_refresh)
+    return result
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+METRICS = ['load_xlsx', 'load_csv', 'generate', 'per_edit', 'refresh_unassigned', 'grid_refresh']
+
+
+def print_results(results):
+    print(f"{'rows':>8} " + " ".join(f"{metric:>18}" for metric in METRICS))
+    for result in results:
+        print(f"{result['rows']:>8} " + " ".join(f"{result[metric]:>17.6f}s" for metric in METRICS))
+
+
+def compare(old_path, results, threshold):
+    """Print old vs new per size and metric; return how many got slower than the threshold allows."""
+    with open(old_path) as old_file:
+        old = {(result['rows'], result['density']): result for result in json.load(old_file)['results']}
+    regressions = 0
+    print(f"\nCompared with {old_path}:")
+    for result in results:
+        before = old.get((result['rows'], result['density']))
+        if before is None:
+            continue
+        for metric in METRICS:
+            if metric not in before:
+                continue
+            ratio = result[metric] / before[metric] if before[metric] else float('inf')
+            flag = "  REGRESSION" if ratio > 1 + threshold else ""
+            regressions += bool(flag)
+            print(f"{result['rows']:>8} {metric:<20} {before[metric]:>11.6f}s -> {result[metric]:>11.6f}s "
+                  f"({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the roster pipeline and record the results as JSON.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help="roster sizes")
+    parser.add_argument('--density', type=float, default=0.5, help="chance an employee is available on a day")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement; the best is kept")
+    parser.add_argument('--out', default=None, help="results file (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument('--compare', default=None, help="earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="slowdown counted as a regression (0.2 = 20%%)")
+    parser.add_argument('--tk', action='store_true', help="use real Tk widgets for the grid refresh (needs a display)")
+    args = parser.parse_args(argv)
+
+    tk_root = None
+    if args.tk:
+        import tkinter as tk
+        tk_root = tk.Tk()
+        tk_root.withdraw()
+
+    results = []
+    for rows in args.sizes:
+        results.append(bench_size(rows, args.density, args.repeat, tk_root))
+        print(f"  {rows} rows done", file=sys.stderr)
+    if tk_root is not None:
+        tk_root.destroy()
+
+    print_results(results)
+    out_path = args.out or os.path.join(RESULTS_DIR, time.strftime("suite-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, 'w') as out:
+        json.dump({'environment': dict(environment(), tk=args.tk, repeat=args.repeat, edits=EDITS),
+                   'results': results}, out, indent=2)
+    print(f"\nWrote {out_path}")
+
+    if args.compare:
+        return 1 if compare(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
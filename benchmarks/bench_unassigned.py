@@ -0,0 +1,54 @@
+"""Check and time delta-maintained unassigned lists against full rebuilds.
+
+Runs random add/remove sequences, verifies after each batch that the delta-maintained
+unassigned lists match a from-scratch rebuild, then compares the cost of one edit.
+
+Usage: python benchmarks/bench_unassigned.py [rows] [edits]
+"""
+import random
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, roster_from_frame
+
+
+def snapshot(schedule):
+    return {day: list(schedule.unassigned_employees[day]) for day in DAYS}
+
+
+def main(rows, edits):
+    rng = random.Random(0)
+    roster = roster_from_frame(make_roster_frame(rows))
+    employees = roster.employees
+    schedule = Schedule(DAYS, roster)
+    schedule.set_employees_needed({day: rows // 20 for day in DAYS})
+
+    schedule.generate_schedule()
+
+    delta_time = 0.0
+    for batch in range(10):
+        for _ in range(edits // 10):
+            day = rng.choice(DAYS)
+            employee = rng.choice(employees)
+            start = time.perf_counter()
+            if rng.random() < 0.5:
+                schedule.manually_add_employee(day, employee)
+            else:
+                schedule.remove_employee_from_day(day, employee)
+            schedule.refresh_unassigned_employees()
+            delta_time += time.perf_counter() - start
+
+        maintained = snapshot(schedule)
+        start = time.perf_counter()
+        schedule.rebuild_unassigned_employees()
+        rebuild_time = time.perf_counter() - start
+        assert maintained == snapshot(schedule), f"unassigned lists diverged after batch {batch}"
+
+    print(f"{rows} employees, {edits} random edits: delta state matches full rebuild")
+    print(f"  per edit (delta): {delta_time / edits * 1e6:10.1f} us")
+    print(f"  per full rebuild: {rebuild_time * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000, int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,72 @@
+"""Validate a generated schedule: a report from the validator's running counts, rebuilding the
+counts from scratch, and checking every assignment one at a time in Python. Also times an edit
+(force-assign then remove) with the counts kept up to date.
+
+Usage: python benchmarks/bench_validate.py [rows ...]
+"""
+import sys
+import time
+
+from synthetic import make_roster_frame
+from schedule_core import DAYS, Schedule, ScheduleValidator, roster_from_frame
+
+NEEDED_SHARE = 0.1
+MAX_DAYS = 3
+EDITS = 2000
+
+
+def check_one_by_one(schedule):
+    """Conflict totals the way single checks find them: walk every assignment."""
+    worked = {}
+    forced = 0
+    for day in schedule.days:
+        for employee in schedule.schedule[day]:
+            worked[employee] = worked.get(employee, 0) + 1
+            forced += not employee.is_available(day)
+    caps = schedule.validation.caps
+    rows = schedule.roster.rows_of(list(worked))
+    over_cap = sum(count > caps[row] for row, count in zip(rows.tolist(), worked.values()))
+    return forced, over_cap
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'report':>10} {'rebuild':>10} {'one by one':>11} {'edit':>10}")
+    for rows in sizes:
+        roster = roster_from_frame(make_roster_frame(rows))
+        schedule = Schedule(list(DAYS), roster)
+        schedule.set_employees_needed({day: int(rows * NEEDED_SHARE) for day in DAYS})
+        schedule.max_days_per_week = MAX_DAYS
+        schedule.generate_schedule()
+        # Force some people past their cap and onto days they can't work
+        for row in range(0, rows, 97):
+            for day in DAYS:
+                schedule.add_employee_to_day(day, roster.employee(row), force=True)
+
+        start = time.perf_counter()
+        ScheduleValidator(schedule)
+        rebuild_time = time.perf_counter() - start
+
+        schedule.validation  # Counts in place, as they are once a schedule has been shown
+        start = time.perf_counter()
+        report = schedule.validate()
+        report_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = check_one_by_one(schedule)
+        scan_time = time.perf_counter() - start
+        assert expected == (len(report.forced), len(report.over_cap)), "report differs from the one-by-one checks"
+
+        employees = [roster.employee(row) for row in range(1, rows, max(1, rows // EDITS))]
+        start = time.perf_counter()
+        for idx, employee in enumerate(employees):
+            day = DAYS[idx % len(DAYS)]
+            schedule.add_employee_to_day(day, employee, force=True)
+            schedule.remove_employee_from_day(day, employee)
+            schedule.validation.counts()
+        edit_time = (time.perf_counter() - start) / len(employees)
+        print(f"{rows:>8} {report_time * 1e3:>8.2f}ms {rebuild_time * 1e3:>8.2f}ms {scan_time * 1e3:>9.2f}ms "
+              f"{edit_time * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,66 @@
+"""Synthetic rosters for the benchmarks, shaped like the sheets in excel_sheets/.
+
+Also usable on its own to write a roster workbook or CSV:
+    python benchmarks/synthetic.py rosters/big.xlsx --rows 100000 --density 0.3
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schedule_core import DAYS
+
+
+# Hours a synthetic employee can give instead of "Yes" when make_roster_frame(hours=True)
+HOURS = ["Yes", "Open", "Mid", "Close", "Open, Close", "06:00-12:00", "09:00-17:00", "12:00-20:00",
+         "16:00-22:00", "08:00-12:00, 17:00-21:00"]
+
+
+def make_roster_frame(rows, density=0.5, seed=0, hours=False):
+    """Build a roster DataFrame with `rows` employees, each available on a day with probability `density`.
+
+    With `hours`, available cells hold hours picked from HOURS instead of just "Yes".
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'Name': [f"Employee {i:07d}" for i in range(rows)]})
+    available = rng.random((rows, len(DAYS))) < density
+    for day_idx, day in enumerate(DAYS):
+        # Blank cells for unavailable days, like the hand-made sheets
+        values = np.array(HOURS, dtype=object)[rng.integers(len(HOURS), size=rows)] if hours else "Yes"
+        frame[day] = np.where(available[:, day_idx], values, None)
+    return frame
+
+
+def write_roster(path, rows, density=0.5, seed=0):
+    """Write a synthetic roster to `path` (reused if it already exists) and return the path.
+
+    The format follows the extension: .csv writes CSV, anything else an xlsx workbook.
+    """
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        frame = make_roster_frame(rows, density, seed)
+        if path.endswith('.csv'):
+            frame.to_csv(path, index=False)
+        else:
+            frame.to_excel(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic roster (.xlsx or .csv).")
+    parser.add_argument('path', help="output file; the extension picks the format")
+    parser.add_argument('--rows', type=int, default=1000, help="number of employees")
+    parser.add_argument('--density', type=float, default=0.5, help="chance an employee is available on a day")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+    if os.path.exists(args.path):
+        os.remove(args.path)  # Asked for explicitly, so don't reuse an old file
+    print(write_roster(args.path, args.rows, args.density, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Headless batch scheduling: generate a schedule for every roster workbook (or CSV/Parquet file) given.
+
+Example:
+    python schedule_batch.py excel_sheets "stores/*.xlsx" --needed Sun=2,Mon=3,Tue=3,Wed=3,Thu=3,Fri=4,Sat=4 --out schedules
+
+Each roster is loaded and scheduled in its own worker process; one output file is written
+per roster and a timing summary is printed at the end.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from schedule_export import EXPORT_FORMATS, LAYOUTS, export_schedule
+from schedule_core import DAYS, ROSTER_EXTENSIONS, SOLVERS, Metrics, RosterCache, Schedule, configure_logging, metrics, profile_generate
+
+
+def find_rosters(patterns):
+    """Expand directories and glob patterns into a sorted list of roster files (.xlsx, .csv, .parquet)."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.update(os.path.join(pattern, name) for name in os.listdir(pattern)
+                         if name.lower().endswith(ROSTER_EXTENSIONS))
+            continue
+        paths.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def output_stems(paths, out_dir):
+    """Output path (without extension) for each roster: its file name without the extension, or,
+    where two rosters would share one, its path below their common folder with the extension kept
+    ("north/store.xlsx" -> "north_store.xlsx"), so no roster's schedule overwrites another's."""
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    shared = {name for name in names if names.count(name) > 1}
+    if shared:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+        names = [name if name not in shared else
+                 os.path.relpath(os.path.abspath(path), root).replace(os.sep, '_')
+                 for name, path in zip(names, paths)]
+    return [os.path.join(out_dir, name) for name in names]
+
+
+def parse_needed(text):
+    """Parse "3" (every day) or "Sun=2,Mon=3,..." (unlisted days need 0) into employees_needed."""
+    if '=' not in text:
+        return {day: int(text) for day in DAYS}
+    needed = {day: 0 for day in DAYS}
+    for part in text.split(','):
+        day, _, count = part.partition('=')
+        day = day.strip().capitalize()
+        if day not in needed:
+            raise argparse.ArgumentTypeError(f"unknown day {day!r}; expected one of {', '.join(DAYS)}")
+        needed[day] = int(count)
+    return needed
+
+
+def schedule_roster(path, needed, stem, solver='greedy', max_days=None, log_level="OFF", profile=False,
+                    out_format='txt', layout='grid'):
+    """Load one roster, generate its schedule and write it to `stem` plus the format's extension.
+    Runs in a worker process.
+
+    The schedule is written as text (print_schedule) or exported as .xlsx/.csv/.json in `layout`.
+    With `profile`, the generate step runs under cProfile and its stats go next to the output.
+    The result carries this roster's metrics snapshot so the parent can aggregate them.
+    """
+    configure_logging(log_level)
+    metrics.reset()  # Pool workers are reused; report only this roster's numbers
+    result = {'path': path, 'employees': 0, 'assigned': 0, 'needed': sum(needed.values()), 'error': None}
+    try:
+        start = time.perf_counter()
+        roster = RosterCache(max_entries=1).load(path)
+        loaded = time.perf_counter()
+
+        schedule = Schedule(list(DAYS), roster)
+        schedule.set_employees_needed(needed)
+        schedule.solver = SOLVERS[solver]()
+        schedule.max_days_per_week = max_days
+        if profile:
+            profile_generate(schedule, stem + ".prof")
+        else:
+            schedule.generate_schedule()
+        generated = time.perf_counter()
+
+        out_path = f"{stem}.{out_format}"
+        if out_format == 'txt':
+            with open(out_path, 'w') as out:
+                out.write(schedule.print_schedule())
+        else:
+            export_schedule(schedule, out_path, layout)
+        written = time.perf_counter()
+
+        result.update(employees=len(roster), assigned=sum(len(schedule.schedule[day]) for day in DAYS),
+                      output=out_path, load=loaded - start, generate=generated - loaded, write=written - generated)
+    except Exception as error:  # One bad workbook shouldn't stop the batch
+        result['error'] = f"{type(error).__name__}: {error}"
+    result['metrics'] = metrics.snapshot()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate schedules for many roster workbooks without the GUI.")
+    parser.add_argument('rosters', nargs='+', help="workbooks, directories or glob patterns")
+    parser.add_argument('--needed', type=parse_needed, required=True,
+                        help='employees needed per day: "3" or "Sun=2,Mon=3,..."')
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default='greedy', help="scheduling strategy")
+    parser.add_argument('--max-days', type=int, default=None, help="most days per week for any employee")
+    parser.add_argument('--out', default="schedules", help="directory for the generated schedules")
+    parser.add_argument('--format', default='txt', choices=['txt'] + [extension[1:] for extension in EXPORT_FORMATS],
+                        help="output file format (default: txt)")
+    parser.add_argument('--layout', default='grid', choices=LAYOUTS,
+                        help="grid of days, or one row per employee (xlsx/csv/json only)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--log-level', default="OFF", help="scheduler log level in the workers (default: OFF)")
+    parser.add_argument('--metrics', default=None,
+                        help="write aggregated metrics here (Prometheus text for .prom/.txt, JSON otherwise)")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each roster's generate step into <out>/<roster>.prof")
+    args = parser.parse_args(argv)
+
+    paths = find_rosters(args.rosters)
+    if not paths:
+        parser.error("no roster workbooks found")
+    stems = output_stems(paths, args.out)
+    clashes = sorted(stem for stem in set(stems) if stems.count(stem) > 1)
+    if clashes:
+        parser.error(f"several rosters would be written to {', '.join(clashes)}")
+    os.makedirs(args.out, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        count = len(paths)
+        results = list(pool.map(schedule_roster, paths, [args.needed] * count, stems,
+                                [args.solver] * count, [args.max_days] * count, [args.log_level] * count,
+                                [args.profile] * count, [args.format] * count, [args.layout] * count))
+    elapsed = time.perf_counter() - start
+
+    if args.metrics:
+        combined = Metrics()
+        for result in results:
+            combined.merge(result['metrics'])
+        combined.write(args.metrics)
+
+    failed = [result for result in results if result['error']]
+    print(f"{'roster':<40} {'employees':>9} {'assigned':>9} {'load':>8} {'generate':>9} {'write':>8}")
+    for result in results:
+        name = os.path.basename(result['path'])
+        if result['error']:
+            print(f"{name:<40} FAILED: {result['error']}")
+            continue
+        print(f"{name:<40} {result['employees']:>9} {result['assigned']:>4}/{result['needed']:<4} "
+              f"{result['load']:>7.3f}s {result['generate']:>8.3f}s {result['write']:>7.3f}s")
+
+    employees = sum(result['employees'] for result in results)
+    print(f"\n{len(results) - len(failed)}/{len(results)} rosters scheduled in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} rosters/s, {employees / elapsed:,.0f} employees/s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
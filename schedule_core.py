@@ -0,0 +1,1799 @@
+"""The scheduling model without the window: rosters and how they load, availability indexes,
+Employee and Schedule, the solvers, metrics and logging.
+
+    from schedule_core import DAYS, Schedule, load_roster
+    schedule = Schedule(list(DAYS), load_roster("excel_sheets/store.xlsx"))
+    schedule.set_employees_needed({day: 3 for day in DAYS})
+    schedule.generate_schedule()
+
+Importing it takes a few milliseconds and needs no GUI toolkit: numpy is imported on first
+use and pandas (with openpyxl) only when a roster file is read. The Tk window is in
+scheduleapp, which re-exports everything here.
+"""
+import bisect
+import datetime
+import functools
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+
+# What `from scheduleapp import *` has always provided, and what scheduleapp re-exports
+__all__ = [
+    'DAYS', 'DAY_BITS', 'SLOT_MINUTES', 'SLOTS_PER_DAY', 'FULL_DAY', 'SHIFTS', 'ROSTER_EXTENSIONS', 'CHUNK_ROWS', 'SOLVERS',
+    'logger', 'configure_logging', 'metrics', 'Metrics', 'profiled', 'profile_generate',
+    'LoadProblem', 'AssignmentProblem', 'ValidationReport',
+    'Roster', 'RosterDiff', 'AvailabilityIndex', 'RosterCache', 'SlotIndex', 'Shift',
+    'iter_roster_chunks', 'load_roster', 'load_roster_from_excel', 'roster_from_frame', 'load_employees_from_excel',
+    'availability_mask', 'parse_time', 'slot_mask', 'parse_hours', 'is_weekend', 'day_name', 'week_start',
+    'Employee', 'name_sort_key', 'SortedEmployees', 'ScheduleValidator', 'Schedule', 'DateRangeSchedule',
+    'GreedySolver', 'FlowSolver', 'ShiftSolver',
+]
+
+class _DeferredImport:
+    """Stands in for a module until an attribute is first read, then imports it for real and
+    takes its place in this module's globals.
+
+    Unlike importlib's LazyLoader nothing half-loaded is put in sys.modules: the import goes
+    through the normal import lock, so threads that get here at once (server requests, the
+    Tk window's workers) wait for one import instead of seeing a module without attributes.
+    """
+    def __init__(self, global_name, module_name):
+        self._global_name = global_name
+        self._module_name = module_name
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self._module_name)
+        globals()[self._global_name] = module  # Later lookups skip this object
+        return getattr(module, attribute)
+
+np = _DeferredImport('np', 'numpy')  # Most of the import time otherwise; nothing here touches it at import
+
+DAYS = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
+
+# Per-day summaries at INFO, per-employee detail at DEBUG; silent unless configured
+logger = logging.getLogger("scheduleapp")  # The name it had before the model moved here
+logger.addHandler(logging.NullHandler())
+
+def configure_logging(level="INFO"):
+    """Send scheduler log records to stderr at `level` (a name or number); "OFF" silences them."""
+    if str(level).upper() == "OFF":
+        logger.disabled = True
+        return
+    logger.disabled = False
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    if not any(isinstance(handler, logging.StreamHandler) for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+
+# A problem found while loading a roster; row is the spreadsheet row number (header is row 1)
+LoadProblem = namedtuple('LoadProblem', ['row', 'column', 'value', 'message'])
+
+# A rule one (employee, day, force) of a batch breaks, one per rule; reason is 'day',
+# 'unavailable', 'full' or 'max days' (the last three can be forced)
+AssignmentProblem = namedtuple('AssignmentProblem', ['employee', 'day', 'reason'])
+
+# Everything wrong with a schedule as it stands. overstaffed/understaffed: {day: employees over
+# or short of employees_needed}; forced: (day, employee) pairs on a day the employee isn't
+# available; over_cap: (employee, days worked, cap) for everyone past their days-per-week limit
+ValidationReport = namedtuple('ValidationReport', ['overstaffed', 'understaffed', 'forced', 'over_cap'])
+
+class Metrics:
+    """Counters and latency histograms for the hot paths (load, generate, refresh, grid renders).
+
+    Thread-safe, so the background jobs can record into the same instance as the UI.
+    Export with to_json() or to_prometheus(); write() picks the format from the file name.
+    """
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, float('inf'))  # Seconds
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}  # (name, labels) -> total
+            self.histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+
+    def count(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * len(self.BUCKETS) + [0.0, 0]
+            histogram[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe how long the with-block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name):
+        """Decorator form of timer()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Plain-data copy of everything recorded, for JSON or for merge() in another process."""
+        with self._lock:
+            return {
+                'counters': [[name, dict(labels), total] for (name, labels), total in self.counters.items()],
+                'histograms': [[name, dict(labels), list(values)] for (name, labels), values in self.histograms.items()],
+            }
+
+    def merge(self, snapshot):
+        """Add another process's snapshot() into this one."""
+        for name, labels, total in snapshot['counters']:
+            self.count(name, total, **labels)
+        with self._lock:
+            for name, labels, values in snapshot['histograms']:
+                key = (name, tuple(sorted(labels.items())))
+                histogram = self.histograms.setdefault(key, [0] * len(self.BUCKETS) + [0.0, 0])
+                for idx, value in enumerate(values):
+                    histogram[idx] += value
+
+    def to_json(self):
+        snapshot = self.snapshot()
+        snapshot['buckets'] = [str(bound) for bound in self.BUCKETS]
+        return json.dumps(snapshot, indent=2)
+
+    def to_prometheus(self, prefix="schedule_"):
+        """Prometheus text exposition format (counters get a _total suffix)."""
+        def label_text(labels, **extra):
+            pairs = list(labels) + sorted(extra.items())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}" if pairs else ""
+
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {prefix}{name}_total counter")
+                for (counter, labels), total in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f"{prefix}{name}_total{label_text(labels)} {total}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {prefix}{name} histogram")
+                for (histogram, labels), values in sorted(self.histograms.items()):
+                    if histogram != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket in zip(self.BUCKETS, values):
+                        cumulative += bucket
+                        le = "+Inf" if bound == float('inf') else repr(bound)
+                        lines.append(f"{prefix}{name}_bucket{label_text(labels, le=le)} {cumulative}")
+                    lines.append(f"{prefix}{name}_sum{label_text(labels)} {values[-2]}")
+                    lines.append(f"{prefix}{name}_count{label_text(labels)} {values[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write Prometheus text for *.prom/*.txt paths, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as out:
+            out.write(text)
+
+# Process-wide metrics; the GUI dumps them at exit when SCHEDULE_METRICS names a file
+metrics = Metrics()
+
+@contextmanager
+def profiled(path):
+    """Run the with-block under cProfile and dump pstats to `path` (view with snakeviz, pstats, ...)."""
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        logger.info("Wrote profile to %s.", path)
+
+def profile_generate(schedule, path):
+    """Generate `schedule` once under cProfile and dump the profile to `path`."""
+    with profiled(path):
+        schedule.generate_schedule()
+
+class Roster:
+    """Columnar roster: employee names plus a boolean availability matrix (one column per day).
+
+    Employee objects are only created when something asks for them.
+    """
+    def __init__(self, names, availability, problems=None, max_days=None, slots=None):
+        self.names = names
+        self.availability = availability  # numpy bool array, shape (len(names), len(DAYS))
+        # Hours each employee can work (uint64 slot masks, shape like availability), or None when
+        # the sheet only says Yes/No per day; see SlotIndex
+        self.slots = slots
+        self.problems = problems if problems is not None else []
+        # Most days each employee may work per week (the optional "Max Days" column); 7 means no cap
+        self.max_days = max_days if max_days is not None else np.full(len(names), len(DAYS), dtype=np.int8)
+        self.days = list(DAYS)
+        self._employees = [None] * len(names)
+        self._rows = {}  # id(Employee) -> row, for the Employees handed out so far
+        self._index = None
+        self._slot_index = None
+
+        # One availability bitmask per employee (bit i set = available on DAYS[i])
+        weights = 1 << np.arange(len(DAYS), dtype=np.uint8)
+        self.masks = (availability * weights).sum(axis=1, dtype=np.uint8)
+
+        # Name -> row; the first employee with a name wins, like the old linear lookups did
+        self.rows_by_name = dict(zip(reversed(names), range(len(names) - 1, -1, -1)))
+
+    def __len__(self):
+        return len(self.names)
+
+    def employee(self, row):
+        """Return the Employee for a row, creating it on first use."""
+        employee = self._employees[row]
+        if employee is None:
+            slots = None if self.slots is None else tuple(self.slots[row].tolist())
+            employee = self._employees[row] = Employee(self.names[row], int(self.masks[row]), slots)
+            self._rows[id(employee)] = row
+        return employee
+
+    def find(self, name):
+        """Return the first employee called `name`, or None."""
+        row = self.rows_by_name.get(name)
+        return None if row is None else self.employee(row)
+
+    @property
+    def employees(self):
+        """All employees as a list, in roster order."""
+        return [self.employee(row) for row in range(len(self.names))]
+
+    @property
+    def index(self):
+        """AvailabilityIndex for this roster, built on first use and shared by every Schedule using it."""
+        if self._index is None:
+            self._index = AvailabilityIndex(self)
+        return self._index
+
+    @property
+    def slot_index(self):
+        """SlotIndex for time-of-day queries, built on first use."""
+        if self._slot_index is None:
+            self._slot_index = SlotIndex(self)
+        return self._slot_index
+
+    def rows_of(self, employees):
+        """Roster rows of Employee objects handed out by this roster; others are skipped."""
+        rows = self._rows
+        return np.array([rows[id(emp)] for emp in employees if id(emp) in rows], dtype=np.intp)
+
+    def with_availability(self, availability):
+        """A roster of the same employees (names, caps) with different availability.
+
+        The new roster's index reuses this one's name order, so only the day lists are rebuilt,
+        and employees whose availability is unchanged keep their Employee objects.
+        """
+        roster = Roster(self.names, availability, self.problems, self.max_days, self.slots)
+        roster._index = AvailabilityIndex(roster, base=self.index)
+        changed = set(np.flatnonzero(roster.masks != self.masks).tolist())
+        roster._employees = [None if row in changed else emp for row, emp in enumerate(self._employees)]
+        roster._rows = {key: row for key, row in self._rows.items() if row not in changed}
+        return roster
+
+    def changed_rows(self, other):
+        """Rows whose days or hours differ in `other`, a roster of the same names in the same order."""
+        changed = self.masks != other.masks
+        if self.slots is not None and other.slots is not None:
+            changed |= (self.slots != other.slots).any(axis=1)
+        elif (self.slots is None) != (other.slots is None):
+            changed[:] = True
+        return np.flatnonzero(changed)
+
+    def diff(self, other):
+        """What changed between this roster and `other` (a reload of the same sheet), by name.
+
+        Names are compared by their first row, like find(); an employee counts as changed when
+        their days or hours differ.
+        """
+        if other.names == self.names:  # The usual edit: same people, different availability
+            return RosterDiff([], [], [self.names[row] for row in self.changed_rows(other)])
+        old, new = self.rows_by_name, other.rows_by_name
+        hours = lambda roster, row: None if roster.slots is None else roster.slots[row].tolist()
+        changed = [name for name, row in old.items() if name in new and (
+                   self.masks[row] != other.masks[new[name]] or hours(self, row) != hours(other, new[name]))]
+        return RosterDiff([name for name in dict.fromkeys(other.names) if name not in old],
+                          [name for name in dict.fromkeys(self.names) if name not in new], changed)
+
+    @classmethod
+    def concatenate(cls, rosters):
+        """One roster from consecutive chunks of a sheet, with problem rows renumbered for the whole sheet."""
+        if len(rosters) == 1:
+            return rosters[0]
+        if not rosters:
+            return cls([], np.zeros((0, len(DAYS)), dtype=bool))
+        problems, offset = [], 0
+        for part in rosters:
+            for problem in part.problems:
+                if problem.row is not None:
+                    problems.append(problem._replace(row=problem.row + offset))
+                elif part is rosters[0]:  # Sheet-wide problems (a missing column) repeat in every chunk
+                    problems.append(problem)
+            offset += len(part)
+        slots = None
+        if any(part.slots is not None for part in rosters):
+            slots = np.concatenate([
+                part.slots if part.slots is not None else np.where(part.availability, np.uint64(FULL_DAY), np.uint64(0))
+                for part in rosters
+            ])
+        return cls([name for part in rosters for name in part.names],
+                   np.concatenate([part.availability for part in rosters]),
+                   problems,
+                   np.concatenate([part.max_days for part in rosters]),
+                   slots)
+
+    @classmethod
+    def from_employees(cls, employees):
+        """Wrap existing Employee objects in a Roster, keeping the same objects."""
+        masks = np.fromiter((emp.mask for emp in employees), dtype=np.uint8, count=len(employees))
+        availability = (masks[:, None] >> np.arange(len(DAYS), dtype=np.uint8) & 1).astype(bool)
+        roster = cls([emp.name for emp in employees], availability)
+        roster._employees = list(employees)
+        roster._rows = {id(emp): row for row, emp in enumerate(employees)}
+        return roster
+
+# Names added to, removed from and with changed availability in a reloaded roster (Roster.diff)
+RosterDiff = namedtuple('RosterDiff', ['added', 'removed', 'changed'])
+
+class AvailabilityIndex:
+    """Availability index built once per roster load.
+
+    Shares the roster's 7-bit mask per employee (bit i set = available on DAYS[i]) and keeps,
+    for each day, the rows of the employees who can be scheduled that day, so the generator
+    never has to look at individual employees to find candidates.
+    """
+    def __init__(self, roster, base=None):
+        self.roster = roster
+        self.days = roster.days
+        self.masks = roster.masks
+
+        if base is not None:  # Index of a roster with the same names: only availability differs
+            self.valid = base.valid
+            self.sort_keys = base.sort_keys
+            self.name_order = base.name_order
+            self.name_rank = base.name_rank
+        else:
+            # Names that aren't strings can't be sorted alongside the others, so they are never candidates
+            self.valid = np.fromiter((isinstance(name, str) for name in roster.names), dtype=bool, count=len(roster))
+            # name_sort_key of every row, and the rows in name order, so day lists never compare names
+            self.sort_keys = [name_sort_key(name) for name in roster.names]
+            self.name_order = sorted(range(len(roster)), key=self.sort_keys.__getitem__)
+            self.name_rank = np.empty(len(roster), dtype=np.intp)  # Position of each row in name_order
+            self.name_rank[self.name_order] = np.arange(len(roster))
+        self.candidates_by_day = {
+            day: np.flatnonzero(roster.availability[:, idx] & self.valid) for idx, day in enumerate(self.days)
+        }
+
+    def candidates(self, day):
+        """Rows of the employees available on `day`, in roster order."""
+        return self.candidates_by_day.get(day, np.zeros(0, dtype=np.intp))
+
+    def count(self, day):
+        """Number of employees available on `day`."""
+        return len(self.candidates(day))
+
+# Roster file types found in excel_sheets/ and read by load_roster
+ROSTER_EXTENSIONS = ('.xlsx', '.csv', '.parquet')
+CHUNK_ROWS = 10000  # Rows parsed at a time when streaming a roster file
+
+def iter_roster_chunks(file_path, chunk_rows=CHUNK_ROWS, progress=None):
+    """Yield a roster file as DataFrames of at most `chunk_rows` rows, never holding the whole
+    sheet: openpyxl read-only mode for .xlsx, chunked reads for .csv, record batches (row group
+    by row group) for .parquet. `progress(fraction)` is called after each chunk, with the share
+    of the file read so far."""
+    import pandas as pd
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.csv':
+        size = os.path.getsize(file_path) or 1
+        with open(file_path, 'rb') as handle:
+            for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+                yield chunk
+                if progress:
+                    progress(min(handle.tell() / size, 1.0))  # Read ahead in blocks, so approximate
+    elif extension == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading .parquet rosters needs pyarrow (pip install pyarrow).") from None
+        parquet = pq.ParquetFile(file_path)
+        total, done = parquet.metadata.num_rows or 1, 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+            done += batch.num_rows
+            if progress:
+                progress(min(done / total, 1.0))
+    else:
+        yield from _iter_xlsx_chunks(file_path, chunk_rows, progress)
+
+def _iter_xlsx_chunks(file_path, chunk_rows, progress=None):
+    import openpyxl
+    import pandas as pd
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = sheet.max_row or 0  # From the sheet's dimension record; 0 if the file doesn't say
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(column) if column is not None else f"Unnamed: {idx}" for idx, column in enumerate(header)]
+        chunk, blank = [], []
+        done = 1  # Sheet rows read, counting the header
+        for row in rows:
+            done += 1
+            # Blank rows only count once something follows them; trailing ones are dropped like read_excel does
+            if all(value is None for value in row):
+                blank.append(row)
+                continue
+            chunk.extend(blank)
+            blank.clear()
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                frame, chunk = pd.DataFrame(chunk, columns=columns), []  # Don't hold the tuples while the frame is used
+                yield frame
+                if progress:
+                    progress(min(done / total, 1.0) if total else 0.0)
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+@metrics.timed('load_roster_seconds')
+def load_roster(file_path, chunk_rows=CHUNK_ROWS, progress=None):
+    """Load a roster from an .xlsx, .csv or .parquet file.
+
+    The file is streamed in chunks and each chunk goes straight into the roster's compact
+    arrays, so peak memory is one chunk of rows rather than several copies of the sheet.
+    `progress(fraction)` is called between chunks, so a background loader can show how far
+    it got and stop there (see iter_roster_chunks).
+    """
+    if not os.path.exists(file_path):
+        return Roster([], np.zeros((0, len(DAYS)), dtype=bool))
+
+    return Roster.concatenate([roster_from_frame(chunk)
+                               for chunk in iter_roster_chunks(file_path, chunk_rows, progress)])
+
+def load_roster_from_excel(file_path):
+    """Load a roster from an Excel (or .csv/.parquet) file; see load_roster."""
+    return load_roster(file_path)
+
+def roster_from_frame(df):
+    """Build a Roster from a DataFrame with a Name column and one "Yes"/blank column per day.
+
+    A day cell can also give hours instead of "Yes" ("09:00-13:00, 17:00-21:00" or shift names
+    from SHIFTS such as "Open"). An optional "Max Days" column caps how many days a week each
+    employee can be scheduled.
+    """
+    import pandas as pd
+
+    problems = []
+
+    missing_days = [day for day in DAYS if day not in df.columns]
+    for day in missing_days:
+        problems.append(LoadProblem(None, day, None, "Day column is missing; treating everyone as unavailable."))
+
+    # "Yes" means available, anything else (blank, "No", ...) means unavailable
+    cells = df.reindex(columns=DAYS)
+    availability = cells.eq("Yes").to_numpy(dtype=bool, copy=True)  # Written to below when cells give hours
+
+    # Anything else is either hours of the day or a value to flag so it doesn't go unnoticed
+    slots = None
+    unexpected = (cells.notna() & ~cells.isin(["Yes", "No"])).to_numpy()
+    if unexpected.any():
+        values = cells.to_numpy()[unexpected]
+        parsed = {value: parse_hours(value) for value in pd.unique(values)}  # Sheets repeat a few shapes
+        masks = np.array([parsed[value] or 0 for value in values], dtype=np.uint64)
+        slots = np.where(availability, np.uint64(FULL_DAY), np.uint64(0))
+        slots[unexpected] = masks
+        availability[unexpected] = masks != 0
+        bad = np.array([parsed[value] is None for value in values], dtype=bool)
+        bad_rows, bad_days = (positions[bad] for positions in np.nonzero(unexpected))
+        for idx, day_idx, value in zip(bad_rows, bad_days, values[bad]):
+            problems.append(LoadProblem(int(idx) + 2, DAYS[day_idx], value, "Unrecognized availability value; treated as unavailable."))
+        if bad.all():
+            slots = None  # Nothing but odd values; the roster has no hours after all
+
+    names = df['Name'].tolist() if 'Name' in df.columns else [None] * len(df)
+    for idx, name in enumerate(names):
+        if not isinstance(name, str):
+            problems.append(LoadProblem(idx + 2, 'Name', name, "Employee name is not a string; converted to string."))
+            name = str(name)  # Ensure name is a string
+        names[idx] = sys.intern(name)  # Rosters repeat names across sheets and days; share one copy
+
+    max_days = np.full(len(df), len(DAYS), dtype=np.int8)
+    if 'Max Days' in df.columns:
+        caps = pd.to_numeric(df['Max Days'], errors='coerce')
+        for idx in np.flatnonzero((caps.isna() & df['Max Days'].notna()).to_numpy()):
+            problems.append(LoadProblem(int(idx) + 2, 'Max Days', df['Max Days'].iat[idx], "Max days is not a number; no cap applied."))
+        given = caps.notna().to_numpy()
+        max_days[given] = caps.to_numpy()[given].clip(0, len(DAYS)).astype(np.int8)
+
+    column_order = ['Name'] + DAYS + ['Max Days']
+    problems.sort(key=lambda problem: (problem.row or 0, column_order.index(problem.column)))
+    metrics.count('rows_loaded', len(df))
+    metrics.count('load_problems', len(problems))
+    return Roster(names, availability, problems, max_days, slots)
+
+class RosterCache:
+    """Parsed rosters keyed on path + mtime + size.
+
+    Hits are served from a small in-memory LRU, then from a sidecar .npz file next to the
+    workbook (in a .roster_cache folder), so unchanged sheets skip openpyxl entirely, even
+    across restarts. Safe to use from the background loader thread.
+    """
+    VERSION = 3  # Bump when the sidecar layout changes
+
+    def __init__(self, max_entries=8, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir  # Defaults to .roster_cache beside each workbook
+        self._rosters = OrderedDict()  # (path, mtime_ns, size) -> Roster, least recently used first
+        self._lock = threading.Lock()
+
+    def load(self, file_path, progress=None):
+        """Return the roster for a workbook, parsing it only if it changed since it was cached.
+        `progress` is passed to load_roster when the workbook has to be parsed."""
+        if not os.path.exists(file_path):
+            return load_roster(file_path)
+
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            roster = self._rosters.get(key)
+            if roster is not None:
+                self._rosters.move_to_end(key)
+                metrics.count('roster_cache_lookups', result='memory')
+                return roster
+
+        sidecar = self.sidecar_path(file_path)
+        roster = self._read_sidecar(sidecar, key)
+        if roster is None:
+            metrics.count('roster_cache_lookups', result='miss')
+            roster = load_roster(file_path, progress=progress)
+            self._write_sidecar(sidecar, key, roster)
+        else:
+            metrics.count('roster_cache_lookups', result='sidecar')
+
+        with self._lock:
+            # Older versions of the same file are dead entries
+            for stale in [cached for cached in self._rosters if cached[0] == key[0]]:
+                del self._rosters[stale]
+            self._rosters[key] = roster
+            while len(self._rosters) > self.max_entries:
+                self._rosters.popitem(last=False)
+        return roster
+
+    def sidecar_path(self, file_path):
+        cache_dir = self.cache_dir or os.path.join(os.path.dirname(os.path.abspath(file_path)), ".roster_cache")
+        return os.path.join(cache_dir, os.path.basename(file_path) + ".npz")
+
+    def _read_sidecar(self, sidecar, key):
+        import zipfile  # np.load needs it anyway; not worth its import time at startup
+
+        try:
+            with np.load(sidecar, allow_pickle=False) as data:
+                if data['key'].tolist() != [self.VERSION, key[1], key[2]]:
+                    return None
+                names = [sys.intern(name) for name in data['names'].tolist()]
+                problems = [LoadProblem(*problem) for problem in json.loads(str(data['problems']))]
+                slots = data['slots'] if data['slots'].size else None
+                return Roster(names, data['availability'], problems, data['max_days'], slots)
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+            return None  # Missing, truncated, unreadable or written by another version; parse the workbook
+
+    def _write_sidecar(self, sidecar, key, roster):
+        problems = [[problem.row, problem.column, _json_value(problem.value), problem.message] for problem in roster.problems]
+        tmp_path = f"{sidecar}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+            with open(tmp_path, 'wb') as tmp:
+                np.savez(tmp,
+                         key=np.array([self.VERSION, key[1], key[2]], dtype=np.int64),
+                         names=np.array(roster.names, dtype=str),
+                         availability=roster.availability,
+                         max_days=roster.max_days,
+                         slots=roster.slots if roster.slots is not None else np.zeros(0, dtype=np.uint64),
+                         problems=np.array(json.dumps(problems)))
+            os.replace(tmp_path, sidecar)  # Readers never see a half-written sidecar
+        except OSError as error:
+            logger.warning("Could not write roster cache %s: %s", sidecar, error)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def _json_value(value):
+    """Problem values as something JSON can store (odd cell values become strings)."""
+    return value if value is None or isinstance(value, (str, bool, int, float)) else str(value)
+
+def load_employees_from_excel(file_path):
+    """Load employees from an Excel file."""
+    return load_roster_from_excel(file_path).employees
+
+# Bit for each day in an employee's availability mask
+DAY_BITS = {day: 1 << idx for idx, day in enumerate(DAYS)}
+
+def availability_mask(availability):
+    """Pack an availability dict {'Sun': True, 'Mon': False, ...} into a bitmask."""
+    mask = 0
+    for day, available in availability.items():
+        if available and day in DAY_BITS:
+            mask |= DAY_BITS[day]
+    return mask
+
+# Days are split into 30-minute slots; bit i of a slot mask is the slot starting at i * 30 minutes
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+def parse_time(text):
+    """Minutes since midnight for "14:00", "9:30" or "14"."""
+    hours, _, minutes = text.strip().partition(':')
+    minutes = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= minutes <= 24 * 60:
+        raise ValueError(f"Time out of range: {text!r}")
+    return minutes
+
+def slot_mask(start, end, inward=False):
+    """Slot mask covering start-end (minutes). Times between slot boundaries round outward,
+    so the whole interval is covered, or inward to keep only slots fully inside it."""
+    if inward:
+        first, last = -(-start // SLOT_MINUTES), end // SLOT_MINUTES
+    else:
+        first, last = start // SLOT_MINUTES, -(-end // SLOT_MINUTES)
+    return ((1 << max(last - first, 0)) - 1) << first
+
+class Shift(namedtuple('Shift', ['start', 'end'])):
+    """A stretch of a day, in minutes since midnight."""
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, text):
+        """Shift from "14:00-18:00" or a name from SHIFTS ("Open", "Mid", "Close")."""
+        if isinstance(text, Shift):
+            return text
+        named = SHIFTS.get(text.strip().capitalize())
+        if named is not None:
+            return named
+        start, sep, end = text.partition('-')
+        if not sep:
+            raise ValueError(f"Not a shift: {text!r}")
+        shift = cls(parse_time(start), parse_time(end))
+        if shift.end <= shift.start:
+            raise ValueError(f"Shift ends before it starts: {text!r}")
+        return shift
+
+    @property
+    def mask(self):
+        """Slots this shift needs covered."""
+        return slot_mask(self.start, self.end)
+
+    @property
+    def minutes(self):
+        return self.end - self.start
+
+    def __str__(self):
+        return f"{self.start // 60:02d}:{self.start % 60:02d}-{self.end // 60:02d}:{self.end % 60:02d}"
+
+# Names a roster cell or staffing need can use instead of explicit hours
+SHIFTS = {
+    'Open': Shift(6 * 60, 14 * 60),
+    'Mid': Shift(10 * 60, 18 * 60),
+    'Close': Shift(14 * 60, 22 * 60),
+}
+
+def parse_hours(value):
+    """Slot mask for an availability cell like "09:00-13:00, 17:00-21:00" or "Open, Close",
+    or None if the value isn't hours. Slots only partly inside an interval don't count."""
+    if not isinstance(value, str):
+        return None
+    mask = 0
+    try:
+        for part in value.split(','):
+            shift = Shift.parse(part)
+            mask |= slot_mask(shift.start, shift.end, inward=True)
+    except ValueError:
+        return None
+    return mask
+
+class SlotIndex:
+    """Per-slot bitsets over the roster: for each day and 30-minute slot, one bit per employee
+    who can work it.
+
+    "Who can work 14:00-18:00 on Thu" ANDs the eight slot bitsets for that stretch, touching
+    n/8 bytes per slot instead of looking at employees one by one.
+    """
+    def __init__(self, roster):
+        self.roster = roster
+        self.size = len(roster)
+        # Available days without hours mean the whole day; unavailable days mean no slots at all
+        full = np.uint64(FULL_DAY)
+        slots = roster.slots if roster.slots is not None else np.zeros(roster.availability.shape, dtype=np.uint64)
+        slots = np.where(roster.availability, np.where(slots == 0, full, slots), np.uint64(0))
+        slots[~roster.index.valid] = 0  # Same rule as AvailabilityIndex: odd names are never candidates
+        self.slots = slots
+        self.bits = [
+            [np.packbits((slots[:, day_idx] >> np.uint64(slot)) & np.uint64(1) != 0) for slot in range(SLOTS_PER_DAY)]
+            for day_idx in range(len(DAYS))
+        ]
+
+    def _words(self, day, shift):
+        day_bits = self.bits[DAYS.index(day)]
+        first, last = shift.start // SLOT_MINUTES, -(-shift.end // SLOT_MINUTES)
+        words = day_bits[first].copy()
+        for slot in range(first + 1, last):
+            words &= day_bits[slot]
+        return words
+
+    def available(self, day, shift):
+        """Rows of the employees free for all of `shift` ("14:00-18:00", "Close" or a Shift) on `day`, in roster order."""
+        shift = Shift.parse(shift)
+        return np.flatnonzero(np.unpackbits(self._words(day, shift), count=self.size))
+
+    def count(self, day, shift):
+        """How many employees are free for all of `shift` on `day`."""
+        return int(np.unpackbits(self._words(day, Shift.parse(shift)), count=self.size).sum())
+
+class Employee:
+    __slots__ = ('name', 'mask', 'slots')
+
+    def __init__(self, name, availability, slots=None):
+        self.name = sys.intern(name) if type(name) is str else name
+        # availability is a bitmask (see DAY_BITS) or a dictionary {'Sun': True, 'Mon': False, ...}
+        self.mask = availability if isinstance(availability, int) else availability_mask(availability)
+        self.slots = slots  # Slot mask per day (see SlotIndex), or None for whole days
+
+    @property
+    def availability(self):
+        """Availability as a dictionary {'Sun': True, 'Mon': False, ...}."""
+        return {day: bool(self.mask & bit) for day, bit in DAY_BITS.items()}
+
+    @availability.setter
+    def availability(self, availability):
+        self.mask = availability_mask(availability)
+
+    def is_available(self, day):
+        """Whether the employee marked `day` as available."""
+        return bool(self.mask & DAY_BITS.get(day, 0))
+
+    def is_available_between(self, day, start, end):
+        """Whether the employee can work all of `start`-`end` on `day` (times as "HH:MM")."""
+        if not self.is_available(day):
+            return False
+        if self.slots is None:
+            return True
+        want = slot_mask(parse_time(start), parse_time(end))
+        return (self.slots[DAYS.index(day)] or FULL_DAY) & want == want
+
+    def __str__(self):
+        return f"Employee(name={self.name}, availability={self.availability})"
+
+def name_sort_key(name):
+    """Sort key for names: case-insensitive, with ties broken by the exact spelling."""
+    name = str(name)
+    return (name.lower(), name)
+
+class SortedEmployees:
+    """Employees kept in name order as they are added and removed.
+
+    Membership is a set lookup; add/remove find their position with bisect instead of
+    re-sorting the whole day after every change.
+    """
+    def __init__(self, employees=(), presorted=False, keys=None):
+        items = list(dict.fromkeys(employees))  # Drop duplicates, keep order
+        if not presorted:
+            items.sort(key=lambda emp: name_sort_key(emp.name))
+        self._items = items
+        # Callers that already know the sort keys (presorted, no duplicates) can hand them over
+        self._keys = keys if keys is not None else [name_sort_key(emp.name) for emp in items]
+        self._members = set(items)
+
+    def add(self, employee):
+        """Insert an employee in name order; returns False if they were already present."""
+        if employee in self._members:
+            return False
+        key = name_sort_key(employee.name)
+        pos = bisect.bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._items.insert(pos, employee)
+        self._members.add(employee)
+        return True
+
+    def discard(self, employee):
+        """Remove an employee if present; returns False if they weren't."""
+        if employee not in self._members:
+            return False
+        # Several employees can share a name, so look for this exact one among the equal keys
+        pos = bisect.bisect_left(self._keys, name_sort_key(employee.name))
+        while self._items[pos] is not employee:
+            pos += 1
+        del self._keys[pos]
+        del self._items[pos]
+        self._members.discard(employee)
+        return True
+
+    def without(self, employees):
+        """A new container with everyone here except `employees` (one linear pass, no re-sort)."""
+        clone = SortedEmployees.__new__(SortedEmployees)
+        kept = [idx for idx, employee in enumerate(self._items) if employee not in employees]
+        clone._items = [self._items[idx] for idx in kept]
+        clone._keys = [self._keys[idx] for idx in kept]
+        clone._members = self._members.difference(employees)
+        return clone
+
+    def copy(self):
+        clone = SortedEmployees.__new__(SortedEmployees)
+        clone._items = self._items.copy()
+        clone._keys = self._keys.copy()
+        clone._members = self._members.copy()
+        return clone
+
+    def __contains__(self, employee):
+        return employee in self._members
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, idx):
+        return self._items[idx]
+
+    def __repr__(self):
+        return f"SortedEmployees({[emp.name for emp in self._items]})"
+
+class ScheduleValidator:
+    """Running conflict counts for a schedule, kept by Schedule._assign/_unassign.
+
+    Holds days worked per roster row, the rows forced onto days they aren't available and how
+    many rows are past their cap, so each assignment updates them in O(1) and reading them
+    never walks the schedule. Headcounts are the day lists' lengths, compared with
+    employees_needed when read. Built for one roster, one set of day lists and one
+    max_days_per_week; Schedule.validation makes a new one when any of them changes.
+    """
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.roster = schedule.roster
+        self.lists = dict(schedule.schedule)  # The day lists these counts describe
+        self.columns = {day: DAYS.index(day) for day in schedule.days}
+        self.worked = np.zeros(len(self.roster), dtype=np.int16)
+        self.forced = {}  # {day: set of rows assigned while unavailable}
+        for day in schedule.days:
+            rows = self.roster.rows_of(schedule.schedule[day])
+            self.worked += np.bincount(rows, minlength=len(self.roster)).astype(np.int16)
+            self.forced[day] = set(rows[~self.roster.availability[rows, self.columns[day]]].tolist())
+        self.max_days_per_week = schedule.max_days_per_week
+        self.caps = self.roster.max_days
+        if self.max_days_per_week is not None:
+            self.caps = np.minimum(self.caps, self.max_days_per_week)
+        self.over_cap = int(np.count_nonzero(self.worked > self.caps))  # Rows past their cap
+
+    def current(self):
+        """Whether the counts still describe the schedule's roster, day lists and cap."""
+        schedule = self.schedule
+        if schedule.roster is not self.roster or schedule.max_days_per_week != self.max_days_per_week:
+            return False
+        return all(schedule.schedule.get(day) is employees for day, employees in self.lists.items())
+
+    def added(self, day, employee):
+        row = self.roster._rows.get(id(employee))
+        if row is None:
+            return
+        self.worked[row] += 1
+        if self.worked[row] == self.caps[row] + 1:
+            self.over_cap += 1
+        if not self.roster.availability[row, self.columns[day]]:
+            self.forced[day].add(row)
+
+    def removed(self, day, employee):
+        row = self.roster._rows.get(id(employee))
+        if row is None:
+            return
+        if self.worked[row] == self.caps[row] + 1:
+            self.over_cap -= 1
+        self.worked[row] -= 1
+        self.forced[day].discard(row)
+
+    def day_conflicts(self, day):
+        """(headcount - employees_needed, employees forced onto the day) for one day."""
+        return (len(self.schedule.schedule[day]) - self.schedule.get_max_employees_for_day(day),
+                len(self.forced[day]))
+
+    def counts(self):
+        """Conflict totals: days over and under employees_needed, forced assignments and
+        employees past their cap."""
+        staffing = [self.day_conflicts(day)[0] for day in self.schedule.days]
+        return {
+            'overstaffed': sum(extra > 0 for extra in staffing),
+            'understaffed': sum(extra < 0 for extra in staffing),
+            'forced': sum(len(rows) for rows in self.forced.values()),
+            'over_cap': self.over_cap,
+        }
+
+    @metrics.timed('validation_report_seconds')
+    def report(self):
+        """A ValidationReport of every conflict, read off the counts."""
+        staffing = {day: self.day_conflicts(day)[0] for day in self.schedule.days}
+        employee = self.roster.employee
+        over = np.flatnonzero(self.worked > self.caps)
+        return ValidationReport(
+            {day: extra for day, extra in staffing.items() if extra > 0},
+            {day: -extra for day, extra in staffing.items() if extra < 0},
+            [(day, employee(row)) for day in self.schedule.days for row in sorted(self.forced[day])],
+            [(employee(row), int(worked), int(cap))
+             for row, worked, cap in zip(over.tolist(), self.worked[over], self.caps[over])],
+        )
+
+class Schedule:
+    def __init__(self, days, employees):
+        self.days = days
+        self.employees = employees  # Store employees in the class
+        self.employees_needed = {day: 0 for day in days}  # Initialize employees_needed
+        self.max_days_per_week = None  # Cap for everyone on top of the roster's per-employee "Max Days"
+        self.solver = GreedySolver()  # Strategy used by generate_schedule, see SOLVERS
+        self.schedule = {day: SortedEmployees() for day in days}
+        self.shift_needed = {day: {} for day in days}  # Staffing by time of day: {day: {Shift: count}}
+        self.shifts = {day: {} for day in days}  # Who works each shift: {day: {Shift: SortedEmployees}}
+        self.history = None  # schedule_history.HistoryStore to rank candidates by; None keeps roster order
+        self.week = None  # Sunday (a date) of the week this schedule is for, to look up the history
+        self._ranking = None  # (key, FairnessRanking) cached from the history
+
+    @property
+    def employees(self):
+        return self.roster.employees
+
+    @employees.setter
+    def employees(self, employees):
+        """Accept a Roster or a list of Employees and rebuild the availability index."""
+        self.roster = employees if isinstance(employees, Roster) else Roster.from_employees(employees)
+        self.index = self.roster.index
+        self._everyone = None  # Whole roster in name order, built on first use
+        self._unassigned = None  # New roster, so the unassigned lists need a full rebuild
+        self._validation = None  # ScheduleValidator, built on first use
+
+    @property
+    def validation(self):
+        """ScheduleValidator with the current conflict counts.
+
+        Kept up to date by delta as assignments change; rebuilt (vectorized, in milliseconds)
+        the first time it is read after the roster, a day's list or max_days_per_week was replaced.
+        """
+        if self._validation is None or not self._validation.current():
+            with metrics.timer('validation_rebuild_seconds'):
+                self._validation = ScheduleValidator(self)
+        return self._validation
+
+    def validate(self):
+        """A ValidationReport of everything wrong with the schedule now."""
+        return self.validation.report()
+
+    @property
+    def unassigned_employees(self):
+        """Employees not assigned on each day, in name order.
+
+        Kept up to date by delta as assignments change; only rebuilt from scratch when the
+        roster (or the whole schedule) is replaced.
+        """
+        if self._unassigned is None:
+            self.rebuild_unassigned_employees()
+        return self._unassigned
+
+    def _assign(self, day, employee):
+        """Put an employee on a day and take them off that day's unassigned list."""
+        if not self.schedule[day].add(employee):
+            return False
+        self.unassigned_employees[day].discard(employee)
+        if self._validation is not None:
+            self._validation.added(day, employee)
+        return True
+
+    def _unassign(self, day, employee):
+        """Take an employee off a day and put them back on that day's unassigned list."""
+        if not self.schedule[day].discard(employee):
+            return False
+        self.unassigned_employees[day].add(employee)
+        if self._validation is not None:
+            self._validation.removed(day, employee)
+        return True
+
+    def set_employees_needed(self, employees_needed):
+        """Set the number of employees needed for each day."""
+        self.employees_needed = employees_needed  # Update the employees_needed attribute
+
+    def set_shift_needed(self, day, shifts):
+        """Set staffing for parts of a day: {"06:00-14:00": 3, "Close": 4, ...} (keys as Shift.parse takes)."""
+        self.shift_needed[day] = {Shift.parse(shift): count for shift, count in shifts.items()}
+
+    def free_employees(self, day, shift):
+        """Employees who can work all of `shift` on `day` and aren't on an overlapping shift, in name order."""
+        shift = Shift.parse(shift)
+        rows = self.roster.slot_index.available(day, shift)
+        busy = {emp for other, employees in self.shifts.get(day, {}).items()
+                if other.start < shift.end and shift.start < other.end for emp in employees}
+        free = self.employees_for_rows(rows)
+        return free.without(busy) if busy else free
+
+    def get_max_employees_for_day(self, day):
+        """Get the maximum number of employees needed for a specific day."""
+        return self.employees_needed.get(day, 0)
+
+    def day_caps(self, days=None):
+        """Most days each roster row may be scheduled, or None when nobody is capped.
+
+        With `days` (a subset being replanned), days already assigned on the other days of
+        the schedule count against each cap.
+        """
+        caps = self.roster.max_days
+        if self.max_days_per_week is not None:
+            caps = np.minimum(caps, self.max_days_per_week)
+        if not len(caps) or caps.min() >= len(self.days):
+            return None
+        others = [day for day in self.days if days is not None and day not in days]
+        if others:
+            rows = self.roster.rows_of([emp for day in others for emp in self.schedule[day]])
+            worked = np.bincount(rows, minlength=len(caps))
+            caps = np.maximum(caps - worked, 0).astype(np.int8)
+        return caps
+
+    @property
+    def ranking(self):
+        """FairnessRanking of the roster for `week` from `history`, or None without both.
+
+        Read from the history once and kept until the roster, week or history changes.
+        """
+        if self.history is None or self.week is None:
+            return None
+        key = (self.roster, self.week, self.history, self.history.version)
+        if self._ranking is None or self._ranking[0] != key:
+            self._ranking = (key, self.history.ranking(self.roster, self.week))
+        return self._ranking[1]
+
+    def candidates(self, day):
+        """Rows available on `day` in the order solvers should take them: by the history's
+        fairness ranking when there is one, otherwise roster order (reversed on Sat/Sun)."""
+        rows = self.index.candidates(day)
+        ranking = self.ranking
+        if ranking is None:
+            return rows[::-1] if day in ['Sun', 'Sat'] else rows
+        rank = ranking.weekend if is_weekend(day) else ranking.weekday
+        return rows[np.argsort(rank[rows], kind='stable')]
+
+    def add_employee_to_day(self, day, employee, force=False):
+        """Assign an employee to a day, considering availability and employee limits."""
+        if day not in self.schedule:
+            logger.warning("Invalid day: %s", day)
+            return
+
+        # Check availability unless force is True
+        if not employee.is_available(day) and not force:
+            logger.debug("%s is not available on %s.", employee.name, day)
+            return
+
+        # Only check the max employee limit if not forcing a manual assignment
+        if len(self.schedule[day]) < self.get_max_employees_for_day(day) or force:
+            # Also removes the employee from the unassigned list
+            if self._assign(day, employee):
+                logger.debug("Assigned %s to %s.", employee.name, day)
+        else:
+            # The employee stays on the unassigned list
+            logger.debug("Could not assign %s to %s, max employees reached.", employee.name, day)
+
+    def remove_employee_from_day(self, day, employee):
+        """Take an employee off a day; they go back on that day's unassigned list."""
+        if day not in self.schedule:
+            logger.warning("Invalid day: %s", day)
+            return False
+        return self._unassign(day, employee)
+
+    @metrics.timed('generate_seconds')
+    def generate_schedule(self):
+        """Plan and apply every day. The unassigned lists are derived on first use of
+        unassigned_employees, not here, so generating stays cheap for callers that don't show them."""
+        self.apply_plan(self.plan_schedule())
+
+    def plan_schedule(self, progress=None, days=None):
+        """Work out who to assign each day without touching the schedule.
+
+        Returns {day: [roster rows]} from the schedule's solver. Only reads the roster, its
+        index and the staffing settings, so it can run off the UI thread; `progress(fraction)`
+        is called as the solver goes. With `days`, only those days are planned around the
+        current assignments on the rest.
+        """
+        with metrics.timer('plan_seconds', solver=type(self.solver).__name__):
+            return self.solver.plan(self, progress, days)
+
+    def apply_plan(self, plan):
+        """Replace the schedule with the assignments from plan_schedule()."""
+        self.schedule = {day: self.employees_for_rows(plan.get(day, [])) for day in self.days}
+        self._unassigned = None  # Every day changed, so derive them all again on next use
+
+    def plan_shifts(self, progress=None):
+        """Work out who works each shift in shift_needed, without touching the schedule.
+
+        Returns {day: {Shift: [roster rows]}}; like plan_schedule it can run off the UI thread.
+        """
+        with metrics.timer('plan_seconds', solver=ShiftSolver.__name__):
+            return ShiftSolver().plan(self, progress)
+
+    def apply_shift_plan(self, plan):
+        """Replace the shifts with a plan_shifts() result; each day's schedule becomes everyone
+        working any shift that day."""
+        self.shifts = {
+            day: {shift: self.employees_for_rows(rows) for shift, rows in plan.get(day, {}).items()} for day in self.days
+        }
+        self.schedule = {
+            day: self.employees_for_rows(sorted({row for rows in plan.get(day, {}).values() for row in rows}))
+            for day in self.days
+        }
+        self._unassigned = None
+
+    def generate_shift_schedule(self):
+        """Fill shift_needed for every day; like generate_schedule, the unassigned lists wait until asked for."""
+        self.apply_shift_plan(self.plan_shifts())
+
+    def replan_days(self, days):
+        """Plan and apply just `days`, keeping the other days' assignments as they are."""
+        plan = self.plan_schedule(days=days)
+        for day in days:
+            self.schedule[day] = self.employees_for_rows(plan.get(day, []))
+            if self._unassigned is not None:
+                self._unassigned[day] = self._everyone.without(self.schedule[day])
+
+    def update_roster(self, roster):
+        """Switch to `roster`, a reload of the same sheet, keeping the assignments that still hold.
+
+        Assignments move over by name. Only those the reload invalidates are dropped: the
+        employee left the roster, or was available on the day before and isn't now (someone
+        forced onto a day they never marked stays). Shifts are kept the same way, checked
+        against the hours. Returns the dropped (day, employee) pairs, with the Employee objects
+        of the previous roster.
+        """
+        previous = self.roster
+        if roster.names == previous.names:
+            # Same people in the same order: rows carry over and the index can reuse the name order
+            if roster._index is None:
+                roster._index = AvailabilityIndex(roster, base=previous.index)
+            if not roster._rows:  # No Employees handed out yet, so it can take over the unchanged ones
+                return self._patch_roster(roster)
+            new_row = None
+        else:
+            new_row = np.array([roster.rows_by_name.get(name, -1) for name in previous.names], dtype=np.intp)
+
+        dropped = []
+
+        def carry_over(day, employees, still_fits):
+            old_rows = previous.rows_of(employees)
+            rows = old_rows if new_row is None else new_row[old_rows]
+            kept = []
+            for old_row, row in zip(old_rows.tolist(), rows.tolist()):
+                was_available = previous.availability[old_row, DAYS.index(day)]
+                if row >= 0 and (still_fits(roster.employee(row)) or not was_available):
+                    kept.append(row)
+                else:
+                    dropped.append((day, previous.employee(old_row)))
+            return kept
+
+        kept = {day: carry_over(day, self.schedule[day], lambda emp, day=day: emp.is_available(day)) for day in self.days}
+        kept_shifts = {
+            day: {shift: carry_over(day, employees,
+                                    lambda emp, day=day, shift=shift: emp.is_available_between(day, *str(shift).split('-')))
+                  for shift, employees in shifts.items()}
+            for day, shifts in self.shifts.items()
+        }
+        self.employees = roster  # The unassigned lists are derived again on next use
+        self.schedule = {day: self.employees_for_rows(rows) for day, rows in kept.items()}
+        self.shifts = {day: {shift: self.employees_for_rows(rows) for shift, rows in shifts.items()}
+                       for day, shifts in kept_shifts.items()}
+        dropped = list(dict.fromkeys(dropped))  # Someone dropped from a shift and its day is listed once
+        logger.info("Roster updated; %d assignments no longer hold.", len(dropped))
+        return dropped
+
+    def _patch_roster(self, roster):
+        """update_roster for a roster of the same names whose Employees haven't been handed out.
+
+        Everyone whose days and hours are unchanged keeps their Employee object (as in
+        Roster.with_availability), so only the changed employees are swapped in the day lists,
+        shifts and unassigned lists instead of rebuilding them all.
+        """
+        previous = self.roster
+        changed = previous.changed_rows(roster).tolist()
+        changed_set = set(changed)
+        roster._employees = [None if row in changed_set else emp for row, emp in enumerate(previous._employees)]
+        roster._rows = {key: row for key, row in previous._rows.items() if row not in changed_set}
+        self.roster = roster
+        self.index = roster.index
+
+        dropped = []
+        if self._everyone is not None and changed:
+            self._everyone = self._everyone.copy()  # Copies of the schedule share the old one
+        for row in changed:
+            old = previous._employees[row]
+            if old is None:
+                continue  # Never handed out, so not on any list
+            new = roster.employee(row)
+            for day in self.days:
+                was_available = previous.availability[row, DAYS.index(day)]
+                if self.schedule[day].discard(old):
+                    if new.is_available(day) or not was_available:
+                        self.schedule[day].add(new)
+                    else:
+                        dropped.append((day, old))
+                for shift, employees in self.shifts.get(day, {}).items():
+                    if employees.discard(old):
+                        if new.is_available_between(day, *str(shift).split('-')) or not was_available:
+                            employees.add(new)
+                        else:
+                            dropped.append((day, old))
+                if self._unassigned is not None:
+                    self._unassigned[day].discard(old)
+                    if new not in self.schedule[day]:
+                        self._unassigned[day].add(new)
+            if self._everyone is not None:
+                self._everyone.discard(old)
+                self._everyone.add(new)
+        dropped = list(dict.fromkeys(dropped))
+        logger.info("Roster updated; %d employees changed, %d assignments no longer hold.", len(changed), len(dropped))
+        return dropped
+
+    def fill_days(self, days):
+        """Top `days` up to employees_needed from available, unassigned employees, keeping everyone
+        already on them. Picks in the solvers' candidate order and respects the day caps; returns the
+        (day, employee) pairs added."""
+        caps = self.day_caps([])  # Every current assignment counts against the caps
+        added = []
+        for day in days:
+            if day not in self.schedule:
+                continue
+            missing = self.get_max_employees_for_day(day) - len(self.schedule[day])
+            if missing <= 0:
+                continue
+            candidates = self.candidates(day)
+            candidates = candidates[~np.isin(candidates, self.roster.rows_of(self.schedule[day]))]
+            if caps is not None:
+                candidates = candidates[caps[candidates] > 0]
+            chosen = candidates[:missing]
+            if caps is not None:
+                caps[chosen] -= 1
+            for row in chosen.tolist():
+                employee = self.roster.employee(row)
+                self._assign(day, employee)
+                added.append((day, employee))
+        return added
+
+    def employees_for_rows(self, rows):
+        """SortedEmployees for roster rows, put in name order through the index instead of by comparing names."""
+        rows = np.asarray(rows, dtype=np.intp)
+        rows = rows[np.argsort(self.index.name_rank[rows], kind='stable')].tolist()
+        keys = self.index.sort_keys
+        return SortedEmployees([self.roster.employee(row) for row in rows], presorted=True,
+                               keys=[keys[row] for row in rows])
+
+    def print_schedule(self):
+        lines = ["Final Schedule:"]
+        for day, employees in self.schedule.items():
+            employee_names = sorted([emp.name for emp in employees])
+            lines.append(f"{day}: {', '.join(employee_names) if employee_names else 'No employees assigned'}")
+
+        # Add unassigned employees
+        lines += ["", "Unassigned Employees:"]
+        for day, unassigned in self.unassigned_employees.items():
+            # Extract names of unassigned employees and sort alphabetically
+            unassigned_names = sorted([emp.name for emp in unassigned])
+            lines.append(f"{day}: {', '.join(unassigned_names) if unassigned_names else 'All employees assigned'}")
+
+        return "\n".join(lines) + "\n"  # One join instead of re-copying the text for every line
+
+    def copy(self):
+        """An independent copy of the assignments and staffing settings sharing this roster,
+        e.g. to finalize or export while editing carries on."""
+        clone = Schedule(list(self.days), self.roster)
+        clone.employees_needed = dict(self.employees_needed)
+        clone.max_days_per_week = self.max_days_per_week
+        clone.solver = self.solver
+        clone.history, clone.week = self.history, self.week
+        clone.schedule = {day: employees.copy() for day, employees in self.schedule.items()}
+        clone.shift_needed = {day: dict(shifts) for day, shifts in self.shift_needed.items()}
+        clone.shifts = {day: {shift: employees.copy() for shift, employees in shifts.items()}
+                        for day, shifts in self.shifts.items()}
+        if self._unassigned is not None:
+            clone._everyone = self._everyone
+            clone._unassigned = {day: employees.copy() for day, employees in self._unassigned.items()}
+        return clone
+
+    def manually_add_employee(self, day, employee, force=True):
+        """Manually add an employee to a day, considering availability."""
+        if day not in self.schedule:
+            return
+        if not employee.is_available(day) and not force:
+            return
+        self.add_employee_to_day(day, employee, force)
+
+    def check_assignments(self, assignments, overridden=None):
+        """Validate (employee, day, force) tuples as one batch, without changing anything.
+
+        Returns (pairs, problems): the (day, employee) pairs that would be added, in order, and an
+        AssignmentProblem for every rule each tuple that can't be added breaks. Days filling up
+        and employees reaching their days-per-week cap count the earlier tuples of the batch.
+        Employees already on a day (or listed twice) are neither added nor a problem. Given a
+        list as `overridden`, the rules broken by forced tuples are appended to it.
+        """
+        caps = self.roster.max_days
+        if self.max_days_per_week is not None:
+            caps = np.minimum(caps, self.max_days_per_week)
+        added = {day: len(employees) for day, employees in self.schedule.items()}
+        worked = {}
+        pairs, problems, seen = [], [], set()
+        for employee, day, force in assignments:
+            if day not in self.schedule:
+                problems.append(AssignmentProblem(employee, day, 'day'))
+                continue
+            if employee in self.schedule[day] or (day, employee) in seen:
+                continue
+            if employee not in worked:
+                row = self.roster._rows.get(id(employee))
+                worked[employee] = 0 if row is None else int(self.validation.worked[row])
+            reasons = []
+            if not employee.is_available(day):
+                reasons.append('unavailable')
+            if added[day] >= self.get_max_employees_for_day(day):
+                reasons.append('full')
+            rows = self.roster.rows_of([employee])
+            if len(rows) and worked[employee] >= caps[rows[0]]:
+                reasons.append('max days')
+            broken = [AssignmentProblem(employee, day, reason) for reason in reasons]
+            if broken and not force:
+                problems.extend(broken)
+                continue
+            if overridden is not None:
+                overridden.extend(broken)
+            seen.add((day, employee))
+            pairs.append((day, employee))
+            added[day] += 1
+            worked[employee] += 1
+        return pairs, problems
+
+    def assign_batch(self, assignments):
+        """Apply many (employee, day, force) tuples at once, all or nothing.
+
+        Everything is checked first (see check_assignments); if any tuple has a problem nothing is
+        assigned. Returns (pairs, problems) with the (day, employee) pairs actually added.
+        """
+        pairs, problems = self.check_assignments(assignments)
+        if problems:
+            return [], problems
+        for day, employee in pairs:
+            self._assign(day, employee)
+        metrics.count('batch_assignments', len(pairs))
+        logger.debug("Assigned a batch of %d.", len(pairs))
+        return pairs, problems
+
+    def refresh_unassigned_employees(self):
+        """Make sure the unassigned lists are current.
+
+        Assignments keep them up to date as they happen, so this only rebuilds after the
+        roster has been replaced.
+        """
+        metrics.count('unassigned_refreshes')
+        if self._unassigned is None:
+            self.rebuild_unassigned_employees()
+
+    @metrics.timed('unassigned_rebuild_seconds')
+    def rebuild_unassigned_employees(self):
+        """Derive every day's unassigned list from scratch (whole roster minus that day's assignments)."""
+        if self._everyone is None:
+            self._everyone = self.employees_for_rows(self.index.name_order)
+        unassigned_employees = {}
+        for day in self.days:
+            unassigned_employees[day] = self._everyone.without(self.schedule[day])
+        self._unassigned = unassigned_employees
+        logger.debug("Unassigned employees rebuilt for %d days.", len(self.days))
+
+class GreedySolver:
+    """The original strategy: each day takes the first `needed` available employees in
+    Schedule.candidates order (roster order reversed on Sat/Sun unless the schedule has a
+    fairness history), skipping anyone who has reached their day cap."""
+    name = "Greedy"
+    incremental = True  # Each day only depends on the days before it
+
+    def plan(self, schedule, progress=None, days=None):
+        days = list(schedule.days if days is None else days)
+        caps = schedule.day_caps(days)
+        worked = np.zeros(len(schedule.roster), dtype=np.int8) if caps is not None else None
+
+        plan = {}
+        for done, day in enumerate(days, start=1):
+            needed = schedule.get_max_employees_for_day(day)  # Get the number of needed employees for the day
+
+            # Rows of the employees available today, from the index: in fairness order when the
+            # schedule has a history, else roster order (reversed for Saturday and Sunday)
+            candidates = schedule.candidates(day)
+
+            metrics.count('candidates_scanned', len(candidates), day=day)
+            if caps is not None:
+                candidates = candidates[worked[candidates] < caps[candidates]]
+            chosen = candidates[:max(needed, 0)]
+            if worked is not None:
+                worked[chosen] += 1
+            plan[day] = chosen.tolist()
+
+            logger.info("%s: assigned %d of %d needed (%d available).", day, len(plan[day]), needed, len(candidates))
+            if progress:
+                progress(done / len(days))
+        return plan
+
+class FlowSolver:
+    """Min-cost max-flow assignment across the whole week.
+
+    Fills as much of employees_needed as availability and day caps allow (unlike the greedy
+    pass, one day's picks can't starve a later day), then among those schedules prefers the
+    one that spreads days, and weekend days in particular, evenly across employees.
+
+    Employees with the same availability and cap are interchangeable, so the flow runs over
+    those groups (at most a few hundred nodes whatever the roster size) and the group totals
+    are then dealt out to individual employees round-robin, in the schedule's fairness order
+    when it has a history.
+    """
+    name = "Balanced (flow)"
+    LOAD_COST = 1  # Per extra day on an employee who already works more days
+    WEEKEND_COST = 10  # For giving one employee a second weekend day
+    incremental = False  # Balances the whole week, so any change means replanning all of it
+
+    def plan(self, schedule, progress=None, days=None):
+        days = list(schedule.days if days is None else days)
+        index = schedule.index
+        day_bits = [DAY_BITS.get(day, 0) for day in days]
+        caps = schedule.day_caps(days)
+        if caps is None:
+            caps = np.full(len(schedule.roster), len(days), dtype=np.int8)
+
+        # Group rows by (availability mask, cap); rows stay in roster order within a group
+        masks = np.where(index.valid, index.masks, 0).astype(np.int64)
+        metrics.count('candidates_scanned', len(masks), day='all')
+        keys = masks * (len(days) + 1) + np.minimum(caps, len(days))
+        order = np.argsort(keys, kind='stable')
+        group_keys, starts = np.unique(keys[order], return_index=True)
+        groups = np.split(order, starts[1:]) if len(order) else []
+
+        # Nodes: source, sink, one per day, then a node and a weekend node per group
+        source, sink = 0, 1
+        day_node = {day: 2 + idx for idx, day in enumerate(days)}
+        flow = _MinCostFlow(2 + len(days) + 2 * len(groups))
+        for day in days:
+            flow.add_edge(day_node[day], sink, max(schedule.get_max_employees_for_day(day), 0), 0)
+
+        day_edges = []  # (group, day, edge) for reading the result back
+        for g, (key, rows) in enumerate(zip(group_keys.tolist(), groups)):
+            mask, cap = divmod(key, len(days) + 1)
+            size = len(rows)
+            group_node = 2 + len(days) + 2 * g
+            weekend_node = group_node + 1
+            available = [day for day, bit in zip(days, day_bits) if mask & bit]
+            if not available or not cap:
+                continue
+
+            # The t-th day worked by each member costs t, so load spreads across employees
+            for tier in range(cap):
+                flow.add_edge(source, group_node, size, tier * self.LOAD_COST)
+            if any(is_weekend(day) for day in available):
+                flow.add_edge(group_node, weekend_node, size, 0)
+                flow.add_edge(group_node, weekend_node, size, self.WEEKEND_COST)
+            for day in available:
+                from_node = weekend_node if is_weekend(day) else group_node
+                day_edges.append((g, day, flow.add_edge(from_node, day_node[day], size, 0)))
+
+        flow.run(source, sink)
+        if progress:
+            progress(0.5)
+
+        # Deal each group's per-day totals out to its members round-robin, weekend days first,
+        # so nobody in a group works more than their share (or a second weekend day needlessly)
+        totals = {}
+        for g, day, edge in day_edges:
+            if flow.flow_on(edge):
+                totals.setdefault(g, []).append((day, flow.flow_on(edge)))
+        plan = {day: [] for day in days}
+        ranking = schedule.ranking
+        for g, day_totals in totals.items():
+            members = groups[g]
+            if ranking is not None:  # Weekend days are dealt first, so they go by the weekend ranking
+                members = members[np.argsort(ranking.weekend[members], kind='stable')]
+            members = members.tolist()
+            day_totals.sort(key=lambda item: not is_weekend(item[0]))
+            start = 0
+            for day, count in day_totals:
+                plan[day].extend(members[(start + i) % len(members)] for i in range(count))
+                start = (start + count) % len(members)
+
+        for day in days:
+            logger.info("%s: assigned %d of %d needed (%d available).", day, len(plan[day]),
+                        schedule.get_max_employees_for_day(day), index.count(day))
+        if progress:
+            progress(1.0)
+        return plan
+
+class ShiftSolver:
+    """Fills shift-level demand (Schedule.shift_needed) from the roster's SlotIndex.
+
+    Within a day the scarcest shifts (fewest free employees per person needed) go first.
+    Each shift takes the employees with the fewest minutes so far this week among those free
+    for all of it, not already on an overlapping shift and, when starting a new day for them,
+    under their day cap. Employees may work several non-overlapping shifts in a day.
+    """
+    name = "Shifts"
+
+    def plan(self, schedule, progress=None):
+        slot_index = schedule.roster.slot_index
+        caps = schedule.day_caps()
+        size = len(schedule.roster)
+        worked = np.zeros(size, dtype=np.int8)  # Days worked so far
+        minutes = np.zeros(size, dtype=np.int32)  # Minutes worked so far
+
+        plan = {}
+        for done, day in enumerate(schedule.days, start=1):
+            busy = np.zeros(size, dtype=np.uint64)  # Slots each employee is already working today
+            demands = [(shift, count) for shift, count in schedule.shift_needed.get(day, {}).items() if count > 0]
+            demands.sort(key=lambda item: slot_index.count(day, item[0]) / item[1])
+
+            plan[day] = {}
+            for shift, count in demands:
+                mask = np.uint64(shift.mask)
+                candidates = slot_index.available(day, shift)
+                metrics.count('candidates_scanned', len(candidates), day=day)
+                candidates = candidates[busy[candidates] & mask == 0]
+                if caps is not None:
+                    candidates = candidates[(busy[candidates] != 0) | (worked[candidates] < caps[candidates])]
+                chosen = candidates[np.argsort(minutes[candidates], kind='stable')[:count]]
+                busy[chosen] |= mask
+                minutes[chosen] += shift.minutes
+                plan[day][shift] = chosen.tolist()
+                logger.debug("%s %s: assigned %d of %d needed (%d free).", day, shift, len(chosen), count, len(candidates))
+
+            worked += busy != 0
+            logger.info("%s: filled %d of %d shift places.", day,
+                        sum(len(rows) for rows in plan[day].values()), sum(count for _, count in demands))
+            if progress:
+                progress(done / len(schedule.days))
+        return plan
+
+# Solvers selectable by name (the UI and the batch CLI use these keys)
+SOLVERS = {'greedy': GreedySolver, 'flow': FlowSolver}
+
+def is_weekend(day):
+    return day in ('Sat', 'Sun')
+
+class _MinCostFlow:
+    """Successive-shortest-path min-cost max-flow (SPFA), for the small graphs FlowSolver builds."""
+    def __init__(self, node_count):
+        self.graph = [[] for _ in range(node_count)]  # Per node: [to, residual capacity, cost, reverse edge index]
+
+    def add_edge(self, u, v, capacity, cost):
+        """Add an edge and return a handle for flow_on()."""
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return (u, len(self.graph[u]) - 1)
+
+    def flow_on(self, handle):
+        u, idx = handle
+        v, _, _, rev = self.graph[u][idx]
+        return self.graph[v][rev][1]  # Flow pushed = capacity of the reverse edge
+
+    def run(self, source, sink):
+        graph = self.graph
+        total_flow = total_cost = 0
+        while True:
+            dist = [None] * len(graph)
+            previous = [None] * len(graph)
+            in_queue = [False] * len(graph)
+            dist[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                in_queue[u] = False
+                for idx, (v, capacity, cost, _) in enumerate(graph[u]):
+                    if capacity and (dist[v] is None or dist[u] + cost < dist[v]):
+                        dist[v] = dist[u] + cost
+                        previous[v] = (u, idx)
+                        if not in_queue[v]:
+                            in_queue[v] = True
+                            queue.append(v)
+            if dist[sink] is None:
+                return total_flow, total_cost
+
+            push = None
+            v = sink
+            while v != source:
+                u, idx = previous[v]
+                push = graph[u][idx][1] if push is None else min(push, graph[u][idx][1])
+                v = u
+            v = sink
+            while v != source:
+                u, idx = previous[v]
+                edge = graph[u][idx]
+                edge[1] -= push
+                graph[v][edge[3]][1] += push
+                v = u
+            total_flow += push
+            total_cost += push * dist[sink]
+
+def day_name(date):
+    """Name of a date's weekday as used in DAYS ('Sun', 'Mon', ...)."""
+    return DAYS[(date.weekday() + 1) % 7]
+
+def week_start(date):
+    """The Sunday on or before `date`; weeks run Sun-Sat like DAYS."""
+    return date - datetime.timedelta(days=(date.weekday() + 1) % 7)
+
+class DateRangeSchedule:
+    """Schedule for every date from `start` to `end` (inclusive).
+
+    Each calendar week of the range is its own Schedule over that week's days, so the
+    roster's "Max Days" and max_days_per_week cap the days worked per week. Staffing needs
+    are set per date and availability can be changed for single dates.
+
+    Changes only mark dates dirty. generate_schedule() then replans just what they can
+    affect: the dirty days themselves when nobody is capped, the rest of that week from the
+    first dirty day when caps link the days (the whole week for solvers that balance across
+    it). Weeks without changes keep their assignments.
+    """
+    def __init__(self, roster, start, end):
+        if end < start:
+            raise ValueError(f"End date {end} is before start date {start}.")
+        self.roster = roster
+        self.dates = [start + datetime.timedelta(days=offset) for offset in range((end - start).days + 1)]
+        self.max_days_per_week = None
+        self.solver = GreedySolver()
+
+        week_days = {}
+        for date in self.dates:
+            week_days.setdefault(week_start(date), []).append(day_name(date))
+        self.weeks = {week: Schedule(days, roster) for week, days in week_days.items()}  # Sunday -> Schedule
+        self.overrides = {}  # Sunday -> {(row, day): availability differing from the roster that day}
+        self._dirty = {week: set(schedule.days) for week, schedule in self.weeks.items()}
+        self._stale_rosters = set()  # Weeks whose overrides changed since their roster was built
+        self._settings = None  # (solver, max_days_per_week) used by the last generate
+
+    def _locate(self, date):
+        week = week_start(date)
+        if week not in self.weeks or day_name(date) not in self.weeks[week].days:
+            logger.warning("Date outside the schedule: %s", date)
+            return None, None
+        return week, day_name(date)
+
+    def schedule_for(self, date):
+        """The week Schedule holding `date` (None outside the range)."""
+        week, _ = self._locate(date)
+        return None if week is None else self.weeks[week]
+
+    def assigned(self, date):
+        """Employees assigned on `date`, in name order (empty outside the range)."""
+        week, day = self._locate(date)
+        if week is None:
+            return []
+        return self.weeks[week].schedule[day]
+
+    def unassigned(self, date):
+        """Employees not assigned on `date`, in name order (empty outside the range)."""
+        week, day = self._locate(date)
+        if week is None:
+            return []
+        return self.weeks[week].unassigned_employees[day]
+
+    def set_needed(self, date, count):
+        """Set how many employees `date` needs."""
+        week, day = self._locate(date)
+        if week is None:
+            return False
+        needed = self.weeks[week].employees_needed
+        if needed.get(day) != count:
+            needed[day] = count
+            self._dirty.setdefault(week, set()).add(day)
+        return True
+
+    def set_weekly_needed(self, employees_needed):
+        """Apply one week's needs ({'Sun': 2, 'Mon': 3, ...}) to every date in the range."""
+        for date in self.dates:
+            self.set_needed(date, employees_needed.get(day_name(date), 0))
+
+    def set_availability(self, name, date, available):
+        """Change whether employee `name` can work on one date, leaving their other dates alone."""
+        week, day = self._locate(date)
+        row = self.roster.rows_by_name.get(name)
+        if week is None or row is None:
+            if row is None:
+                logger.warning("Unknown employee: %s", name)
+            return False
+        overrides = self.overrides.setdefault(week, {})
+        if bool(available) == bool(self.roster.availability[row, DAYS.index(day)]):
+            changed = overrides.pop((row, day), None) is not None
+        else:
+            changed = overrides.get((row, day)) is None
+            overrides[(row, day)] = bool(available)
+        if changed:
+            self._stale_rosters.add(week)
+            self._dirty.setdefault(week, set()).add(day)
+        return True
+
+    def _apply_overrides(self, week):
+        """Give a week the roster with its date-specific availability, keeping its assignments."""
+        schedule = self.weeks[week]
+        overrides = self.overrides.get(week)
+        if overrides:
+            availability = self.roster.availability.copy()
+            for (row, day), available in overrides.items():
+                availability[row, DAYS.index(day)] = available
+            roster = self.roster.with_availability(availability)
+        else:
+            roster = self.roster
+        previous = schedule.roster
+        rows = {day: previous.rows_of(schedule.schedule[day]) for day in schedule.days}
+        schedule.employees = roster
+        schedule.schedule = {day: schedule.employees_for_rows(rows[day]) for day in schedule.days}
+
+    def _affected_days(self, schedule, dirty):
+        """Days of a week that must be replanned when `dirty` days changed."""
+        if not self.solver.incremental:
+            return list(schedule.days)
+        if schedule.day_caps() is None:  # Nothing links the days
+            return [day for day in schedule.days if day in dirty]
+        first = min(schedule.days.index(day) for day in dirty)
+        return schedule.days[first:]  # Later days see the changed days' picks against their caps
+
+    def generate_schedule(self):
+        """Bring the schedule up to date, replanning only what changed. Returns the replanned dates."""
+        settings = (self.solver, self.max_days_per_week)
+        if settings != self._settings:  # A new solver or cap affects every date
+            self._settings = settings
+            self._dirty = {week: set(schedule.days) for week, schedule in self.weeks.items()}
+
+        replanned = []
+        for week, dirty in self._dirty.items():
+            if not dirty:
+                continue
+            schedule = self.weeks[week]
+            schedule.solver = self.solver
+            schedule.max_days_per_week = self.max_days_per_week
+            if week in self._stale_rosters:
+                self._apply_overrides(week)
+            days = self._affected_days(schedule, dirty)
+            if len(days) == len(schedule.days):
+                schedule.apply_plan(schedule.plan_schedule())  # Unassigned lists are left for first use
+            else:
+                schedule.replan_days(days)
+            replanned.extend(week + datetime.timedelta(days=DAYS.index(day)) for day in days)
+        self._dirty = {}
+        self._stale_rosters.clear()
+
+        metrics.count('dates_replanned', len(replanned))
+        logger.info("Replanned %d of %d dates.", len(replanned), len(self.dates))
+        return sorted(replanned)
+
+    def print_schedule(self):
+        lines = ["Final Schedule:"]
+        for date in self.dates:
+            names = [emp.name for emp in self.assigned(date)]
+            lines.append(f"{date} {day_name(date)}: {', '.join(names) if names else 'No employees assigned'}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,189 @@
+"""Write schedules to .xlsx, .csv or .json in bulk.
+
+Two layouts:
+    grid      one column per day listing who works it, like the schedule view (plus an
+              Unassigned table when asked for)
+    employee  one row per employee with what they do each day and their total days
+
+Rows are generated lazily and handed straight to the writers (openpyxl write-only mode,
+csv.writer, incremental JSON), so no text is built up in memory. Nothing here needs Tk,
+so batch jobs can export headlessly:
+
+    from schedule_export import export_schedule
+    export_schedule(schedule, "week.xlsx", layout="employee")
+"""
+import csv
+import json
+import os
+import threading
+from itertools import zip_longest
+
+from schedule_core import metrics
+
+EXPORT_FORMATS = ('.xlsx', '.csv', '.json')
+LAYOUTS = ('grid', 'employee')
+
+
+def grid_rows(days_employees):
+    """Rows of names, the i-th employee of every day side by side ('' where a day runs out)."""
+    return zip_longest(*[[employee.name for employee in employees] for employees in days_employees], fillvalue='')
+
+
+def employee_rows(schedule):
+    """One row per roster employee in name order: name, one cell per day, days assigned.
+
+    A day's cell holds the employee's shifts when shift-level staffing was generated,
+    "Assigned" otherwise; unassigned days say "Available" or stay blank.
+    """
+    days = schedule.days
+    assigned = [schedule.schedule[day] for day in days]
+    shift_text = []
+    for day in days:
+        worked = {}
+        for shift, employees in sorted(schedule.shifts.get(day, {}).items()):
+            for employee in employees:
+                worked.setdefault(employee, []).append(str(shift))
+        shift_text.append({employee: ", ".join(shifts) for employee, shifts in worked.items()})
+
+    roster = schedule.roster
+    for row in schedule.index.name_order:
+        employee = roster.employee(row)
+        cells = []
+        for day, employees, shifts in zip(days, assigned, shift_text):
+            if employee in employees:
+                cells.append(shifts.get(employee, "Assigned"))
+            else:
+                cells.append("Available" if employee.is_available(day) else "")
+        yield [employee.name] + cells + [len(cells) - cells.count("") - cells.count("Available")]
+
+
+def schedule_tables(schedule, layout='grid', unassigned=True):
+    """(title, header, rows) for each table of an export."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {', '.join(LAYOUTS)}.")
+    days = list(schedule.days)
+    if layout == 'employee':
+        return [("Schedule", ["Name"] + days + ["Days"], employee_rows(schedule))]
+    tables = [("Schedule", days, grid_rows([schedule.schedule[day] for day in days]))]
+    if unassigned:
+        tables.append(("Unassigned", days, grid_rows([schedule.unassigned_employees[day] for day in days])))
+    return tables
+
+
+def _replace_when_written(path, write):
+    """Run write(tmp_path), then move the result over `path` so readers never see half a file."""
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_xlsx(path, tables):
+    """One sheet per table. Uses xlsxwriter's constant-memory mode when it is installed (several
+    times faster), otherwise openpyxl's write-only mode; both stream rows out as they come."""
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    def write_with_xlsxwriter(tmp_path):
+        workbook = xlsxwriter.Workbook(tmp_path, {'constant_memory': True})
+        for title, header, rows in tables:
+            sheet = workbook.add_worksheet(title)
+            sheet.write_row(0, 0, header)
+            count = 0
+            for count, row in enumerate(rows, start=1):
+                sheet.write_row(count, 0, row)
+            metrics.count('rows_exported', count, format='xlsx')
+        workbook.close()
+
+    def write_with_openpyxl(tmp_path):
+        import openpyxl
+
+        workbook = openpyxl.Workbook(write_only=True)  # Streams rows out instead of keeping cell objects
+        for title, header, rows in tables:
+            sheet = workbook.create_sheet(title)
+            sheet.append(header)
+            count = 0
+            for row in rows:
+                sheet.append(row)
+                count += 1
+            metrics.count('rows_exported', count, format='xlsx')
+        workbook.save(tmp_path)
+
+    _replace_when_written(path, write_with_xlsxwriter if xlsxwriter is not None else write_with_openpyxl)
+    return [path]
+
+
+def write_csv(path, tables):
+    """The first table goes to `path`, any others beside it as <name>.<table>.csv."""
+    stem, extension = os.path.splitext(path)
+    paths = []
+    for idx, (title, header, rows) in enumerate(tables):
+        table_path = path if idx == 0 else f"{stem}.{title.lower()}{extension}"
+
+        def write(tmp_path):
+            with open(tmp_path, 'w', newline='') as out:
+                writer = csv.writer(out)
+                writer.writerow(header)
+                count = 0
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+                metrics.count('rows_exported', count, format='csv')
+        _replace_when_written(table_path, write)
+        paths.append(table_path)
+    return paths
+
+
+def write_json(path, tables):
+    """{"<table>": [{header: value, ...}, ...], ...}, written one record at a time (employee layout)."""
+    def write(tmp_path):
+        with open(tmp_path, 'w') as out:
+            out.write("{")
+            for idx, (title, header, rows) in enumerate(tables):
+                out.write(f"{',' if idx else ''}\n  {json.dumps(title.lower())}: [")
+                count = 0
+                for row in rows:
+                    out.write(",\n    " if count else "\n    ")
+                    out.write(json.dumps(dict(zip(header, row))))
+                    count += 1
+                out.write("\n  ]" if count else "]")
+                metrics.count('rows_exported', count, format='json')
+            out.write("\n}\n")
+    _replace_when_written(path, write)
+    return [path]
+
+
+def write_json_grid(path, schedule, unassigned=True):
+    """{"schedule": {day: [names]}, "unassigned": {...}}; json.dump streams it out in pieces."""
+    document = {'schedule': {day: [employee.name for employee in schedule.schedule[day]] for day in schedule.days}}
+    if unassigned:
+        document['unassigned'] = {
+            day: [employee.name for employee in schedule.unassigned_employees[day]] for day in schedule.days
+        }
+
+    def write(tmp_path):
+        with open(tmp_path, 'w') as out:
+            json.dump(document, out, indent=1)
+    _replace_when_written(path, write)
+    metrics.count('rows_exported', sum(len(names) for table in document.values() for names in table.values()),
+                  format='json')
+    return [path]
+
+
+WRITERS = {'.xlsx': write_xlsx, '.csv': write_csv, '.json': write_json}
+
+
+def export_schedule(schedule, path, layout='grid', unassigned=True):
+    """Write `schedule` to `path` in the format its extension names; returns the files written."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Can't export to {path!r}; use one of {', '.join(EXPORT_FORMATS)}.")
+    with metrics.timer('export_seconds', format=extension[1:]):
+        if extension == '.json' and layout == 'grid':
+            return write_json_grid(path, schedule, unassigned)
+        return WRITERS[extension](path, schedule_tables(schedule, layout, unassigned))
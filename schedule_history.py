@@ -0,0 +1,162 @@
+"""Remember who worked which days in past weeks, so each new week can be shared out fairly.
+
+    history = HistoryStore(history_path(roster_path))
+    schedule.history, schedule.week = history, week_start(next_sunday)
+    schedule.generate_schedule()  # Candidates come in fairness order instead of roster order
+    history.record(schedule.week, schedule)  # Once the week is final
+
+Each recorded week is one row holding two packed arrays, like the journal's snapshots: the ids
+of everyone who worked and a bitmask of their days. A ranking reads only the RECENT_WEEKS rows
+before the week being planned, by primary key, however many years are stored, and orders the
+roster by:
+
+- Sat/Sun: fewest weekend days lately, then longest since their last weekend, then fewest days
+- other days: fewest days lately
+- ties: seniority order (first week on record), rotated by one place each week, so the
+  same people don't always win the ties
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from schedule_core import DAY_BITS, logger, metrics
+
+RECENT_WEEKS = 12  # How far back load and weekends count
+WEEKEND_BITS = DAY_BITS['Sat'] | DAY_BITS['Sun']
+
+# Position of every roster row in the order candidates are taken (lower goes first), one array
+# for Sat/Sun and one for the other days
+FairnessRanking = namedtuple('FairnessRanking', ['weekday', 'weekend'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    first_week TEXT NOT NULL  -- earliest week recorded for them
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    week TEXT PRIMARY KEY,    -- ISO date of the week's Sunday
+    employees BLOB NOT NULL,  -- int32 employees.id of everyone who worked
+    days BLOB NOT NULL        -- uint8 per employee: bit i set = worked DAYS[i]
+);
+"""
+
+
+def history_path(roster_path):
+    """Where the history for a roster file lives: beside its journal in .schedule_journal."""
+    folder = os.path.join(os.path.dirname(os.path.abspath(roster_path)), ".schedule_journal")
+    return os.path.join(folder, os.path.basename(roster_path) + ".history.sqlite")
+
+
+def _bit_count(masks):
+    """Set bits in each of an array of uint8 day masks."""
+    return np.unpackbits(masks[:, None], axis=1).sum(axis=1, dtype=np.int64)
+
+
+class HistoryStore:
+    """Days worked per employee and week, in an SQLite file.
+
+    Employees are matched by name, so the history carries over roster edits and reloads.
+    Safe to share between threads (plans are made off the UI thread).
+    """
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.version = 0  # Bumped by record(), so cached rankings know to be rebuilt
+        # name -> (id, first week as a date ordinal), read once and kept up to date by record()
+        self.employees = {name: (employee_id, datetime.date.fromisoformat(first_week).toordinal())
+                          for employee_id, name, first_week in self.db.execute("SELECT id, name, first_week FROM employees")}
+
+    def close(self):
+        self.db.close()
+
+    @metrics.timed('history_record_seconds')
+    def record(self, week, schedule):
+        """Store the schedule's assignments as week `week` (a date), replacing any recorded before."""
+        roster = schedule.roster
+        days = np.zeros(len(roster), dtype=np.uint8)
+        for day in schedule.days:
+            days[roster.rows_of(schedule.schedule[day])] |= DAY_BITS[day]
+        worked = np.flatnonzero(days)
+        names = [roster.names[row] for row in worked.tolist()]
+        ordinal = week.toordinal()
+        with self.lock, self.db:
+            new, earlier = [], []
+            next_id = max((employee_id for employee_id, _ in self.employees.values()), default=0) + 1
+            for name in dict.fromkeys(names):
+                known = self.employees.get(name)
+                if known is None:
+                    self.employees[name] = (next_id, ordinal)
+                    new.append((next_id, name, week.isoformat()))
+                    next_id += 1
+                elif ordinal < known[1]:
+                    self.employees[name] = (known[0], ordinal)
+                    earlier.append((week.isoformat(), name))
+            self.db.executemany("INSERT INTO employees VALUES (?, ?, ?)", new)
+            self.db.executemany("UPDATE employees SET first_week = ? WHERE name = ?", earlier)
+            ids = np.array([self.employees[name][0] for name in names], dtype=np.int32)
+            self.db.execute("INSERT OR REPLACE INTO weeks VALUES (?, ?, ?)",
+                            (week.isoformat(), ids.tobytes(), days[worked].tobytes()))
+            self.version += 1
+        metrics.count('history_weeks_recorded')
+        logger.info("Recorded %d employees for the week of %s.", len(names), week)
+
+    def weeks(self):
+        """Recorded weeks, oldest first."""
+        with self.lock:
+            return [datetime.date.fromisoformat(week) for week, in self.db.execute("SELECT week FROM weeks ORDER BY week")]
+
+    @metrics.timed('history_ranking_seconds')
+    def ranking(self, roster, week, recent_weeks=RECENT_WEEKS):
+        """FairnessRanking of the roster's rows for planning week `week` (a date)."""
+        since = week - datetime.timedelta(weeks=recent_weeks)
+        with self.lock:
+            recent = self.db.execute("SELECT week, employees, days FROM weeks WHERE week >= ? AND week < ?",
+                                     (since.isoformat(), week.isoformat())).fetchall()
+            names = list(self.employees)
+            known = np.array(list(self.employees.values()), dtype=np.int64).reshape(-1, 2)  # (id, first week)
+
+        # Roster row of each employee id (-1 if not on this roster), and seniority: earliest
+        # first week first, then roster order; people never recorded come last
+        size = len(roster)
+        rows = np.array([roster.rows_by_name.get(name, -1) for name in names], dtype=np.intp)
+        row_of = np.full(known[:, 0].max(initial=0) + 1, -1, dtype=np.intp)
+        row_of[known[:, 0]] = rows
+        first = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        first[rows[rows >= 0]] = known[rows >= 0, 1]
+
+        load = np.zeros(size, dtype=np.int64)
+        weekends = np.zeros(size, dtype=np.int64)
+        last_weekend = np.full(size, -1, dtype=np.int64)  # Week number of their latest weekend day, -1 if none lately
+        for week_seen, ids, days in recent:
+            rows = row_of[np.frombuffer(ids, dtype=np.int32)]
+            days = np.frombuffer(days, dtype=np.uint8)[rows >= 0]
+            rows = rows[rows >= 0]
+            load[rows] += _bit_count(days)
+            weekends[rows] += _bit_count(days & WEEKEND_BITS)
+            had_weekend = rows[(days & WEEKEND_BITS) != 0]
+            last_weekend[had_weekend] = np.maximum(last_weekend[had_weekend],
+                                                   datetime.date.fromisoformat(week_seen).toordinal() // 7)
+
+        seniority = np.empty(size, dtype=np.int64)
+        seniority[np.argsort(first, kind='stable')] = np.arange(size)
+        rotation = (seniority - week.toordinal() // 7) % max(size, 1)
+
+        def ranks(order):
+            rank = np.empty(size, dtype=np.int64)
+            rank[order] = np.arange(size)
+            return rank
+
+        metrics.count('history_weeks_read', len(recent))
+        return FairnessRanking(ranks(np.lexsort((rotation, load))),
+                               ranks(np.lexsort((rotation, load, last_weekend, weekends))))
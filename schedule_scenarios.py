@@ -0,0 +1,188 @@
+"""What-if staffing: how well would the roster cover each of many employees_needed variants?
+
+    from schedule_scenarios import evaluate_scenarios
+    results = evaluate_scenarios(schedule, [dict(base, Sat=n) for n in range(2, 9)])
+    for result in results:
+        print(result.needed['Sat'], result.coverage, result.shortfall['Sat'])
+
+Nothing is assigned; each scenario reports what generate_schedule would give with the
+schedule's roster, solver and caps. With the greedy solver every scenario is worked out at
+once over a scenario axis of numpy arrays, reading the roster's availability index in place;
+scenarios with the same needs for the first days share that part of the work. Other solvers
+plan each scenario in a process pool whose workers build the index once and keep it.
+
+From the command line, every combination of the --vary values is evaluated:
+
+    python schedule_scenarios.py excel_sheets/store.xlsx --needed 3 --vary Sat=2,4,6 --vary Sun=2,3
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from schedule_core import DAYS, SOLVERS, GreedySolver, Roster, RosterCache, Schedule, metrics
+
+CHUNK_CELLS = 1 << 25  # Scenario x roster cells of working state held at once (int8, so 32 MiB)
+
+# Per-day counts ({day: n}) for one scenario. assigned: employees scheduled; shortfall: needed
+# but not filled; unassigned: everyone else on the roster (as in Schedule.unassigned_employees);
+# idle: available but not scheduled. coverage is assigned / needed over the week (1.0 if none needed).
+ScenarioResult = namedtuple('ScenarioResult', ['needed', 'assigned', 'shortfall', 'unassigned', 'idle', 'coverage'])
+
+
+def greedy_assigned(schedule, needed):
+    """Employees GreedySolver would assign per (scenario, day) for a (scenarios, days) array of needs."""
+    index = schedule.index
+    days = list(schedule.days)
+    needed = np.maximum(needed, 0)
+    caps = schedule.day_caps()
+    if caps is None:  # Nobody runs out of days, so each day takes what it needs of who is available
+        return np.minimum(needed, [index.count(day) for day in days])
+
+    candidates = [schedule.candidates(day) for day in days]  # Same order as GreedySolver
+    assigned = np.zeros(needed.shape, dtype=np.int64)
+    chunk = max(1, CHUNK_CELLS // max(len(schedule.roster), 1))
+    for lo in range(0, len(needed), chunk):
+        part = needed[lo:lo + chunk]
+        # One row of days worked per distinct history; scenarios that needed the same on every
+        # day so far point at the same state
+        states = np.zeros((1, len(schedule.roster)), dtype=np.int8)
+        state_of = np.zeros(len(part), dtype=np.intp)
+        for d, rows in enumerate(candidates):
+            branches, state_of = np.unique(np.stack([state_of, part[:, d]], axis=1), axis=0, return_inverse=True)
+            state_of = state_of.reshape(-1)
+            states = states[branches[:, 0]]
+            wanted = branches[:, 1:2]
+            # The first `needed` eligible candidates in order are the ones chosen, so only look
+            # as far down the list as it takes to find that many
+            limit = int(wanted.max())
+            while limit:
+                head = rows[:limit]
+                eligible = states[:, head] < caps[head]
+                taken = np.cumsum(eligible, axis=1, dtype=np.int32)
+                if limit >= len(rows) or (taken[:, -1:] >= wanted).all():
+                    break
+                limit *= 2
+            if not limit:
+                continue  # Nobody needed on this day in any scenario
+            chosen = eligible & (taken <= wanted)
+            states[:, head] += chosen
+            assigned[lo:lo + len(part), d] = chosen.sum(axis=1)[state_of]
+    return assigned
+
+
+# Set up in each pool worker by _start_worker, so the roster and its index are built once per process
+_worker_schedule = None
+
+
+def _start_worker(roster, days, max_days_per_week, solver):
+    global _worker_schedule
+    _worker_schedule = Schedule(days, roster)
+    _worker_schedule.max_days_per_week = max_days_per_week
+    _worker_schedule.solver = solver
+    _worker_schedule.index  # Build the index before the first scenario arrives
+
+
+def _plan_counts(needed):
+    schedule = _worker_schedule
+    schedule.employees_needed = needed
+    plan = schedule.plan_schedule()
+    return [len(plan.get(day, [])) for day in schedule.days]
+
+
+def pooled_assigned(schedule, scenarios, workers=None):
+    """Employees the schedule's solver would assign per (scenario, day), one plan per scenario
+    spread over a process pool (or run here when there is one worker or one scenario)."""
+    workers = workers or os.cpu_count() or 1
+    # Only plain arrays go to the workers, not Employee objects or the index
+    roster = Roster(schedule.roster.names, schedule.roster.availability, None, schedule.roster.max_days)
+    args = (roster, list(schedule.days), schedule.max_days_per_week, schedule.solver)
+    if workers == 1 or len(scenarios) == 1:
+        _start_worker(*args)
+        return np.array([_plan_counts(needed) for needed in scenarios], dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=args) as pool:
+        chunksize = max(1, len(scenarios) // (workers * 4))
+        return np.array(list(pool.map(_plan_counts, scenarios, chunksize=chunksize)), dtype=np.int64)
+
+
+@metrics.timed('scenario_seconds')
+def evaluate_scenarios(schedule, scenarios, workers=None):
+    """A ScenarioResult for each employees_needed dict in `scenarios`, in the same order.
+
+    Uses the schedule's roster, solver and max_days_per_week; days missing from a dict need 0.
+    `workers` sizes the process pool used for solvers other than greedy.
+    """
+    scenarios = [dict(needed) for needed in scenarios]
+    if not scenarios:
+        return []
+    days = list(schedule.days)
+    needed = np.array([[int(needed.get(day, 0)) for day in days] for needed in scenarios], dtype=np.int64)
+    if type(schedule.solver) is GreedySolver:
+        assigned = greedy_assigned(schedule, needed)
+    else:
+        assigned = pooled_assigned(schedule, scenarios, workers)
+    metrics.count('scenarios_evaluated', len(scenarios), solver=type(schedule.solver).__name__)
+
+    shortfall = np.maximum(needed, 0) - assigned
+    available = np.array([schedule.index.count(day) for day in days])
+    unassigned = len(schedule.roster) - assigned
+    idle = available - assigned
+    wanted = np.maximum(needed, 0).sum(axis=1)
+    coverage = np.where(wanted > 0, assigned.sum(axis=1) / np.maximum(wanted, 1), 1.0)
+    return [
+        ScenarioResult(scenario, dict(zip(days, assigned[s].tolist())), dict(zip(days, shortfall[s].tolist())),
+                       dict(zip(days, unassigned[s].tolist())), dict(zip(days, idle[s].tolist())),
+                       float(coverage[s]))
+        for s, scenario in enumerate(scenarios)
+    ]
+
+
+def parse_vary(text):
+    """Parse "Sat=2,4,6" into ('Sat', [2, 4, 6])."""
+    day, _, counts = text.partition('=')
+    day = day.strip().capitalize()
+    if day not in DAYS or not counts:
+        raise argparse.ArgumentTypeError(f"expected Day=n,n,... with a day from {', '.join(DAYS)}")
+    return day, [int(count) for count in counts.split(',')]
+
+
+def main(argv=None):
+    from schedule_batch import parse_needed
+
+    parser = argparse.ArgumentParser(description="Compare the coverage of many staffing levels for one roster.")
+    parser.add_argument('roster', help="roster workbook (.xlsx, .csv or .parquet)")
+    parser.add_argument('--needed', type=parse_needed, required=True,
+                        help='baseline employees needed per day: "3" or "Sun=2,Mon=3,..."')
+    parser.add_argument('--vary', type=parse_vary, action='append', default=[],
+                        help='values to try for one day, e.g. Sat=4,5,6 (repeat for more days)')
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default='greedy', help="scheduling strategy")
+    parser.add_argument('--max-days', type=int, default=None, help="most days per week for any employee")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for the flow solver")
+    args = parser.parse_args(argv)
+
+    schedule = Schedule(list(DAYS), RosterCache(max_entries=1).load(args.roster))
+    schedule.solver = SOLVERS[args.solver]()
+    schedule.max_days_per_week = args.max_days
+    varied = [day for day, _ in args.vary]
+    scenarios = [dict(args.needed, **dict(zip(varied, counts)))
+                 for counts in itertools.product(*[counts for _, counts in args.vary])]
+
+    start = time.perf_counter()
+    results = evaluate_scenarios(schedule, scenarios, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(" ".join(f"{day:>4}" for day in varied) + f" {'coverage':>9} {'shortfall':>9} {'idle':>9}")
+    for result in results:
+        print(" ".join(f"{result.needed[day]:>4}" for day in varied) + f" {result.coverage:>9.1%} "
+              f"{sum(result.shortfall.values()):>9} {sum(result.idle.values()):>9}")
+    print(f"\n{len(results)} scenarios in {elapsed:.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""Local HTTP/JSON service that keeps many schedules (one per store) in memory.
+
+    python schedule_server.py --port 8765 --rosters excel_sheets --exports schedules
+
+Schedules are named by the caller. Rosters come from the shared RosterCache, so stores loading
+the same workbook share one parsed roster and one availability index. Requests on different
+schedules run in parallel; requests on the same schedule take its lock in turn.
+
+    GET  /schedules                      names, rosters and sizes of every schedule
+    GET  /schedules/<id>                 per-day assigned / needed / available counts
+    GET  /schedules/<id>/days/<day>      names assigned and available-but-unassigned on one day
+    POST /schedules/<id>/roster          {"path": "store.xlsx"} (relative to --rosters)
+    PUT  /schedules/<id>/needed          {"needed": {"Mon": 3, ...}, "max_days": 5}
+    POST /schedules/<id>/generate        {"solver": "greedy"}
+    POST /schedules/<id>/assign          {"name": "Ann", "days": ["Mon", "Tue"], "force": false}
+    POST /schedules/<id>/remove          {"name": "Ann", "day": "Mon"}
+    POST /schedules/<id>/export          {"file": "week.xlsx", "layout": "grid"} (into --exports)
+    GET  /metrics                        Prometheus text
+
+Errors come back as {"error": "..."} with a 4xx status; a batch assignment that can't be applied
+is a 409 listing the problems.
+"""
+import argparse
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from schedule_export import EXPORT_FORMATS, LAYOUTS, export_schedule
+from schedule_core import DAYS, SOLVERS, RosterCache, Schedule, configure_logging, logger, metrics
+
+
+class ServiceError(Exception):
+    """A request the service can't carry out; `status` is the HTTP status to answer with."""
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def _expect_text(**fields):
+    """Refuse request fields that should be strings (a name, a day, a file) but aren't."""
+    for field, value in fields.items():
+        if not isinstance(value, str):
+            raise ServiceError(400, f"{field} must be a string.")
+
+
+class ScheduleService:
+    """The schedules behind the HTTP API; usable directly, without a server."""
+    def __init__(self, roster_dir="excel_sheets", export_dir="schedules", cache=None):
+        self.roster_dir = os.path.abspath(roster_dir)
+        self.export_dir = os.path.abspath(export_dir)
+        self.cache = cache or RosterCache(max_entries=64)
+        self._schedules = {}  # id -> (Schedule, lock, roster path)
+        self._lock = threading.Lock()  # Guards _schedules and _loading; each schedule has its own lock
+        self._loading = {}  # Roster path -> lock held while that roster is loaded and warmed up
+
+    def _get(self, schedule_id):
+        with self._lock:
+            entry = self._schedules.get(schedule_id)
+        if entry is None:
+            raise ServiceError(404, f"No schedule {schedule_id!r}; load a roster into it first.")
+        return entry
+
+    def _inside(self, folder, name):
+        """`name` resolved under `folder`; paths that lead out of it are refused."""
+        path = os.path.abspath(os.path.join(folder, name))
+        if os.path.commonpath([folder, path]) != folder:
+            raise ServiceError(400, f"{name!r} is outside {folder}.")
+        return path
+
+    def schedules(self):
+        with self._lock:
+            entries = list(self._schedules.items())
+        return {'schedules': [{'id': schedule_id, 'roster': os.path.relpath(path, self.roster_dir),
+                               'employees': len(schedule.roster)}
+                              for schedule_id, (schedule, _, path) in entries]}
+
+    def load_roster(self, schedule_id, path):
+        """Load (or reuse from the cache) a roster into a fresh schedule called `schedule_id`."""
+        _expect_text(path=path)
+        path = self._inside(self.roster_dir, path)
+        if not os.path.isfile(path):
+            raise ServiceError(404, f"No roster file {os.path.relpath(path, self.roster_dir)!r}.")
+        with self._lock:
+            loading = self._loading.setdefault(path, threading.Lock())
+        with loading:
+            roster = self.cache.load(path)
+            # Schedules on different threads share this roster, so build its index and hand out
+            # every Employee now rather than have concurrent requests race to create them
+            roster.index
+            roster.employees
+        schedule = Schedule(list(DAYS), roster)
+        with self._lock:
+            self._schedules[schedule_id] = (schedule, threading.Lock(), path)
+        return {'id': schedule_id, 'employees': len(roster), 'problems': len(roster.problems)}
+
+    def summary(self, schedule_id):
+        schedule, lock, _ = self._get(schedule_id)
+        with lock:
+            return {
+                'id': schedule_id,
+                'max_days': schedule.max_days_per_week,
+                'days': {day: {'assigned': len(schedule.schedule[day]), 'needed': schedule.get_max_employees_for_day(day),
+                               'available': schedule.index.count(day)} for day in schedule.days},
+            }
+
+    def _check_day(self, schedule, day):
+        if day not in schedule.schedule:
+            raise ServiceError(404, f"No day {day!r}; expected one of {', '.join(schedule.days)}.")
+
+    def day(self, schedule_id, day):
+        schedule, lock, _ = self._get(schedule_id)
+        self._check_day(schedule, day)
+        with lock:
+            return {'day': day,
+                    'assigned': [emp.name for emp in schedule.schedule[day]],
+                    'unassigned': [emp.name for emp in schedule.unassigned_employees[day] if emp.is_available(day)]}
+
+    def set_needed(self, schedule_id, needed, max_days=None):
+        schedule, lock, _ = self._get(schedule_id)
+        try:
+            counts = {day: int(needed.get(day, 0)) for day in schedule.days}
+            max_days = None if max_days is None else int(max_days)
+        except (AttributeError, TypeError, ValueError):
+            raise ServiceError(400, "needed must map days to integers and max_days be an integer or null.")
+        with lock:
+            schedule.set_employees_needed(counts)
+            schedule.max_days_per_week = max_days
+        return {'needed': counts, 'max_days': max_days}
+
+    def generate(self, schedule_id, solver='greedy'):
+        schedule, lock, _ = self._get(schedule_id)
+        _expect_text(solver=solver)
+        if solver not in SOLVERS:
+            raise ServiceError(400, f"Unknown solver {solver!r}; expected one of {', '.join(SOLVERS)}.")
+        with lock:
+            schedule.solver = SOLVERS[solver]()
+            schedule.apply_plan(schedule.plan_schedule())
+            return {'assigned': {day: len(schedule.schedule[day]) for day in schedule.days}}
+
+    def _employee(self, schedule, name):
+        employee = schedule.roster.find(name)
+        if employee is None:
+            raise ServiceError(404, f"No employee {name!r} on this roster.")
+        return employee
+
+    def assign(self, schedule_id, name, days, force=False):
+        """Assign one employee to several days at once (Schedule.assign_batch: all or nothing)."""
+        schedule, lock, _ = self._get(schedule_id)
+        _expect_text(name=name)
+        if not isinstance(days, list) or not all(isinstance(day, str) for day in days):
+            raise ServiceError(400, "days must be a list of day names.")
+        if not isinstance(force, bool):
+            raise ServiceError(400, "force must be true or false.")
+        with lock:
+            employee = self._employee(schedule, name)
+            pairs, problems = schedule.assign_batch([(employee, day, force) for day in days])
+        if problems:
+            raise ServiceError(409, "Nothing was assigned.",
+                               problems=[{'day': problem.day, 'reason': problem.reason} for problem in problems])
+        return {'assigned': [day for day, _ in pairs]}
+
+    def remove(self, schedule_id, name, day):
+        schedule, lock, _ = self._get(schedule_id)
+        _expect_text(name=name, day=day)
+        self._check_day(schedule, day)
+        with lock:
+            removed = schedule.remove_employee_from_day(day, self._employee(schedule, name))
+        return {'removed': removed}
+
+    def export(self, schedule_id, file, layout='grid'):
+        """Export to `file` in the export folder; the schedule is copied so the lock isn't held while writing."""
+        schedule, lock, _ = self._get(schedule_id)
+        _expect_text(file=file, layout=layout)
+        path = self._inside(self.export_dir, file)
+        if os.path.splitext(path)[1].lower() not in EXPORT_FORMATS or layout not in LAYOUTS:
+            raise ServiceError(400, f"Export to one of {', '.join(EXPORT_FORMATS)} in layout {' or '.join(LAYOUTS)}.")
+        with lock:
+            snapshot = schedule.copy()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        paths = export_schedule(snapshot, path, layout)
+        return {'files': [os.path.relpath(written, self.export_dir) for written in paths]}
+
+
+# (method, path pattern, ScheduleService method, names of the JSON body fields it takes)
+ROUTES = [
+    ('GET', r'/schedules', 'schedules', []),
+    ('GET', r'/schedules/(?P<schedule_id>[^/]+)', 'summary', []),
+    ('GET', r'/schedules/(?P<schedule_id>[^/]+)/days/(?P<day>[^/]+)', 'day', []),
+    ('POST', r'/schedules/(?P<schedule_id>[^/]+)/roster', 'load_roster', ['path']),
+    ('PUT', r'/schedules/(?P<schedule_id>[^/]+)/needed', 'set_needed', ['needed', 'max_days']),
+    ('POST', r'/schedules/(?P<schedule_id>[^/]+)/generate', 'generate', ['solver']),
+    ('POST', r'/schedules/(?P<schedule_id>[^/]+)/assign', 'assign', ['name', 'days', 'force']),
+    ('POST', r'/schedules/(?P<schedule_id>[^/]+)/remove', 'remove', ['name', 'day']),
+    ('POST', r'/schedules/(?P<schedule_id>[^/]+)/export', 'export', ['file', 'layout']),
+]
+ROUTES = [(method, re.compile(pattern + '$'), handler, fields) for method, pattern, handler, fields in ROUTES]
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    """Maps requests onto the server's ScheduleService; keep-alive, JSON in and out."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the body of every
+    # keep-alive response waits out the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/metrics':
+            self._send(200, metrics.to_prometheus().encode(), "text/plain; version=0.0.4")
+            return
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method):
+        path = urlsplit(self.path).path
+        with metrics.timer('http_request_seconds', method=method):
+            try:
+                body = self._read_body()
+                for route_method, pattern, handler, fields in ROUTES:
+                    match = pattern.match(path)
+                    if match and route_method == method:
+                        kwargs = dict(match.groupdict(), **{field: body[field] for field in fields if field in body})
+                        call = getattr(self.server.service, handler)
+                        try:
+                            inspect.signature(call).bind(**kwargs)
+                        except TypeError:
+                            raise ServiceError(400, f"Expected a JSON body with {', '.join(fields)}.")
+                        self._send_json(200, call(**kwargs))
+                        return
+                raise ServiceError(404, f"No route for {method} {path}.")
+            except ServiceError as error:
+                metrics.count('http_errors', status=error.status)
+                self._send_json(error.status, dict(error.details, error=str(error)))
+            except Exception as error:  # Report it rather than drop the connection
+                logger.exception("Request %s %s failed", method, path)
+                self._send_json(500, {'error': f"{type(error).__name__}: {error}"})
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ServiceError(400, "Request body is not JSON.")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "Request body must be a JSON object.")
+        return body
+
+    def _send_json(self, status, document):
+        self._send(status, json.dumps(document).encode(), "application/json")
+
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class ScheduleServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with a ScheduleService; one thread per connection."""
+    daemon_threads = True
+
+    def __init__(self, address, service):
+        super().__init__(address, ScheduleRequestHandler)
+        self.service = service
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve schedules for many stores over a local JSON API.")
+    parser.add_argument('--host', default="127.0.0.1", help="address to listen on (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rosters', default="excel_sheets", help="folder roster paths are relative to")
+    parser.add_argument('--exports', default="schedules", help="folder exports are written to")
+    parser.add_argument('--log-level', default="INFO")
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level)
+    server = ScheduleServer((args.host, args.port), ScheduleService(args.rosters, args.exports))
+    logger.info("Serving schedules on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""Keep a schedule's edits in an SQLite journal so they survive restarts and can be undone.
+
+Every change goes through a ScheduleStore instead of straight to the Schedule:
+
+    store = ScheduleStore(journal_path(roster_path), schedule)  # Restores the last session's edits
+    store.assign('Mon', employee)
+    store.undo()
+
+The journal is append-only: one row per step (assign, force-assign, remove, a batch of
+assignments, assignments dropped by a roster reload, a change of the staffing settings, or a
+whole generated plan), holding just enough to apply the step and its
+inverse, so undo and redo touch one row and one day. Every SNAPSHOT_EVERY steps (and around
+generated plans) the full assignment is saved as packed roster rows; reopening loads the newest
+snapshot and replays the few steps after it, without running a solver.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+
+from schedule_core import logger, metrics
+
+SNAPSHOT_EVERY = 200  # Steps between full snapshots; bounds the replay on reopen
+
+# What undo()/redo() changed: the step's kind and the (day, employee) pairs it touched. Plans
+# and settings changes leave `pairs` empty, since they affect the whole schedule.
+Edit = namedtuple('Edit', ['kind', 'pairs'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS steps (
+    seq INTEGER PRIMARY KEY,  -- 1, 2, 3, ... with no gaps
+    kind TEXT NOT NULL,       -- assign, force, remove, batch, drop, settings or plan
+    day TEXT,
+    row INTEGER,              -- roster row of the employee (assign/force/remove)
+    data TEXT                 -- batch/drop: [[day, row], ...] added/removed; settings: [old, new] (JSON)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    seq INTEGER PRIMARY KEY,  -- the schedule as it was after step `seq`
+    settings TEXT NOT NULL,
+    counts BLOB NOT NULL,     -- int32 per day: how many rows belong to it
+    rows BLOB NOT NULL        -- int32 roster rows, day after day
+);
+"""
+
+
+def journal_path(roster_path):
+    """Where the journal for a roster file lives: a .schedule_journal folder beside it."""
+    folder = os.path.join(os.path.dirname(os.path.abspath(roster_path)), ".schedule_journal")
+    return os.path.join(folder, os.path.basename(roster_path) + ".sqlite")
+
+
+def roster_identity(roster):
+    """Names and order of a roster's employees, hashed; journals only replay onto the same roster."""
+    digest = hashlib.sha1()
+    for name in roster.names:
+        digest.update(name.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    return f"{len(roster)}:{digest.hexdigest()}"
+
+
+class ScheduleStore:
+    """An undo/redo journal for one Schedule, kept in an SQLite file.
+
+    Opening a journal written for the same roster and days brings the schedule back to where
+    the last session left it; a journal for a different roster is started afresh.
+    """
+    VERSION = 1  # Bump when the tables change
+
+    def __init__(self, path, schedule):
+        self.path = path
+        self.schedule = schedule
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")  # Appends don't rewrite the file
+        self.db.execute("PRAGMA synchronous=NORMAL")  # An fsync per checkpoint, not per step
+        self.db.executescript(SCHEMA)
+        self.head = 0  # Last applied step; steps after it are redo-able
+        self.last = 0  # Newest step in the journal
+        self._open()
+
+    def _identity(self):
+        return {'version': str(self.VERSION), 'roster': roster_identity(self.schedule.roster),
+                'days': json.dumps(list(self.schedule.days))}
+
+    def _open(self):
+        meta = dict(self.db.execute("SELECT key, value FROM meta"))
+        if meta and all(meta.get(key) == value for key, value in self._identity().items()):
+            self.head = int(meta['head'])
+            self.last = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM steps").fetchone()[0]
+            self.restore()
+            return
+        if meta:
+            logger.info("Journal %s was written for another roster; starting a new one.", self.path)
+        self._reset()
+        self.restore()  # Drops any assignments left over from another roster
+
+    def _reset(self):
+        """Empty the journal and start it from the schedule as it stands."""
+        with self.db:
+            self.db.execute("DELETE FROM steps")
+            self.db.execute("DELETE FROM snapshots")
+            self.db.execute("DELETE FROM meta")
+            self.db.executemany("INSERT INTO meta VALUES (?, ?)", list(self._identity().items()) + [('head', '0')])
+            self._snapshot(0)
+        self.head = self.last = 0
+
+    def close(self):
+        self.db.close()
+
+    @metrics.timed('journal_restore_seconds')
+    def restore(self, head=None):
+        """Rebuild the schedule as of step `head` (default: the current head) from the newest
+        snapshot at or before it plus the steps since."""
+        head = self.head if head is None else head
+        seq, settings, counts, rows = self.db.execute(
+            "SELECT seq, settings, counts, rows FROM snapshots WHERE seq <= ? ORDER BY seq DESC LIMIT 1",
+            (head,)).fetchone()
+        rows = np.split(np.frombuffer(rows, dtype=np.int32), np.cumsum(np.frombuffer(counts, dtype=np.int32))[:-1])
+        days = {day: set(day_rows.tolist()) for day, day_rows in zip(self.schedule.days, rows)}
+        self._set_settings(json.loads(settings))
+
+        # Replay on plain row sets; the sorted day lists are only built once at the end
+        replayed = 0
+        for kind, day, row, data in self.db.execute(
+                "SELECT kind, day, row, data FROM steps WHERE seq > ? AND seq <= ? ORDER BY seq", (seq, head)):
+            replayed += 1
+            if kind in ('assign', 'force'):
+                days[day].add(row)
+            elif kind == 'remove':
+                days[day].discard(row)
+            elif kind == 'batch':
+                for batch_day, batch_row in json.loads(data):
+                    days[batch_day].add(batch_row)
+            elif kind == 'drop':
+                for batch_day, batch_row in json.loads(data):
+                    days[batch_day].discard(batch_row)
+            elif kind == 'settings':
+                self._set_settings(json.loads(data)[1])
+            # A plan step always has a snapshot of its own, so it is never replayed
+        schedule = self.schedule
+        schedule.schedule = {day: schedule.employees_for_rows(sorted(days[day])) for day in schedule.days}
+        schedule._unassigned = None  # Derived again on first use
+        metrics.count('journal_steps_replayed', replayed)
+
+    # --- Recording edits
+
+    def assign(self, day, employee, force=False):
+        """Assign like Schedule.manually_add_employee and record it; returns whether anything changed."""
+        schedule = self.schedule
+        if day not in schedule.schedule or employee in schedule.schedule[day]:
+            return False
+        schedule.manually_add_employee(day, employee, force)
+        if employee not in schedule.schedule[day]:
+            return False
+        # Only record "force" when the assignment needed it, so the journal says why someone is on a day
+        forced = force and (not employee.is_available(day)
+                            or len(schedule.schedule[day]) > schedule.get_max_employees_for_day(day))
+        self._record('force' if forced else 'assign', day, self._row(employee))
+        return True
+
+    def remove(self, day, employee):
+        """Take an employee off a day and record it; returns whether they were on it."""
+        if not self.schedule.remove_employee_from_day(day, employee):
+            return False
+        self._record('remove', day, self._row(employee))
+        return True
+
+    def assign_batch(self, assignments):
+        """Schedule.assign_batch recorded as one step, so the whole batch undoes together."""
+        pairs, problems = self.schedule.assign_batch(assignments)
+        if pairs:
+            self._record('batch', data=json.dumps([[day, self._row(employee)] for day, employee in pairs]))
+        return pairs, problems
+
+    def fill_days(self, days):
+        """Schedule.fill_days recorded as one batch step."""
+        pairs = self.schedule.fill_days(days)
+        if pairs:
+            self._record('batch', data=json.dumps([[day, self._row(employee)] for day, employee in pairs]))
+        return pairs
+
+    def update_roster(self, roster):
+        """Schedule.update_roster for a reload of the roster file; returns the dropped (day, employee) pairs.
+
+        When the names are unchanged the drops are one step (undo puts those people back);
+        a roster with different people starts the journal again from the updated schedule.
+        """
+        previous = self.schedule.roster
+        dropped = self.schedule.update_roster(roster)
+        if roster.names != previous.names:
+            self._reset()
+        elif dropped:
+            rows = previous.rows_of([employee for _, employee in dropped]).tolist()
+            self._record('drop', data=json.dumps([[day, row] for (day, _), row in zip(dropped, rows)]))
+        return dropped
+
+    def set_settings(self, employees_needed, max_days_per_week):
+        """Change the employees needed per day and the days-per-week cap as one step."""
+        old = self._settings()
+        self._set_settings({'needed': employees_needed, 'max_days': max_days_per_week})
+        new = self._settings()
+        if new != old:
+            self._record('settings', data=json.dumps([old, new]))
+
+    def apply_plan(self, plan):
+        """Schedule.apply_plan, recorded with snapshots either side so it undoes in one step."""
+        self._ensure_snapshot(self.head)
+        self.schedule.apply_plan(plan)
+        self._record('plan')
+
+    # --- Undo and redo
+
+    def can_undo(self):
+        return self.head > 0
+
+    def can_redo(self):
+        return self.head < self.last
+
+    def undo(self):
+        """Revert the newest applied step; returns an Edit, or None when there is nothing to undo."""
+        if not self.can_undo():
+            return None
+        kind, day, row, data = self._step(self.head)
+        edit = self._apply(kind, day, row, data, self.head, forward=False)
+        self._move_head(self.head - 1)
+        return edit
+
+    def redo(self):
+        """Apply the step after head again; returns an Edit, or None when there is nothing to redo."""
+        if not self.can_redo():
+            return None
+        kind, day, row, data = self._step(self.head + 1)
+        edit = self._apply(kind, day, row, data, self.head + 1, forward=True)
+        self._move_head(self.head + 1)
+        return edit
+
+    def _apply(self, kind, day, row, data, seq, forward):
+        schedule = self.schedule
+        if kind == 'plan':
+            self.restore(seq if forward else seq - 1)  # Both sides of a plan are snapshots
+            return Edit(kind, [])
+        if kind == 'settings':
+            self._set_settings(json.loads(data)[1 if forward else 0])
+            return Edit(kind, [])
+        if kind in ('batch', 'drop'):
+            pairs = [(day, schedule.roster.employee(row)) for day, row in json.loads(data)]
+            for day, employee in pairs:
+                if forward == (kind == 'batch'):
+                    schedule._assign(day, employee)
+                else:
+                    schedule._unassign(day, employee)
+            return Edit(kind, pairs)
+        employee = schedule.roster.employee(row)
+        if (kind == 'remove') != forward:
+            schedule._assign(day, employee)
+        else:
+            schedule._unassign(day, employee)
+        return Edit(kind, [(day, employee)])
+
+    # --- Journal plumbing
+
+    def _row(self, employee):
+        return int(self.schedule.roster.rows_of([employee])[0])
+
+    def _settings(self):
+        schedule = self.schedule
+        return {'needed': {day: int(schedule.employees_needed.get(day, 0)) for day in schedule.days},
+                'max_days': schedule.max_days_per_week}
+
+    def _set_settings(self, settings):
+        self.schedule.employees_needed = {day: int(count) for day, count in settings['needed'].items()}
+        self.schedule.max_days_per_week = settings['max_days']
+
+    def _step(self, seq):
+        return self.db.execute("SELECT kind, day, row, data FROM steps WHERE seq = ?", (seq,)).fetchone()
+
+    def _record(self, kind, day=None, row=None, data=None):
+        """Append a step after head, dropping any undone steps it replaces."""
+        seq = self.head + 1
+        with self.db:
+            if self.last > self.head:
+                self.db.execute("DELETE FROM steps WHERE seq > ?", (self.head,))
+                self.db.execute("DELETE FROM snapshots WHERE seq > ?", (self.head,))
+            self.db.execute("INSERT INTO steps VALUES (?, ?, ?, ?, ?)", (seq, kind, day, row, data))
+            self.db.execute("UPDATE meta SET value = ? WHERE key = 'head'", (str(seq),))
+            if kind == 'plan' or seq % SNAPSHOT_EVERY == 0:
+                self._snapshot(seq)
+        self.head = self.last = seq
+        metrics.count('journal_steps', kind=kind)
+
+    def _move_head(self, seq):
+        with self.db:
+            self.db.execute("UPDATE meta SET value = ? WHERE key = 'head'", (str(seq),))
+        self.head = seq
+
+    def _ensure_snapshot(self, seq):
+        if self.db.execute("SELECT 1 FROM snapshots WHERE seq = ?", (seq,)).fetchone() is None:
+            with self.db:
+                self._snapshot(seq)
+
+    def _snapshot(self, seq):
+        """Save the schedule as it stands as the state after step `seq` (inside a transaction)."""
+        schedule = self.schedule
+        rows = [schedule.roster.rows_of(schedule.schedule[day]).astype(np.int32) for day in schedule.days]
+        counts = np.array([len(day_rows) for day_rows in rows], dtype=np.int32)
+        packed = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32)
+        self.db.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                        (seq, json.dumps(self._settings()), counts.tobytes(), packed.tobytes()))
+        metrics.count('journal_snapshots')
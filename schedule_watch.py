@@ -0,0 +1,149 @@
+"""Notice roster files in a folder being added, changed or removed.
+
+    watcher = DirectoryWatcher("excel_sheets", on_change)  # on_change(changed_paths, removed_paths)
+    watcher.start()
+
+On Linux the watcher sleeps on inotify (through libc, no extra packages) and wakes as soon as
+something in the folder is written, moved or deleted; elsewhere, or if inotify can't be set
+up, it polls every `interval` seconds. Either way it decides what changed by comparing each
+file's modification time and size with the last scan, after waiting for writes to settle, so
+a workbook saved in several steps is reported once. on_change runs on the watcher's thread.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+
+from schedule_core import ROSTER_EXTENSIONS, logger, metrics
+
+# inotify event bits (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def _inotify_fd(folder):
+    """A non-blocking inotify descriptor watching `folder`, or None where inotify isn't available."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except Exception:  # No usable libc (e.g. a static build); poll instead
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(folder), WATCH_EVENTS) < 0:
+        logger.warning("Could not watch %s: %s", folder, os.strerror(ctypes.get_errno()))
+        os.close(fd)
+        return None
+    return fd
+
+
+class DirectoryWatcher:
+    """Calls on_change(changed, removed) with lists of paths whenever roster files in `folder`
+    appear, change or disappear. Hidden files and Excel's "~$" lock files are ignored."""
+    def __init__(self, folder, on_change, extensions=ROSTER_EXTENSIONS, interval=2.0, settle=0.5):
+        self.folder = folder
+        self.on_change = on_change
+        self.extensions = tuple(extensions)
+        self.interval = interval  # Seconds between scans when polling (and the longest inotify sleep)
+        self.settle = settle  # Quiet time after an event before scanning, so half-saved files are skipped
+        self.mode = None  # 'inotify' or 'polling' once started
+        self._thread = None
+        self._stopping = threading.Event()
+        self._fd = None
+        self._wake_read = self._wake_write = None  # With inotify, stop() writes here to end a select() early
+
+    def start(self):
+        self._fd = _inotify_fd(self.folder)
+        self.mode = 'polling' if self._fd is None else 'inotify'
+        if self._fd is not None:
+            self._wake_read, self._wake_write = os.pipe()
+        self._known = self.scan()
+        self._thread = threading.Thread(target=self._run, name="roster-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Watching %s for roster changes (%s).", self.folder, self.mode)
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._wake_write is not None:
+            os.write(self._wake_write, b'x')
+        if self._thread is not None:
+            self._thread.join()
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._wake_read = self._wake_write = None
+
+    def scan(self):
+        """{path: (mtime_ns, size)} for the roster files in the folder now."""
+        files = {}
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError:
+            return files
+        for entry in entries:
+            if entry.name.startswith(('.', '~$')) or not entry.name.lower().endswith(self.extensions):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:  # Deleted between listing and stat
+                continue
+            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _wait(self, timeout):
+        """Sleep until something happens in the folder (inotify) or `timeout` passes; True if woken by an event."""
+        if self._fd is None:
+            # Polling: select() only takes sockets on Windows, so sleep on the stop event instead
+            self._stopping.wait(timeout)
+            return False
+        ready, _, _ = select.select([self._wake_read, self._fd], [], [], timeout)
+        if self._fd in ready:
+            self._drain()
+            return True
+        return False
+
+    def _drain(self):
+        """Throw away the queued inotify events; the scan works out what they amounted to."""
+        while True:
+            try:
+                if not os.read(self._fd, 64 * 1024):
+                    return
+            except BlockingIOError:
+                return
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if self._wait(self.interval):
+                # Keep waiting while the writes go on, then look once
+                while self._wait(self.settle) and not self._stopping.is_set():
+                    pass
+            if self._stopping.is_set():
+                return
+            current = self.scan()
+            changed = sorted(path for path, signature in current.items() if self._known.get(path) != signature)
+            if changed and self.mode == 'polling':
+                # No events to say when writing stops, so only report files that hold still for a moment
+                self._stopping.wait(self.settle)
+                again = self.scan()
+                for path in changed:
+                    if again.get(path) != current[path]:
+                        current[path] = self._known.get(path)  # Still being written; look again next scan
+                changed = [path for path in changed if current[path] != self._known.get(path)]
+            removed = sorted(path for path in self._known if path not in current)
+            self._known = {path: signature for path, signature in current.items() if signature is not None}
+            if changed or removed:
+                metrics.count('roster_files_changed', len(changed) + len(removed), mode=self.mode)
+                try:
+                    self.on_change(changed, removed)
+                except Exception:  # A failing callback shouldn't stop the watching
+                    logger.exception("Roster change handler failed")
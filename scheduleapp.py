@@ -1,162 +1,25 @@
-import pandas as pd
+"""Tk window for building a week's schedule from the rosters in excel_sheets/.
+
+    python scheduleapp.py
+
+The scheduling model lives in schedule_core and is re-exported here, so
+`from scheduleapp import Schedule` still works; code without a window should import
+schedule_core instead and skip loading tkinter.
+"""
+import atexit
+import datetime
 import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk
-from tkinter import messagebox, scrolledtext
-
-def load_employees_from_excel(file_path):
-    """Load employees from an Excel file."""
-    if not os.path.exists(file_path):
-        return []  # Return an empty list if the file does not exist
-
-    # Load the Excel file
-    df = pd.read_excel(file_path)
-
-    # Convert the DataFrame to a list of Employee objects
-    employees = []
-    for _, row in df.iterrows():
-        name = row['Name']
-        if not isinstance(name, str):
-            print(f"Warning: Employee name is not a string. Converting '{name}' to string.")
-            name = str(name)  # Ensure name is a string
-
-        availability = {
-            'Sun': row.get('Sun') == "Yes",  # Convert "Yes" to True
-            'Mon': row.get('Mon') == "Yes",
-            'Tue': row.get('Tue') == "Yes",
-            'Wed': row.get('Wed') == "Yes",
-            'Thu': row.get('Thu') == "Yes",
-            'Fri': row.get('Fri') == "Yes",
-            'Sat': row.get('Sat') == "Yes"
-        }
-        print(f"Loaded Employee: {name}, Availability: {availability}")  # Debug output
-        employees.append(Employee(name, availability))
+from tkinter import filedialog, messagebox, scrolledtext
 
-    return employees
-
-class Employee:
-    def __init__(self, name, availability):
-        self.name = name
-        self.availability = availability  # availability as a dictionary {'Sun': True, 'Mon': False, ...}
-
-    def __str__(self):
-        return f"Employee(name={self.name}, availability={self.availability})"
-
-class Schedule:
-    def __init__(self, days, employees):
-        self.days = days
-        self.employees = employees  # Store employees in the class
-        self.employees_needed = {day: [] for day in days}  # Initialize employees_needed
-        self.schedule = {day: [] for day in days}
-        self.unassigned_employees = {day: [] for day in days}  # Track unassigned employees per day
-
-    def set_employees_needed(self, employees_needed):
-        """Set the number of employees needed for each day."""
-        self.employees_needed = employees_needed  # Update the employees_needed attribute
-
-    def get_max_employees_for_day(self, day):
-        """Get the maximum number of employees needed for a specific day."""
-        return self.employees_needed.get(day, 0)
-
-    def add_employee_to_day(self, day, employee, force=False):
-        """Assign an employee to a day, considering availability and employee limits."""
-        if day not in self.schedule:
-            print(f"Invalid day: {day}")
-            return
-
-        # Check availability unless force is True
-        if not employee.availability.get(day, False) and not force:
-            print(f"{employee.name} is not available on {day}.")
-            return
-
-        # Only check the max employee limit if not forcing a manual assignment
-        if len(self.schedule[day]) < self.get_max_employees_for_day(day) or force:
-            self.schedule[day].append(employee)
-            self.schedule[day] = sorted(self.schedule[day], key=lambda emp: emp.name)
-            print(f"Assigned {employee.name} to {day} and sorted alphabetically.")
-            
-            # Remove the employee from the unassigned list if they were unassigned
-            if employee in self.unassigned_employees[day]:
-                self.unassigned_employees[day].remove(employee)
-                print(f"Removed {employee.name} from unassigned employees for {day}.")
-        else:
-            # This will now only affect auto-generated assignments
-            if not force:
-                self.unassigned_employees[day].append(employee)
-                print(f"Could not assign {employee.name} to {day}, max employees reached.")
-
-    def generate_schedule(self):
-        self.unassigned_employees = {day: [] for day in self.days}  # Reset unassigned employees
-        self.schedule = {day: [] for day in self.days}  # Clear the existing schedule
-
-        for day in self.days:
-            needed = self.get_max_employees_for_day(day)  # Get the number of needed employees for the day
-
-            # Filter available employees for the current day
-            available_employees = [emp for emp in self.employees if emp.availability.get(day, False)]
-
-            # Ensure employee names are valid strings for sorting, handle potential errors
-            available_employees = [emp for emp in available_employees if isinstance(emp.name, str)]
-
-            # Reverse order for Saturday and Sunday
-            if day in ['Sun', 'Sat']:
-                available_employees.reverse()  # Reverse the list of employees for these days
-
-            print(f"Available employees for {day}: {[emp.name for emp in available_employees]}")  # Debug output
-
-            assigned_count = len(self.schedule[day])  # Start with already assigned count
-            
-            for employee in available_employees:
-                if assigned_count < needed:
-                    print(f"Trying to assign {employee.name} to {day}.")  # Debug output
-                    self.add_employee_to_day(day, employee)
-                    assigned_count += 1  # Increment assigned count
-                else:
-                    break  # Exit the loop if the required number has been met
-
-            # Collect unassigned employees
-            for employee in available_employees:
-                if employee not in self.schedule[day]:
-                    self.unassigned_employees[day].append(employee)
-
-            print(f"Assigned employees for {day}: {[emp.name for emp in self.schedule[day]]}")  # Debug output
-
-        self.refresh_unassigned_employees()
-        return self.unassigned_employees
-
-    def print_schedule(self):
-        output = "Final Schedule:\n"
-        for day, employees in self.schedule.items():
-            employee_names = sorted([emp.name for emp in employees])
-            output += f"{day}: {', '.join(employee_names) if employee_names else 'No employees assigned'}\n"
-        
-        # Add unassigned employees
-        output += "\nUnassigned Employees:\n"
-        for day, unassigned in self.unassigned_employees.items():
-            # Extract names of unassigned employees and sort alphabetically
-            unassigned_names = sorted([emp.name for emp in unassigned])
-            output += f"{day}: {', '.join(unassigned_names) if unassigned_names else 'All employees assigned'}\n"
-
-        return output
-
-    def manually_add_employee(self, day, employee, force=True):
-        """Manually add an employee to a day, considering availability."""
-        if day not in self.schedule:
-            return
-        if not employee.availability.get(day, False) and not force:
-            return
-        self.add_employee_to_day(day, employee, force)
-
-    def refresh_unassigned_employees(self):
-        """Refresh the unassigned employees list and sort them alphabetically."""
-        self.unassigned_employees = {
-            day: sorted(
-                [emp for emp in self.employees if emp not in self.schedule[day]], 
-                key=lambda emp: str(emp.name)  # Ensure name is treated as a string
-            )
-            for day in self.days
-        }
-        print("Unassigned employees refreshed.")
+from schedule_core import (DAYS, ROSTER_EXTENSIONS, SOLVERS, GreedySolver, RosterCache, Schedule, SortedEmployees,
+                           configure_logging, logger, metrics, profiled, week_start)
+from schedule_core import *  # noqa: F401,F403 -- the model's __all__, re-exported for older imports
 
 class EmployeesNeededWindow:
     def __init__(self, master, schedule, app):
@@ -204,6 +67,14 @@ class EmployeesNeededWindow:
                 entry.insert(0, employees_needed[day])
                 entry.config(state='normal', disabledforeground='gray', bg='lightgray')
 
+# How AssignmentProblem reasons read in dialogs
+ASSIGNMENT_REASONS = {
+    'day': "not a day in the schedule",
+    'unavailable': "not available",
+    'full': "the day already has everyone it needs",
+    'max days': "over their days-per-week limit",
+}
+
 class ManualAssignmentWindow:
     def __init__(self, master, app, days, employees):
         self.app = app
@@ -230,7 +101,7 @@ class ManualAssignmentWindow:
 
     def update_availability(self, selected_employee_name):
         """Update the availability label and checkboxes based on the selected employee."""
-        employee = next((emp for emp in self.employees if emp.name == selected_employee_name), None)
+        employee = self.app.schedule.roster.find(selected_employee_name)
         
         if employee:
             # Update the availability label to only show the available days
@@ -240,57 +111,230 @@ class ManualAssignmentWindow:
 
             # Update the checkboxes for each day
             for day in self.days:
-                self.availability_vars[day].set(employee.availability.get(day, False))
+                self.availability_vars[day].set(employee.is_available(day))
 
     def assign_employee(self):
-        # Get all the selected days from the checkboxes
+        """Assign the selected employee to every checked day as one batch: one summary to confirm,
+        then a single update of the grids."""
         selected_days = [day for day, var in self.availability_vars.items() if var.get()]
         employee_name = self.employee_var.get()
+        if not (selected_days and employee_name):
+            messagebox.showerror("Error", "Please select both days and an employee.")
+            return
+        employee = self.app.schedule.roster.find(employee_name)
+        if not employee:
+            messagebox.showerror("Error", "Employee not found.")
+            return
 
-        if selected_days and employee_name:
-            employee = next((emp for emp in self.employees if emp.name == employee_name), None)
-            
-            if employee:
-                for day in selected_days:
-                    is_available = employee.availability.get(day, False)
-                    current_assigned_count = len(self.app.schedule.schedule.get(day, []))
-
-                    # Use the method to get the max employees needed for the day
-                    max_employees_needed = self.app.schedule.get_max_employees_for_day(day)
-
-                    if is_available or current_assigned_count < max_employees_needed:
-                        # Confirm assignment if employee is available
-                        commit = messagebox.askyesno("Confirm Assignment", 
-                                                    f"{employee.name} is available on {day}. Do you want to assign them?")
-                        if commit:
-                            self.app.schedule.manually_add_employee(day, employee)  # Correct reference to schedule
-                            messagebox.showinfo("Success", f"{employee.name} assigned to {day}.")
-                        self.app.refresh_schedule_preview()  # Refresh schedule after assignment
-
-                    elif current_assigned_count >= max_employees_needed:
-                        # If the maximum has been reached, ask if they want to assign anyway
-                        force = messagebox.askyesno("Force Assignment", 
-                                                    f"Maximum employees for {day} reached. Do you want to assign {employee.name} anyway?")
-                        if force:
-                            self.app.schedule.manually_add_employee(day, employee, True)  # True for force assignment
-                            messagebox.showinfo("Success", f"{employee.name} assigned to {day} even though the max is reached.")
-                        self.app.refresh_schedule_preview()  # Refresh schedule after assignment
-
-                    else:
-                        # If the employee is not available
-                        force = messagebox.askyesno("Force Assignment", 
-                                                    f"{employee.name} is not available on {day}. Do you want to assign them anyway?")
-                        if force:
-                            self.app.schedule.manually_add_employee(day, employee, True)  # Force assignment
-                            messagebox.showinfo("Success", f"{employee.name} assigned to {day} even though they are unavailable.")
-                        self.app.refresh_schedule_preview()  # Refresh schedule after assignment
-
-                self.master.destroy()  # Close the window after all assignments
+        # Validate every day up front, each one forced so that every rule the batch would break
+        # (counting the days before it) is listed in the summary for the user to accept
+        overridden = []
+        pairs, problems = self.app.schedule.check_assignments([(employee, day, True) for day in selected_days], overridden)
+        if problems:
+            messagebox.showerror("Error", "Cannot assign:\n" + "\n".join(
+                f"  {problem.day}: {ASSIGNMENT_REASONS[problem.reason]}" for problem in problems))
+            return
+        if not pairs:
+            messagebox.showinfo("Assign Employee", f"{employee.name} is already assigned on the selected days.")
+            return
+        forced = {}
+        for problem in overridden:
+            forced.setdefault(problem.day, []).append(ASSIGNMENT_REASONS[problem.reason])
+        lines = [f"  {day} (anyway: {', '.join(forced[day])})" if day in forced else f"  {day}" for day, _ in pairs]
+        if not messagebox.askyesno("Confirm Assignment", f"Assign {employee.name} to:\n" + "\n".join(lines)):
+            return
 
-            else:
-                messagebox.showerror("Error", "Employee not found.")
+        pairs, problems = self.app.store.assign_batch([(employee, day, day in forced) for day in selected_days])
+        if problems:  # The schedule changed underneath the dialog
+            messagebox.showerror("Error", "Nothing was assigned:\n" + "\n".join(
+                f"  {problem.day}: {ASSIGNMENT_REASONS[problem.reason]}" for problem in problems))
+            return
+        self.app.refresh_assignments(pairs)
+        self.app.update_undo_buttons()
+        self.master.destroy()  # Close the window after all assignments
+
+class JobCancelled(Exception):
+    """Raised inside a background job once it has been cancelled or superseded."""
+
+class Job:
+    """One piece of background work; the work function gets the Job to report progress."""
+    def __init__(self, kind):
+        self.kind = kind
+        self.progress = 0.0
+        self.future = None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, fraction):
+        """Record progress; stops the job here if it has been cancelled."""
+        self.progress = fraction
+        if self.cancelled:
+            raise JobCancelled()
+
+class JobRunner:
+    """Runs slow work (roster loading, schedule generation) on worker threads.
+
+    Results are handed back on the Tk thread by polling with after(), so callbacks can
+    touch widgets and the live schedule. A new job of the same kind supersedes the old one:
+    the old one is cancelled and its result, if it still arrives, is dropped.
+    """
+    def __init__(self, master, poll_ms=50):
+        self.master = master
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="schedule-job")
+        self.jobs = {}  # kind -> current Job
+
+    def submit(self, kind, work, on_done, on_progress=None, on_error=None):
+        """Run work(job) in the background and call on_done(result) on the Tk thread."""
+        self.cancel(kind)
+        job = Job(kind)
+        job.future = self.executor.submit(work, job)
+        self.jobs[kind] = job
+        self.master.after(self.poll_ms, self._poll, job, on_done, on_progress, on_error)
+        return job
+
+    def cancel(self, kind=None):
+        """Cancel the current job of one kind, or every job."""
+        kinds = [kind] if kind else list(self.jobs)
+        for kind in kinds:
+            job = self.jobs.pop(kind, None)
+            if job:
+                job.cancel()
+
+    def busy(self):
+        return bool(self.jobs)
+
+    def _poll(self, job, on_done, on_progress, on_error):
+        if self.jobs.get(job.kind) is not job:
+            return  # Cancelled or superseded; nobody wants this result any more
+        if not job.future.done():
+            if on_progress:
+                on_progress(job)
+            self.master.after(self.poll_ms, self._poll, job, on_done, on_progress, on_error)
+            return
+
+        del self.jobs[job.kind]
+        error = job.future.exception()
+        if isinstance(error, JobCancelled):
+            return
+        if error is not None:
+            if on_error:
+                on_error(error)
+            return
+        on_done(job.future.result())
+
+class VirtualGrid:
+    """Column-oriented data shown in a Treeview, materializing only the rows in view.
+
+    The Treeview holds one item per visible row. Scrolling and refreshes rewrite only the
+    cells whose text changed instead of deleting and re-inserting every row.
+    """
+    def __init__(self, tree, scrollbar, columns, page_size):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.columns = columns  # Treeview column ids; the first one shows the row number
+        self.page_size = page_size
+        self.data = []  # One sequence of employees per remaining column
+        self.row_count = 0
+        self.top = 0  # First data row in view
+        self._items = []  # Treeview item per visible row
+        self._shown = []  # (values, tag) currently displayed by each item
+
+        # The tree only ever holds one page, so the scrollbar follows the grid instead of the tree
+        self.tree.configure(yscrollcommand='')
+        self.scrollbar.config(command=self.yview)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", self._on_mousewheel)
+        self.tree.bind("<Button-5>", self._on_mousewheel)
+        self.tree.bind("<Configure>", self._on_resize, add='+')
+
+    def set_data(self, data):
+        """Show new column data, patching only what changed on screen."""
+        self.data = data
+        self.row_count = max((len(column) for column in data), default=0)
+        self.scroll_to(self.top)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, self.row_count - self.page_size))
+        self.render()
+
+    @metrics.timed('grid_render_seconds')
+    def render(self):
+        visible = max(0, min(self.page_size, self.row_count - self.top))
+        inserts = updates = 0
+        for idx in range(visible):
+            row = self.top + idx
+            values = [row + 1] + [column[row].name if row < len(column) else '' for column in self.data]
+            tag = 'oddrow' if row % 2 == 0 else 'evenrow'
+
+            if idx == len(self._items):
+                self._items.append(self.tree.insert('', 'end', values=values, tags=(tag,)))
+                self._shown.append((values, tag))
+                inserts += 1
+                continue
+
+            item = self._items[idx]
+            shown_values, shown_tag = self._shown[idx]
+            if tag != shown_tag:
+                self.tree.item(item, tags=(tag,))
+            for column, shown, value in zip(self.columns, shown_values, values):
+                if shown != value:
+                    self.tree.set(item, column, value)
+                    updates += 1
+            self._shown[idx] = (values, tag)
+
+        metrics.count('treeview_inserts', inserts)
+        metrics.count('treeview_cell_updates', updates)
+        if len(self._items) > visible:
+            metrics.count('treeview_deletes', len(self._items) - visible)
+            self.tree.delete(*self._items[visible:])
+            del self._items[visible:]
+            del self._shown[visible:]
+
+        if self.row_count:
+            self.scrollbar.set(self.top / self.row_count, (self.top + visible) / self.row_count)
         else:
-            messagebox.showerror("Error", "Please select both days and an employee.")
+            self.scrollbar.set(0, 1)
+
+    def cell(self, item, column_index):
+        """The object shown in a tree item's cell (column_index counts from the first data column), or None."""
+        if item not in self._items:
+            return None
+        row = self.top + self._items.index(item)
+        column = self.data[column_index] if column_index < len(self.data) else ()
+        return column[row] if row < len(column) else None
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', count, 'units'|'pages')."""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.row_count))
+        elif args[0] == 'scroll':
+            amount = int(args[1]) * (self.page_size if args[2] == 'pages' else 1)
+            self.scroll_to(self.top + amount)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_to(self.top - 3)
+        else:
+            self.scroll_to(self.top + 3)
+        return "break"
+
+    def _on_resize(self, event):
+        """Fit the page to the rows the tree can show at its current height."""
+        bbox = self.tree.bbox(self._items[0]) if self._items else None
+        if not bbox:
+            return
+        _, header_height, _, row_height = bbox
+        page_size = max(1, (event.height - header_height) // row_height)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.scroll_to(self.top)
 
 class ScheduleWindow:
     def __init__(self, master):
@@ -298,9 +342,14 @@ class ScheduleWindow:
         self.master.title("Schedule Management")
         self.schedule_window = self
 
-        self.days = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
+        self.days = list(DAYS)
         self.employees = []
         self.schedule = Schedule(days=self.days, employees=[])
+        self.available_unassigned = {}  # Per day: unassigned employees who are available, in name order
+        self.finalized_schedule = None  # Copy of the schedule taken by Finalize, shown on the right
+        self.store = self.open_journal(':memory:')  # Edits journal; a file per roster once one is loaded
+        self.current_file = None  # Roster file the schedule uses
+        self.history = None  # Who worked past weeks, for fair candidate order; a file per roster
         
         # Top frame for buttons
         top_frame = ttk.Frame(master)
@@ -314,10 +363,50 @@ class ScheduleWindow:
         # Bind selection event
         self.file_selection.bind("<<ComboboxSelected>>", self.on_file_selected)
 
+        # Pick up new and edited rosters without reselecting them; changes arrive on the
+        # watcher's thread and are handled on the Tk thread by poll_roster_changes
+        from schedule_watch import DirectoryWatcher
+        self.roster_changes = deque()
+        self.watcher = DirectoryWatcher(os.path.join(os.getcwd(), "excel_sheets"),
+                                        lambda changed, removed: self.roster_changes.append((changed, removed)))
+        self.watcher.start()
+        self.master.after(500, self.poll_roster_changes)
+
         # Generate Schedule Button
         self.generate_schedule_button = tk.Button(top_frame, text="Generate Schedule", command=self.generate_schedule)
         self.generate_schedule_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+        # Which solver Generate Schedule uses
+        self.solver_selection = ttk.Combobox(top_frame, values=[solver.name for solver in SOLVERS.values()], state='readonly', width=16)
+        self.solver_selection.set(GreedySolver.name)
+        self.solver_selection.pack(side=tk.LEFT, padx=5)
+        self.solver_selection.bind("<<ComboboxSelected>>", self.on_solver_selected)
+
+        # Progress of background loading/generation, and a way to stop it
+        self.jobs = JobRunner(master)
+        self.roster_cache = RosterCache()
+        self.progress_bar = ttk.Progressbar(top_frame, length=150, maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, padx=5, pady=5)
+        self.cancel_button = tk.Button(top_frame, text="Cancel", command=self.cancel_jobs, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Freeze the current schedule into the finalized view, and save it to a file
+        self.finalize_button = tk.Button(top_frame, text="Finalize", command=self.finalize_schedule)
+        self.finalize_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.export_button = tk.Button(top_frame, text="Export...", command=self.export_schedule)
+        self.export_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.export_layout = ttk.Combobox(top_frame, values=["Grid", "Per employee"], state='readonly', width=12)
+        self.export_layout.set("Grid")
+        self.export_layout.pack(side=tk.LEFT, padx=5)
+
+        # Step back and forth through manual edits, settings changes and generated plans
+        self.undo_button = tk.Button(top_frame, text="Undo", command=self.undo_edit, state=tk.DISABLED)
+        self.undo_button.pack(side=tk.LEFT, padx=5, pady=5)
+        self.redo_button = tk.Button(top_frame, text="Redo", command=self.redo_edit, state=tk.DISABLED)
+        self.redo_button.pack(side=tk.LEFT, padx=5, pady=5)
+        master.bind_all("<Control-z>", lambda event: self.undo_edit())
+        master.bind_all("<Control-y>", lambda event: self.redo_edit())
+
         # Main frame for schedules
         main_frame = ttk.Frame(master)
         main_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -336,9 +425,9 @@ class ScheduleWindow:
         schedule_scroll = tk.Scrollbar(schedule_frame)
         schedule_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.schedule_tree = ttk.Treeview(schedule_frame, columns=["Row"] + self.days, show="headings", height=15, yscrollcommand=schedule_scroll.set)
+        self.schedule_tree = ttk.Treeview(schedule_frame, columns=["Row"] + self.days, show="headings", height=15)
         self.schedule_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        schedule_scroll.config(command=self.schedule_tree.yview)
+        self.schedule_grid = VirtualGrid(self.schedule_tree, schedule_scroll, ["Row"] + self.days, page_size=15)
 
         self.schedule_tree.heading("Row", text="#")
         self.schedule_tree.column("Row", width=30, anchor="center", stretch=True)
@@ -349,6 +438,14 @@ class ScheduleWindow:
         self.schedule_tree.tag_configure('evenrow', background='#ffffff')
         self.schedule_tree.bind("<Double-1>", self.on_schedule_double_click)
 
+        # Live conflict counts (the day headings carry each day's badge), and the full list on demand
+        conflicts_frame = tk.Frame(preview_frame)
+        conflicts_frame.pack(fill=tk.X, padx=5)
+        self.conflicts_label = tk.Label(conflicts_frame, text="No conflicts", anchor=tk.W)
+        self.conflicts_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(conflicts_frame, text="Conflicts...", command=self.show_conflicts).pack(side=tk.RIGHT)
+        self.day_badges = {}  # Heading text shown per day, so only changed headings are rewritten
+
         ### Unassigned Treeview with Scrollbar ###
         unassigned_frame = tk.Frame(preview_frame)
         unassigned_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -356,9 +453,9 @@ class ScheduleWindow:
         unassigned_scroll = tk.Scrollbar(unassigned_frame)
         unassigned_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.unassigned_tree = ttk.Treeview(unassigned_frame, columns=["Row"] + self.days, show="headings", height=15, yscrollcommand=unassigned_scroll.set)
+        self.unassigned_tree = ttk.Treeview(unassigned_frame, columns=["Row"] + self.days, show="headings", height=15)
         self.unassigned_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        unassigned_scroll.config(command=self.unassigned_tree.yview)
+        self.unassigned_grid = VirtualGrid(self.unassigned_tree, unassigned_scroll, ["Row"] + self.days, page_size=15)
 
         self.unassigned_tree.heading("Row", text="#")
         self.unassigned_tree.column("Row", width=30, anchor="center", stretch=True)
@@ -379,9 +476,9 @@ class ScheduleWindow:
         finalized_scroll = tk.Scrollbar(finalized_tree_frame)
         finalized_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.finalized_tree = ttk.Treeview(finalized_tree_frame, columns=["Row"] + self.days, show="headings", height=31, yscrollcommand=finalized_scroll.set)
+        self.finalized_tree = ttk.Treeview(finalized_tree_frame, columns=["Row"] + self.days, show="headings", height=31)
         self.finalized_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        finalized_scroll.config(command=self.finalized_tree.yview)
+        self.finalized_grid = VirtualGrid(self.finalized_tree, finalized_scroll, ["Row"] + self.days, page_size=31)
 
         self.finalized_tree.heading("Row", text="#")
         self.finalized_tree.column("Row", width=30, anchor="center", stretch=True)
@@ -408,6 +505,11 @@ class ScheduleWindow:
             entry.pack(side=tk.LEFT, padx=5, pady=5)
             self.employees_needed_entries[day] = entry  # Store entry for later use
 
+        # Cap on days per week for everyone (blank for no cap)
+        tk.Label(set_employees_needed_frame, text="Max days:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.max_days_entry = tk.Entry(set_employees_needed_frame, width=5)
+        self.max_days_entry.pack(side=tk.LEFT, padx=5, pady=5)
+
         # Submit Button for Setting Employees Needed
         self.submit_needed_button = tk.Button(set_employees_needed_frame, text="Submit", command=self.submit_employees_needed)
         self.submit_needed_button.pack(side=tk.LEFT, padx=10, pady=5)
@@ -423,30 +525,24 @@ class ScheduleWindow:
         column = self.schedule_tree.identify_column(event.x)
         column_index = int(column.replace('#', '')) - 1  # Columns are 1-based, so subtract 1
 
-        # Get the values for the selected row
-        item_values = self.schedule_tree.item(item_id, 'values')
-
         if column_index == 0:
             return  # Clicked on the row number column — ignore
 
-        # Get the employee name from the clicked column
-        selected_employee = item_values[column_index]
+        # The employee in the clicked cell, by position, since names can repeat on a roster
+        employee = self.schedule_grid.cell(item_id, column_index - 1)
 
         # If no employee found in the clicked cell, exit
-        if not selected_employee:
+        if employee is None:
             return
 
         # Determine the day based on the clicked column index
         selected_day = self.days[column_index - 1]
 
         # Prompt user to confirm removal
-        confirm = messagebox.askyesno("Remove Employee", f"Do you want to remove {selected_employee} from {selected_day}?")
+        confirm = messagebox.askyesno("Remove Employee", f"Do you want to remove {employee.name} from {selected_day}?")
 
-        if confirm:
-            self.remove_employee_from_schedule(selected_day, selected_employee)
-            messagebox.showinfo("Success", f"{selected_employee} was removed from {selected_day} and added back to unassigned employees.")
-            self.refresh_schedule_preview()
-            self.refresh_unassigned_employees()
+        if confirm and self.remove_employee_from_schedule(selected_day, employee):
+            messagebox.showinfo("Success", f"{employee.name} was removed from {selected_day} and added back to unassigned employees.")
         
     def on_unassigned_double_click(self, event):
         """Handle double-clicking on any unassigned employee to manually assign them."""
@@ -462,159 +558,308 @@ class ScheduleWindow:
         
         selected_day = self.days[column_index - 1]  # Get the correct day from the column including num row
 
-        item_values = self.unassigned_tree.item(item_id, 'values')
-        if not item_values or column_index >= len(item_values):
+        # The employee in the clicked cell, by position, since names can repeat on a roster
+        employee = self.unassigned_grid.cell(item_id, column_index - 1)
+        if employee is None:
             return
 
-        selected_employee = item_values[column_index]
-        if not selected_employee:
-            return
-
-        confirm = messagebox.askyesno("Manual Assignment", f"Do you want to manually add {selected_employee} to {selected_day}?")
+        confirm = messagebox.askyesno("Manual Assignment", f"Do you want to manually add {employee.name} to {selected_day}?")
 
         if confirm:
-            self.add_employee_to_schedule([selected_day], selected_employee)
-            messagebox.showinfo("Success", f"{selected_employee} has been assigned to {selected_day}.")
-            self.refresh_schedule_preview()
-            self.refresh_unassigned_employees()
+            if self.add_employee_to_schedule([selected_day], employee):
+                messagebox.showinfo("Success", f"{employee.name} has been assigned to {selected_day}.")
+            else:
+                messagebox.showerror("Error", f"{employee.name} could not be assigned to {selected_day}.")
 
     def get_excel_files(self):
-        """Retrieve all available Excel files for selection."""
+        """Retrieve all available roster files (.xlsx, .csv, .parquet) for selection."""
         excel_dir = os.path.join(os.getcwd(), "excel_sheets")  # Assuming excel files are in an 'excel_sheets' folder
-        return [f for f in os.listdir(excel_dir) if f.endswith('.xlsx')]
+        return sorted(f for f in os.listdir(excel_dir) if f.lower().endswith(ROSTER_EXTENSIONS))
 
     def on_file_selected(self, event):
-        """Load employees from the selected Excel file."""
+        """Load employees from the selected Excel file in the background."""
         selected_file = self.file_selection.get()
         if selected_file and selected_file != "Select Employee Excel Sheet":
             # Create full path to the selected file
             excel_dir = os.path.join(os.getcwd(), "excel_sheets")
             file_path = os.path.join(excel_dir, selected_file)
-            
-            self.employees = load_employees_from_excel(file_path)  # Pass selected file to the function
-            if self.employees:  # Check if any employees were loaded
-                self.schedule.employees = self.employees  # Update the schedule's employee list
-                print(f"Loaded employees from {file_path}: {[emp.name for emp in self.employees]}.")  # Debug output
-                self.refresh_employee_selection_menu()
-            else:
-                print(f"No employees loaded from {file_path}.")  # Debug if no employees are found
-            
-            self.refresh_unassigned_employees()  # Refresh the unassigned employees display
 
-    def add_employee_to_schedule(self, selected_days, employee_name):
-        """Add an employee to the schedule for the selected days."""
-        # Look up the actual employee object based on the employee name
-        employee = next((emp for emp in self.schedule.employees if emp.name == employee_name), None)
+            # A generation or reload for the previous roster is now stale
+            self.jobs.cancel('generate')
+            self.jobs.cancel('reload')
+            self.jobs.submit('load', lambda job: self.roster_cache.load(file_path, progress=job.report),
+                             lambda roster: self.on_roster_loaded(file_path, roster),
+                             self.show_job_progress, self.on_job_failed)
+            self.show_job_progress()
+
+    def on_roster_loaded(self, file_path, roster):
+        """Install a roster loaded by on_file_selected (runs on the Tk thread)."""
+        for problem in roster.problems:
+            logger.warning("Row %s, %s: %s", problem.row, problem.column, problem.message)
+        if len(roster):  # Check if any employees were loaded
+            self.current_file = file_path
+            self.employees = roster.employees
+            self.schedule.employees = roster  # Update the schedule's roster and availability index
+            logger.info("Loaded %d employees from %s.", len(roster), file_path)
+
+            # Pick up where the last session with this roster left off
+            from schedule_store import journal_path
+            self.store.close()
+            self.store = self.open_journal(journal_path(file_path))
+            self.open_history(file_path)
+            self.show_settings()
+            self.update_undo_buttons()
+        else:
+            logger.warning("No employees loaded from %s.", file_path)
+
+        self.refresh_schedule_preview()  # Refresh the schedule and unassigned employees displays
+        self.show_job_progress()
+
+    def poll_roster_changes(self):
+        """Handle what the watcher saw: list new files, and reload the current roster if it was edited."""
+        changed = set()
+        while self.roster_changes:
+            paths, _ = self.roster_changes.popleft()
+            changed.update(paths)
+            self.file_selection.config(values=self.get_excel_files())
+        # Not while the user is loading another file: that one replaces the current roster anyway
+        if self.current_file in changed and 'load' not in self.jobs.jobs:
+            file_path = self.current_file
+            self.jobs.submit('reload', lambda job: self.roster_cache.load(file_path, progress=job.report),
+                             lambda roster: self.on_roster_reloaded(file_path, roster),
+                             self.show_job_progress, self.on_job_failed)
+            self.show_job_progress()
+        self.master.after(500, self.poll_roster_changes)
+
+    def on_roster_reloaded(self, file_path, roster):
+        """Apply an edited version of the current roster, keeping the assignments that still hold."""
+        self.show_job_progress()
+        if file_path != self.current_file or not len(roster):
+            return
+        diff = self.schedule.roster.diff(roster)
+        if not (diff.added or diff.removed or diff.changed):
+            return  # Saved without changes
+        dropped = self.store.update_roster(roster)
+        self.employees = roster.employees
+        self.refresh_schedule_preview()
+        self.update_undo_buttons()
+        logger.info("%s changed: %d added, %d removed, %d with new availability.", os.path.basename(file_path),
+                    len(diff.added), len(diff.removed), len(diff.changed))
+
+        if dropped:
+            days = [day for day in self.days if any(dropped_day == day for dropped_day, _ in dropped)]
+            lines = [f"  {day}: {employee.name}" for day, employee in dropped]
+            if messagebox.askyesno("Roster Updated",
+                                   f"{os.path.basename(file_path)} changed; these assignments no longer hold and were removed:\n"
+                                   + "\n".join(lines[:20]) + ("\n  ..." if len(lines) > 20 else "")
+                                   + f"\n\nFill the open spots on {', '.join(days)} from who is available?"):
+                self.refresh_assignments(self.store.fill_days(days))
+                self.update_undo_buttons()
+
+    def open_journal(self, path):
+        """Open the edit journal at `path` for the schedule, falling back to one kept in memory."""
+        from schedule_store import ScheduleStore
+        try:
+            return ScheduleStore(path, self.schedule)
+        except (OSError, sqlite3.Error) as error:
+            logger.warning("Could not open journal %s: %s", path, error)
+            return ScheduleStore(':memory:', self.schedule)
+
+    def open_history(self, roster_path):
+        """Rank candidates by the roster's fairness history, planning the coming week."""
+        from schedule_history import HistoryStore, history_path
+        if self.history is not None:
+            self.history.close()
+        try:
+            self.history = HistoryStore(history_path(roster_path))
+        except (OSError, sqlite3.Error) as error:
+            logger.warning("Could not open history for %s: %s", roster_path, error)
+            self.history = None
+        self.schedule.history = self.history
+        self.schedule.week = week_start(datetime.date.today()) + datetime.timedelta(weeks=1)
+
+    def undo_edit(self):
+        """Undo the newest edit, settings change or generated plan."""
+        self.show_edit(self.store.undo())
+
+    def redo_edit(self):
+        self.show_edit(self.store.redo())
+
+    def show_edit(self, edit):
+        """Bring the grids (and settings entries) up to date after undo/redo."""
+        if edit is not None:
+            if edit.kind == 'settings':
+                self.show_settings()
+                self.update_conflict_badges()
+            elif edit.kind == 'plan':
+                self.refresh_schedule_preview()
+            if edit.pairs:
+                self.refresh_assignments(edit.pairs)
+        self.update_undo_buttons()
+
+    def update_undo_buttons(self):
+        self.undo_button.config(state=tk.NORMAL if self.store.can_undo() else tk.DISABLED)
+        self.redo_button.config(state=tk.NORMAL if self.store.can_redo() else tk.DISABLED)
+
+    def show_settings(self):
+        """Fill the employees-needed and max-days entries from the schedule."""
+        for day, entry in self.employees_needed_entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, str(self.schedule.employees_needed.get(day, 0)))
+        self.max_days_entry.delete(0, tk.END)
+        if self.schedule.max_days_per_week is not None:
+            self.max_days_entry.insert(0, str(self.schedule.max_days_per_week))
+
+    def show_job_progress(self, job=None):
+        """Update the progress bar and Cancel button for the running jobs."""
+        if not self.jobs.busy():
+            self.progress_bar.config(value=0)
+            self.cancel_button.config(state=tk.DISABLED)
+            return
 
-        if not employee:
-            messagebox.showerror("Error", f"Employee '{employee_name}' not found.")
-            return  # Exit if the employee is not found
+        self.cancel_button.config(state=tk.NORMAL)
+        # A roster being loaded is shown over anything else; it replaces what the others work on
+        job = self.jobs.jobs.get('load') or self.jobs.jobs.get('reload') or job
+        if job is not None:
+            self.progress_bar.config(value=job.progress)
 
+    def on_job_failed(self, error):
+        self.show_job_progress()
+        messagebox.showerror("Error", str(error))
+
+    def cancel_jobs(self):
+        """Stop any loading or generation still running."""
+        self.jobs.cancel()
+        self.show_job_progress()
+
+    def add_employee_to_schedule(self, selected_days, employee):
+        """Add an employee to the schedule for the selected days; returns the days they were added to."""
+        added = []
         for day in selected_days:
             # Check if the day exists in the schedule
             if day not in self.schedule.schedule:
                 messagebox.showerror("Error", f"{day} is not a valid day in the schedule.")
                 continue  # Skip this day if it is invalid
 
-            # Check if the employee is already assigned to this day
-            if employee not in self.schedule.schedule[day]:
-                self.schedule.schedule[day].append(employee)  # Add the employee object
-
-                # Sort employees alphabetically by name after adding
-                self.schedule.schedule[day] = sorted(self.schedule.schedule[day], key=lambda emp: emp.name.lower())
-
-                # Remove the employee from the unassigned list for the selected days
-                if employee in self.schedule.unassigned_employees[day]:
-                    self.schedule.unassigned_employees[day].remove(employee)
-
-        # Refresh the schedule preview after updating the schedule
-        self.refresh_schedule_preview()
-        self.refresh_unassigned_employees()
-
-    def remove_employee_from_schedule(self, day, employee_name):
-        """Remove an employee from the schedule and add them to the unassigned list."""
-        # Find the employee in the schedule for the selected day
-        employee = next((e for e in self.schedule.schedule[day] if e.name == employee_name), None)
-
-        if employee:
-            # Remove the employee from the schedule for that day
-            self.schedule.schedule[day] = [e for e in self.schedule.schedule[day] if e.name != employee_name]
-
-            # Add the employee back to the unassigned list for that day
-            self.schedule.unassigned_employees[day].append(employee) 
-
+            # Assign unless they are already on this day; also takes them off the unassigned list
+            if self.store.assign(day, employee, force=True):
+                added.append(day)
+
+        # Only the selected days changed, so patch those instead of refreshing everything
+        self.refresh_employee_days(employee, added)
+        self.update_undo_buttons()
+        return added
+
+    def remove_employee_from_schedule(self, day, employee):
+        """Remove an employee from the schedule and add them to the unassigned list; returns whether they were on the day."""
+        # Remove the employee from the schedule for that day; they go back on the unassigned list
+        if not self.store.remove(day, employee):
+            return False
+        self.refresh_employee_days(employee, [day])
+        self.update_undo_buttons()
+        return True
+
+    @metrics.timed('refresh_schedule_preview_seconds')
     def refresh_schedule_preview(self):
         """Refresh the schedule preview treeview with current assignments."""
-        self.schedule_tree.delete(*self.schedule_tree.get_children())  # Clear existing rows
-
-        max_employees = max(len(self.schedule.schedule[day]) for day in self.days)  # Find the maximum number of employees assigned to a single day
-
-        # Add rows for the maximum number of assigned employees
-        for i in range(max_employees):
-            row_values = []
-            for day in self.days:
-                employees = self.schedule.schedule[day]
-                if i < len(employees):
-                    row_values.append(employees[i].name)  # Add employee name if it exists
-                else:
-                    row_values.append('')  # Leave empty if no employee is assigned
-
-            # Insert the row into the schedule treeview
-            tag = 'oddrow' if i % 2 == 0 else 'evenrow'
-            self.schedule_tree.insert('', 'end', values=[i + 1] + row_values, tags=(tag,)) #create each row with a num, names, and tags(colored lines)
-
+        self.schedule_grid.set_data([self.schedule.schedule[day] for day in self.days])
         self.refresh_unassigned_employees()
+        self.update_conflict_badges()
 
-    def refresh_unassigned_employees(self):
-        """Refresh the unassigned employees treeview with current unassigned employees."""
-        print("Refreshing unassigned employees...")  # Debug output
-        self.unassigned_tree.delete(*self.unassigned_tree.get_children())  # Clear existing rows
-
-        # Prepare a list of rows for each day
-        row_values = []
+    def update_conflict_badges(self):
+        """Show each day's conflicts on its heading ("Mon +2 !1": two over employees_needed, one
+        forced while unavailable) and the totals below the grid, from the validator's counts."""
+        validation = self.schedule.validation
         for day in self.days:
-            # Get the list of unassigned employees for the day
-            unassigned_employees = self.schedule.unassigned_employees[day]
-
-            # Filter to show only available unassigned employees
-            available_unassigned_employees = [emp for emp in unassigned_employees if emp.availability.get(day, False)]
-
-            # Sort unassigned employees alphabetically by name
-            available_unassigned_employees.sort(key=lambda emp: emp.name.lower())
-
-            # Store employee names or leave it empty if no available unassigned employees
-            if available_unassigned_employees:
-                row_values.append([emp.name for emp in available_unassigned_employees])
-            else:
-                row_values.append([''])  # Leave empty if no available unassigned employees
+            extra, forced = validation.day_conflicts(day)
+            text = day + (f" {extra:+d}" if extra else "") + (f" !{forced}" if forced else "")
+            if self.day_badges.get(day) != text:
+                self.schedule_tree.heading(day, text=text)
+                self.day_badges[day] = text
+        counts = validation.counts()
+        parts = [f"{counts['overstaffed']} days overstaffed" if counts['overstaffed'] else "",
+                 f"{counts['understaffed']} days short" if counts['understaffed'] else "",
+                 f"{counts['forced']} assigned while unavailable" if counts['forced'] else "",
+                 f"{counts['over_cap']} over their days-per-week limit" if counts['over_cap'] else ""]
+        parts = [part for part in parts if part]
+        self.conflicts_label.config(text="Conflicts: " + ", ".join(parts) if parts else "No conflicts",
+                                    fg='red' if counts['forced'] or counts['over_cap'] or counts['overstaffed'] else 'black')
+
+    def show_conflicts(self):
+        """List every conflict in the schedule."""
+        report = self.schedule.validate()
+        lines = [f"  {day}: {extra} over the {self.schedule.get_max_employees_for_day(day)} needed"
+                 for day, extra in report.overstaffed.items()]
+        lines += [f"  {day}: {missing} short of the {self.schedule.get_max_employees_for_day(day)} needed"
+                  for day, missing in report.understaffed.items()]
+        lines += [f"  {day}: {employee.name} is not available" for day, employee in report.forced]
+        lines += [f"  {employee.name}: {worked} days, limit {cap}" for employee, worked, cap in report.over_cap]
+        if not lines:
+            messagebox.showinfo("Conflicts", "No conflicts in the schedule.")
+            return
+        messagebox.showwarning("Conflicts", "\n".join(lines[:30]) + (f"\n  ... and {len(lines) - 30} more" if len(lines) > 30 else ""))
 
-        # Insert the row values into the unassigned treeview
-        for i in range(max(len(values) for values in row_values) if row_values else 0):  # Check for non-empty row_values
-            row = []
-            for day in self.days:
-                day_index = self.days.index(day)
-                if i < len(row_values[day_index]):
-                    row.append(row_values[day_index][i])  # Add employee name if it exists
-                else:
-                    row.append('')  # Leave empty if no unassigned available employee
-            tag = 'oddrow' if i % 2 == 0 else 'evenrow'
-            self.unassigned_tree.insert('', 'end', values=[i + 1] + row, tags=(tag,)) #create each row with a num, names, and tags(colored lines)
+    @metrics.timed('refresh_unassigned_view_seconds')
+    def refresh_unassigned_employees(self):
+        """Refresh the unassigned employees treeview with current unassigned employees."""
+        self.schedule.refresh_unassigned_employees()
 
-        print("Unassigned employees treeview refreshed.")  # Debug output
+        # Only show unassigned employees who are available that day (the lists are already in name order)
+        self.available_unassigned = {
+            day: SortedEmployees([emp for emp in self.schedule.unassigned_employees[day] if emp.is_available(day)], presorted=True)
+            for day in self.days
+        }
+        self.unassigned_grid.set_data([self.available_unassigned[day] for day in self.days])
+
+    def refresh_employee_days(self, employee, days):
+        """Patch the grids after one employee was added to or removed from some days."""
+        self.refresh_assignments([(day, employee) for day in days])
+
+    @metrics.timed('refresh_employee_days_seconds')
+    def refresh_assignments(self, pairs):
+        """Patch the grids after the (day, employee) pairs were added or removed, in one update."""
+        for day, employee in pairs:
+            if day not in self.available_unassigned:
+                continue
+            if employee in self.schedule.schedule[day]:
+                self.available_unassigned[day].discard(employee)
+            elif employee.is_available(day):
+                self.available_unassigned[day].add(employee)
+
+        self.schedule_grid.set_data([self.schedule.schedule[day] for day in self.days])
+        self.unassigned_grid.set_data([self.available_unassigned[day] for day in self.days])
+        self.update_conflict_badges()
 
     def submit_employees_needed(self):
         """Submit the employees needed for each day."""
         success_messages = []
         error_messages = []
+        needed = dict(self.schedule.employees_needed)
+        max_days_per_week = self.schedule.max_days_per_week
 
         for day, entry in self.employees_needed_entries.items():
             try:
                 employees_needed = int(entry.get())
-                self.schedule.employees_needed[day] = employees_needed
+                needed[day] = employees_needed
                 success_messages.append(f"Set employees needed for {day} to {employees_needed}.")
             except ValueError:
                 error_messages.append(f"Invalid number for {day}. Please enter a valid integer.")
 
+        max_days = self.max_days_entry.get().strip()
+        if not max_days:
+            max_days_per_week = None
+        else:
+            try:
+                max_days_per_week = int(max_days)
+                success_messages.append(f"Set max days per employee to {max_days}.")
+            except ValueError:
+                error_messages.append("Invalid max days. Please enter a valid integer or leave it blank.")
+
+        # One journal step, so a single undo puts every day back
+        self.store.set_settings(needed, max_days_per_week)
+        self.update_undo_buttons()
+        self.update_conflict_badges()
+
         # Display a single message for all success messages
         if success_messages:
             success_message = "\n".join(success_messages)
@@ -625,10 +870,64 @@ class ScheduleWindow:
             error_message = "\n".join(error_messages)
             messagebox.showerror("Error", error_message)
 
+    def on_solver_selected(self, event):
+        """Switch the strategy used by Generate Schedule."""
+        selected = self.solver_selection.get()
+        self.schedule.solver = next(solver() for solver in SOLVERS.values() if solver.name == selected)
+
     def generate_schedule(self):
-        """Generate the schedule based on current parameters."""
-        self.schedule.generate_schedule()
-        self.refresh_schedule_preview()
+        """Generate the schedule based on current parameters, off the UI thread."""
+        schedule = self.schedule
+        roster = schedule.roster
+
+        def on_done(plan):
+            if schedule.roster is not roster:
+                return  # A different roster was loaded meanwhile
+            self.store.apply_plan(plan)  # Journaled, so the whole generation undoes in one step
+            self.refresh_schedule_preview()
+            self.update_undo_buttons()
+            self.show_job_progress()
+
+        def work(job):
+            profile_path = os.environ.get("SCHEDULE_PROFILE")
+            if not profile_path:
+                return schedule.plan_schedule(progress=job.report)
+            with profiled(profile_path):  # Opt-in: profile this generate cycle's planning
+                return schedule.plan_schedule(progress=job.report)
+
+        self.jobs.submit('generate', work, on_done, self.show_job_progress, self.on_job_failed)
+        self.show_job_progress()
+
+    def finalize_schedule(self):
+        """Copy the current schedule into the finalized view; later edits don't change it.
+        It also goes into the fairness history as its week, replacing an earlier finalize."""
+        self.finalized_schedule = self.schedule.copy()
+        self.finalized_grid.set_data([self.finalized_schedule.schedule[day] for day in self.days])
+        if self.history is not None:
+            try:
+                self.history.record(self.schedule.week, self.finalized_schedule)
+            except sqlite3.Error as error:
+                messagebox.showerror("Error", f"Could not save the week to the history: {error}")
+
+    def export_schedule(self):
+        """Save the finalized schedule (or the current one if nothing is finalized) as .xlsx, .csv or .json."""
+        from schedule_export import export_schedule
+
+        path = filedialog.asksaveasfilename(
+            title="Export Schedule", defaultextension=".xlsx",
+            filetypes=[("Excel workbook", "*.xlsx"), ("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        schedule = self.finalized_schedule or self.schedule.copy()  # A copy, so editing can go on meanwhile
+        layout = 'employee' if self.export_layout.get() == "Per employee" else 'grid'
+
+        def on_done(paths):
+            self.show_job_progress()
+            messagebox.showinfo("Export", "Saved " + ", ".join(paths))
+
+        self.jobs.submit('export', lambda job: export_schedule(schedule, path, layout), on_done,
+                         self.show_job_progress, self.on_job_failed)
+        self.show_job_progress()
 
     """def create_employee_form(self):
         # Create the EmployeeCreationWindow instance and pack it at the bottom
@@ -636,6 +935,9 @@ class ScheduleWindow:
         self.employee_creation_frame.pack(side='bottom', fill='x', padx=10, pady=10)
 """
 if __name__ == "__main__":
+    configure_logging(os.environ.get("SCHEDULE_LOG_LEVEL", "INFO"))
+    if os.environ.get("SCHEDULE_METRICS"):
+        atexit.register(metrics.write, os.environ["SCHEDULE_METRICS"])
     root = tk.Tk()
     app = ScheduleWindow(root)
     root.mainloop()
\ No newline at end of file